@@ -8,14 +8,23 @@ Supports 3 modes:
 3. user: Test as authenticated user with JWT token
 """
 import requests
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 import time
 import json
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Callable, Iterable, Iterator, List
 from dataclasses import dataclass
 import uuid
 from http.cookiejar import CookieJar
 
 from config import TestConfig
+from rate_limiter import TokenBucket, RETRYABLE_STATUS_CODES, RESEND_STATUS_CODES, backoff_delay, parse_retry_after
+from phase_timing import TimedHTTPAdapter, reset_connect_timing, last_connect_ms
+from token_counter import get_token_counter
+from log_setup import get_logger
+from live_metrics import LiveMetrics
+
+
+logger = get_logger("api_client")
 
 
 @dataclass
@@ -27,6 +36,50 @@ class APIResponse:
     error: Optional[str]
     latency_ms: int
     raw_response: Optional[str] = None
+    attempts: int = 1  # Number of requests sent (> 1 when retried)
+    phase_timings_ms: Optional[Dict[str, float]] = None  # connect / ttfb / transfer / decode
+    # Streamed answers only (ask_stream)
+    ttft_ms: Optional[float] = None  # Request sent -> first answer chunk
+    chunk_gaps_ms: Optional[List[float]] = None  # Pauses between consecutive chunks
+    cancelled: bool = False  # Stream stopped by the on_chunk callback (partial answer)
+    server: Optional[str] = None  # Server response header (e.g. the mock server's name)
+    request_sent: bool = True  # False: failed while connecting, the server never got the request
+
+
+SSE_CONTENT_TYPE = "text/event-stream"
+
+
+def request_not_sent(error: requests.exceptions.RequestException) -> bool:
+    """The request failed while connecting (refused, DNS, connect timeout), before anything was sent"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def iter_sse_data(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Data of each Server-Sent Event, yielded as soon as the event is complete
+    
+    Multi-line data fields are joined with newlines; comments and the other
+    fields (event:, id:, retry:) are ignored.
+    """
+    buffer = b""
+    data_lines: List[str] = []
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw_line in lines:
+            line = raw_line.rstrip(b"\r").decode("utf-8")
+            if not line:
+                if data_lines:
+                    yield "\n".join(data_lines)
+                    data_lines = []
+            elif line.startswith("data:"):
+                value = line[len("data:"):]
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+    if data_lines:
+        yield "\n".join(data_lines)
 
 
 @dataclass 
@@ -84,7 +137,7 @@ class TestIdentity:
             else:
                 return cls.guest_new()
         except Exception as e:
-            print(f"Warning: Could not load test_config.json: {e}")
+            logger.warning("Could not load test_config.json: %s", e)
             return cls.guest_new()
 
 
@@ -112,12 +165,28 @@ class MoneyCareAPIClient:
         # Mode 4: Load from config file
         identity = TestIdentity.from_config_file("test_config.json")
         client = MoneyCareAPIClient(config, identity)
+    
+    Retries: 429 / 502 / 503 / 504, timeouts and connection errors are retried
+    up to config.max_retries times with jittered exponential backoff (honouring
+    Retry-After). Pass a shared TokenBucket as rate_limiter to rate limit
+    requests across clients; a 429 pauses the whole bucket. Pass a shared
+    LiveMetrics as metrics to report every request attempt to the live view.
     """
     
-    def __init__(self, config: TestConfig, identity: TestIdentity = None):
+    def __init__(
+        self,
+        config: TestConfig,
+        identity: TestIdentity = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        metrics: Optional[LiveMetrics] = None
+    ):
         self.config = config
         self.identity = identity or TestIdentity.guest_new()
         self.session = requests.Session()  # Maintains cookies automatically
+        self._mount_timed_adapter()
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self._retry_after: Optional[float] = None  # Retry-After of the last response
         
         # Identity info (populated after init_session)
         self.owner_id: Optional[str] = None
@@ -133,7 +202,7 @@ class MoneyCareAPIClient:
             # Generate new fingerprint
             self.fingerprint = self._generate_fingerprint()
             self.jwt_token = None
-            print(f"[Identity] Mode: guest_new, fingerprint: {self.fingerprint}")
+            logger.debug("Identity guest_new", extra={"fingerprint": self.fingerprint})
             
         elif self.identity.mode == "guest_existing":
             # Use existing fingerprint or generate one
@@ -142,7 +211,10 @@ class MoneyCareAPIClient:
             if self.identity.guest_id:
                 self.owner_id = self.identity.guest_id
                 self.owner_type = "guest"
-            print(f"[Identity] Mode: guest_existing, fingerprint: {self.fingerprint}, guest_id: {self.identity.guest_id}")
+            logger.debug(
+                "Identity guest_existing",
+                extra={"fingerprint": self.fingerprint, "guest_id": self.identity.guest_id}
+            )
             
         elif self.identity.mode == "user":
             # Use JWT token for authenticated user
@@ -151,7 +223,10 @@ class MoneyCareAPIClient:
             if self.identity.user_id:
                 self.owner_id = self.identity.user_id
                 self.owner_type = "user"
-            print(f"[Identity] Mode: user, user_id: {self.identity.user_id}, has_token: {bool(self.jwt_token)}")
+            logger.debug(
+                "Identity user",
+                extra={"user_id": self.identity.user_id, "has_token": bool(self.jwt_token)}
+            )
             
             # Set cookie for JWT authentication
             self._setup_cookies()
@@ -188,7 +263,7 @@ class MoneyCareAPIClient:
         if self.identity.mode == "user" and self.jwt_token:
             # Set ACCESS_TOKEN cookie for authenticated user
             self.session.cookies.set("ACCESS_TOKEN", self.jwt_token)
-            print(f"[Identity] Set ACCESS_TOKEN cookie for user authentication")
+            logger.debug("Set ACCESS_TOKEN cookie for user authentication")
     
     def set_jwt_token(self, token: str):
         """
@@ -221,19 +296,26 @@ class MoneyCareAPIClient:
             "lastName": "..." (if user)
         }
         """
+        return self._with_retries(self._init_session_once, endpoint="init_session")
+    
+    def _init_session_once(self) -> APIResponse:
+        """Single GET /api/init-session request"""
         url = f"{self.config.chatbot_base_url}{self.config.init_session_endpoint}"
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            response = self.session.get(
+            response, timings = self._timed_request(
+                "GET",
                 url,
                 headers=self._get_headers(),
                 timeout=self.config.default_timeout_ms / 1000
             )
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             
             if response.status_code == 200:
+                decode_start = time.perf_counter()
                 data = response.json()
+                timings["decode"] = (time.perf_counter() - decode_start) * 1000
                 
                 # Store identity info - handle both old and new response formats
                 # New format: user_id, GUEST_ID, sessionType, conversation_id
@@ -251,12 +333,16 @@ class MoneyCareAPIClient:
                 is_authenticated = data.get("authenticated", False)
                 username = data.get("username")
                 
-                print(f"[Session] Initialized as {self.owner_type}: {self.owner_id}")
-                print(f"[Session] Authenticated: {is_authenticated}")
-                if username:
-                    print(f"[Session] Username: {username}")
-                print(f"[Session] Conversation: {self.conversation_id}")
-                print(f"[Session] Cookies: {dict(self.session.cookies)}")
+                # Cookie names only: values are session credentials
+                logger.debug(
+                    "Session initialized as %s %s", self.owner_type, self.owner_id,
+                    extra={
+                        "authenticated": is_authenticated,
+                        "username": username,
+                        "conversation_id": self.conversation_id,
+                        "cookies": sorted(self.session.cookies.keys())
+                    }
+                )
                 
                 return APIResponse(
                     success=True,
@@ -264,20 +350,23 @@ class MoneyCareAPIClient:
                     data=data,
                     error=None,
                     latency_ms=latency_ms,
-                    raw_response=response.text
+                    raw_response=response.text,
+                    phase_timings_ms=timings
                 )
             else:
+                self._retry_after = parse_retry_after(response.headers.get("Retry-After"))
                 return APIResponse(
                     success=False,
                     status_code=response.status_code,
                     data=None,
                     error=f"HTTP {response.status_code}: {response.text}",
                     latency_ms=latency_ms,
-                    raw_response=response.text
+                    raw_response=response.text,
+                    phase_timings_ms=timings
                 )
                 
         except requests.exceptions.Timeout:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             return APIResponse(
                 success=False,
                 status_code=0,
@@ -286,7 +375,7 @@ class MoneyCareAPIClient:
                 latency_ms=latency_ms
             )
         except requests.exceptions.ConnectionError as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             return APIResponse(
                 success=False,
                 status_code=0,
@@ -295,7 +384,7 @@ class MoneyCareAPIClient:
                 latency_ms=latency_ms
             )
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             return APIResponse(
                 success=False,
                 status_code=0,
@@ -321,7 +410,15 @@ class MoneyCareAPIClient:
             "conversationId": "uuid",
             "messageId": "uuid"
         }
+        
+        POST /api/ask is not idempotent (a resent transaction message can be
+        saved twice), so it is only retried when the server did not process
+        it: 429 / 503, or a connection that failed before the request was sent.
         """
+        return self._with_retries(lambda: self._ask_once(question, conversation_id), idempotent=False)
+    
+    def _ask_once(self, question: str, conversation_id: Optional[str] = None) -> APIResponse:
+        """Single POST /api/ask request"""
         url = f"{self.config.chatbot_base_url}{self.config.ask_endpoint}"
         
         payload = {
@@ -329,71 +426,152 @@ class MoneyCareAPIClient:
             "conversationId": conversation_id or self.conversation_id
         }
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            response = self.session.post(
+            response, timings = self._timed_request(
+                "POST",
                 url,
                 headers=self._get_headers(),
                 json=payload,
                 timeout=self.config.default_timeout_ms / 1000
             )
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Update conversation ID if returned
-                if data.get("conversationId"):
-                    self.conversation_id = data.get("conversationId")
-                
-                return APIResponse(
-                    success=True,
-                    status_code=response.status_code,
-                    data=data,
-                    error=None,
-                    latency_ms=latency_ms,
-                    raw_response=response.text
-                )
-            elif response.status_code == 429:
-                # Rate limit / message limit exceeded
-                return APIResponse(
-                    success=False,
-                    status_code=response.status_code,
-                    data=response.json() if response.text else None,
-                    error="Rate limit exceeded",
-                    latency_ms=latency_ms,
-                    raw_response=response.text
-                )
-            else:
-                return APIResponse(
-                    success=False,
-                    status_code=response.status_code,
-                    data=None,
-                    error=f"HTTP {response.status_code}: {response.text}",
-                    latency_ms=latency_ms,
-                    raw_response=response.text
-                )
-                
-        except requests.exceptions.Timeout:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            return self._ask_result(response, timings, latency_ms)
+        
+        except requests.exceptions.Timeout as e:
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             return APIResponse(
                 success=False,
                 status_code=0,
                 data=None,
                 error="Request timeout",
-                latency_ms=latency_ms
+                latency_ms=latency_ms,
+                request_sent=not request_not_sent(e)
             )
         except requests.exceptions.ConnectionError as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             return APIResponse(
                 success=False,
                 status_code=0,
                 data=None,
                 error=f"Connection error: {str(e)}",
+                latency_ms=latency_ms,
+                request_sent=not request_not_sent(e)
+            )
+        except Exception as e:
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            return APIResponse(
+                success=False,
+                status_code=0,
+                data=None,
+                error=str(e),
                 latency_ms=latency_ms
             )
+    
+    def ask_stream(
+        self,
+        question: str,
+        conversation_id: Optional[str] = None,
+        on_chunk: Optional[Callable[[str], Optional[bool]]] = None
+    ) -> APIResponse:
+        """
+        Send a question and receive the answer as a stream (Server-Sent Events)
+        
+        Request: same as ask(), plus "stream": true and Accept: text/event-stream
+        
+        Response events (one JSON object per data: line):
+            data: {"delta": "partial answer text"}
+            ...
+            data: {"done": true, "conversationId": "uuid", "messageId": "uuid"}
+        
+        on_chunk is called with each partial answer text as it arrives; when
+        it returns True the request is cancelled (connection closed) and the
+        response has the answer so far, with cancelled=True. The returned
+        APIResponse has the same data as ask() (the chunks joined into
+        "answer") plus ttft_ms and chunk_gaps_ms; latency_ms is the total
+        time. A server answering with plain JSON counts as one chunk.
+        
+        Retried like ask() (429 / 503 / not sent only), never once chunks
+        have been received.
+        """
+        return self._with_retries(
+            lambda: self._ask_stream_once(question, conversation_id, on_chunk), idempotent=False
+        )
+    
+    def _ask_stream_once(
+        self,
+        question: str,
+        conversation_id: Optional[str] = None,
+        on_chunk: Optional[Callable[[str], Optional[bool]]] = None
+    ) -> APIResponse:
+        """Single streamed POST /api/ask request"""
+        url = f"{self.config.chatbot_base_url}{self.config.ask_endpoint}"
+        
+        payload = {
+            "question": question,
+            "conversationId": conversation_id or self.conversation_id,
+            "stream": True
+        }
+        headers = self._get_headers()
+        headers["Accept"] = SSE_CONTENT_TYPE
+        
+        reset_connect_timing()
+        start_time = time.perf_counter()
+        try:
+            response = self.session.post(
+                url,
+                headers=headers,
+                json=payload,
+                stream=True,
+                timeout=self.config.default_timeout_ms / 1000
+            )
+            headers_at = time.perf_counter()
+            connect_ms = last_connect_ms()
+            timings = {
+                "connect": connect_ms,
+                "ttfb": max((headers_at - start_time) * 1000 - connect_ms, 0.0)
+            }
+            
+            if response.status_code == 200 and SSE_CONTENT_TYPE in response.headers.get("Content-Type", ""):
+                return self._read_answer_stream(response, start_time, headers_at, timings, on_chunk)
+            
+            # Error, or a server that does not stream: the whole answer at once
+            response.content  # Download the body
+            done_at = time.perf_counter()
+            timings["transfer"] = (done_at - headers_at) * 1000
+            result = self._ask_result(response, timings, int((done_at - start_time) * 1000))
+            if result.success:
+                answer = (result.data or {}).get("answer") or ""
+                if answer and on_chunk:
+                    on_chunk(answer)
+                result.ttft_ms = (done_at - start_time) * 1000
+                result.chunk_gaps_ms = []
+                timings["ttft"] = result.ttft_ms
+                timings["max_chunk_gap"] = 0.0
+            return result
+        
+        except requests.exceptions.Timeout as e:
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            return APIResponse(
+                success=False,
+                status_code=0,
+                data=None,
+                error="Request timeout",
+                latency_ms=latency_ms,
+                request_sent=not request_not_sent(e)
+            )
+        except requests.exceptions.ConnectionError as e:
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            return APIResponse(
+                success=False,
+                status_code=0,
+                data=None,
+                error=f"Connection error: {str(e)}",
+                latency_ms=latency_ms,
+                request_sent=not request_not_sent(e)
+            )
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             return APIResponse(
                 success=False,
                 status_code=0,
@@ -402,18 +580,279 @@ class MoneyCareAPIClient:
                 latency_ms=latency_ms
             )
     
+    def _read_answer_stream(
+        self,
+        response: requests.Response,
+        start_time: float,
+        headers_at: float,
+        timings: Dict[str, float],
+        on_chunk: Optional[Callable[[str], Optional[bool]]] = None
+    ) -> APIResponse:
+        """
+        Read the answer events of a streamed response
+        
+        Records the arrival time of every chunk: ttft = first chunk - request
+        start, gaps = time between consecutive chunks. Closing the response
+        early (cancelled by on_chunk) drops the connection, which stops the
+        server. A stream that breaks off is a failure with the HTTP status
+        (200), so it is not retried.
+        """
+        parts: List[str] = []
+        chunk_times: List[float] = []
+        events: List[str] = []
+        final: Dict[str, Any] = {}
+        decode_ms = 0.0
+        error = None
+        cancelled = False
+        
+        try:
+            for event_data in iter_sse_data(response.iter_content(chunk_size=None)):
+                received_at = time.perf_counter()
+                events.append(event_data)
+                if event_data == "[DONE]":
+                    break
+                event = json.loads(event_data)
+                decode_ms += (time.perf_counter() - received_at) * 1000
+                if not isinstance(event, dict):
+                    continue
+                if event.get("error"):
+                    error = f"Stream error: {event['error']}"
+                    break
+                if event.get("delta"):
+                    parts.append(event["delta"])
+                    chunk_times.append(received_at)
+                    if on_chunk and on_chunk(event["delta"]):
+                        cancelled = True
+                        break
+                if event.get("done"):
+                    final = event
+                    break
+        except (requests.exceptions.RequestException, ValueError) as e:
+            error = f"Stream interrupted after {len(parts)} chunks: {e}"
+        finally:
+            response.close()
+        
+        done_at = time.perf_counter()
+        latency_ms = int((done_at - start_time) * 1000)
+        timings["transfer"] = max((done_at - headers_at) * 1000 - decode_ms, 0.0)
+        timings["decode"] = decode_ms
+        
+        ttft_ms = (chunk_times[0] - start_time) * 1000 if chunk_times else None
+        chunk_gaps_ms = [(later - earlier) * 1000 for earlier, later in zip(chunk_times, chunk_times[1:])]
+        if ttft_ms is not None:
+            timings["ttft"] = ttft_ms
+            timings["max_chunk_gap"] = max(chunk_gaps_ms, default=0.0)
+        
+        raw_response = "".join(f"data: {event_data}\n\n" for event_data in events)
+        if error:
+            return APIResponse(
+                success=False,
+                status_code=response.status_code,
+                data=None,
+                error=error,
+                latency_ms=latency_ms,
+                raw_response=raw_response,
+                phase_timings_ms=timings,
+                ttft_ms=ttft_ms,
+                chunk_gaps_ms=chunk_gaps_ms
+            )
+        
+        data = {key: value for key, value in final.items() if key not in ("done", "delta")}
+        data.setdefault("success", True)
+        data["answer"] = "".join(parts)
+        if cancelled:
+            data["cancelled"] = True
+        
+        # Update conversation ID if returned
+        if data.get("conversationId"):
+            self.conversation_id = data.get("conversationId")
+        
+        return APIResponse(
+            success=True,
+            status_code=response.status_code,
+            data=data,
+            error=None,
+            latency_ms=latency_ms,
+            raw_response=raw_response,
+            phase_timings_ms=timings,
+            ttft_ms=ttft_ms,
+            chunk_gaps_ms=chunk_gaps_ms,
+            cancelled=cancelled,
+            server=response.headers.get("Server")
+        )
+    
+    def _ask_result(
+        self,
+        response: requests.Response,
+        timings: Dict[str, float],
+        latency_ms: int
+    ) -> APIResponse:
+        """APIResponse for a downloaded (non-streamed) /api/ask response"""
+        if response.status_code == 200:
+            decode_start = time.perf_counter()
+            data = response.json()
+            timings["decode"] = (time.perf_counter() - decode_start) * 1000
+            
+            # Update conversation ID if returned
+            if data.get("conversationId"):
+                self.conversation_id = data.get("conversationId")
+            
+            return APIResponse(
+                success=True,
+                status_code=response.status_code,
+                data=data,
+                error=None,
+                latency_ms=latency_ms,
+                raw_response=response.text,
+                phase_timings_ms=timings,
+                server=response.headers.get("Server")
+            )
+        elif response.status_code == 429:
+            # Rate limit / message limit exceeded
+            self._retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            # Gateways / proxies answer 429 with HTML or plain text: still a retryable 429
+            try:
+                data = response.json() if response.text else None
+            except ValueError:
+                data = None
+            return APIResponse(
+                success=False,
+                status_code=response.status_code,
+                data=data,
+                error="Rate limit exceeded",
+                latency_ms=latency_ms,
+                raw_response=response.text,
+                phase_timings_ms=timings
+            )
+        else:
+            self._retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            return APIResponse(
+                success=False,
+                status_code=response.status_code,
+                data=None,
+                error=f"HTTP {response.status_code}: {response.text}",
+                latency_ms=latency_ms,
+                raw_response=response.text,
+                phase_timings_ms=timings
+            )
+    
+    def _mount_timed_adapter(self):
+        """Use connections that record their connect() time (see phase_timing)"""
+        adapter = TimedHTTPAdapter()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def _timed_request(self, method: str, url: str, **kwargs) -> Tuple[requests.Response, Dict[str, float]]:
+        """
+        Send a request and split its latency into connect / ttfb / transfer (ms)
+        
+        The body is downloaded here (stream=True defers it past the headers);
+        "decode" is added by the caller around response.json().
+        """
+        reset_connect_timing()
+        start = time.perf_counter()
+        response = self.session.request(method, url, stream=True, **kwargs)
+        headers_at = time.perf_counter()
+        response.content  # Download the body
+        done_at = time.perf_counter()
+        
+        connect_ms = last_connect_ms()
+        return response, {
+            "connect": connect_ms,
+            "ttfb": max((headers_at - start) * 1000 - connect_ms, 0.0),
+            "transfer": (done_at - headers_at) * 1000,
+            "decode": 0.0
+        }
+    
+    @staticmethod
+    def _is_retryable(response: APIResponse, idempotent: bool = True) -> bool:
+        """
+        Transient failure: rate limit, gateway errors, timeout or connection error
+        
+        Non-idempotent requests only when the server did not process them
+        (429 / 503, or not sent at all).
+        """
+        if not idempotent:
+            return response.status_code in RESEND_STATUS_CODES or (
+                response.status_code == 0 and not response.request_sent
+            )
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            return True
+        return response.status_code == 0 and bool(response.error) and (
+            response.error == "Request timeout" or response.error.startswith("Connection error")
+        )
+    
+    def _with_retries(
+        self,
+        send: Callable[[], APIResponse],
+        endpoint: str = "ask",
+        idempotent: bool = True
+    ) -> APIResponse:
+        """
+        Send a request with retries and backoff
+        
+        Waits on the shared rate limiter before every attempt. Returns the
+        last response with .attempts set. When retried, latency_ms is the
+        total time from the first attempt (failed attempts and backoff
+        included) and phase_timings_ms["retries"] the part before the last
+        attempt. Every attempt is reported to metrics (as endpoint).
+        """
+        attempt = 0
+        first_sent_at = None
+        while True:
+            attempt += 1
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            
+            self._retry_after = None
+            if self.metrics:
+                self.metrics.request_started()
+            sent_at = time.perf_counter()
+            if first_sent_at is None:
+                first_sent_at = sent_at
+            response = send()
+            response.attempts = attempt
+            if self.metrics:
+                self.metrics.request_finished(endpoint, response.latency_ms, response.status_code, response.success)
+            
+            if response.success or attempt > self.config.max_retries or not self._is_retryable(response, idempotent):
+                break
+            
+            delay = backoff_delay(
+                attempt,
+                base_delay=self.config.retry_delay_ms / 1000,
+                max_delay=self.config.retry_max_delay_ms / 1000,
+                retry_after=self._retry_after
+            )
+            if response.status_code == 429 and self.rate_limiter:
+                # Back off every client sharing the limiter, not just this one
+                self.rate_limiter.pause(delay)
+            logger.info(
+                "Retry %d/%d in %.1fs: %s", attempt + 1, self.config.max_retries + 1, delay, response.error,
+                extra={"status_code": response.status_code}
+            )
+            time.sleep(delay)
+        
+        if attempt > 1:
+            retries_ms = (sent_at - first_sent_at) * 1000
+            response.latency_ms += int(retries_ms)
+            response.phase_timings_ms = dict(response.phase_timings_ms or {}, retries=retries_ms)
+            if not response.success:
+                response.error = f"{response.error} (after {attempt} attempts)"
+        return response
+    
     def get_conversations(self) -> APIResponse:
         """Get all conversations for current user/guest"""
         url = f"{self.config.chatbot_base_url}/api/conversations"
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             response = self.session.get(
                 url,
                 headers=self._get_headers(),
                 timeout=self.config.default_timeout_ms / 1000
             )
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             
             return APIResponse(
                 success=response.status_code == 200,
@@ -429,21 +868,21 @@ class MoneyCareAPIClient:
                 status_code=0,
                 data=None,
                 error=str(e),
-                latency_ms=int((time.time() - start_time) * 1000)
+                latency_ms=int((time.perf_counter() - start_time) * 1000)
             )
     
     def get_messages(self, conversation_id: str) -> APIResponse:
         """Get all messages in a conversation"""
         url = f"{self.config.chatbot_base_url}/api/conversations/{conversation_id}/messages"
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             response = self.session.get(
                 url,
                 headers=self._get_headers(),
                 timeout=self.config.default_timeout_ms / 1000
             )
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             
             return APIResponse(
                 success=response.status_code == 200,
@@ -459,7 +898,7 @@ class MoneyCareAPIClient:
                 status_code=0,
                 data=None,
                 error=str(e),
-                latency_ms=int((time.time() - start_time) * 1000)
+                latency_ms=int((time.perf_counter() - start_time) * 1000)
             )
     
     def reset_session(self):
@@ -469,8 +908,11 @@ class MoneyCareAPIClient:
         - guest_new: Creates new fingerprint
         - guest_existing: Keeps same fingerprint
         - user: Keeps JWT token and re-sets cookie
+        
+        The requests.Session (and its keep-alive connections) is kept; only
+        its cookies are cleared.
         """
-        self.session = requests.Session()
+        self.session.cookies.clear()
         self.conversation_id = None
         
         if self.identity.mode == "guest_new":
@@ -494,36 +936,29 @@ class MoneyCareAPIClient:
         Useful for testing session persistence
         """
         old_fingerprint = self.fingerprint
-        self.session = requests.Session()
+        self.session.cookies.clear()
         self.owner_id = None
         self.owner_type = None
         self.conversation_id = None
         self.fingerprint = old_fingerprint
     
-    def estimate_token_usage(self, question: str, answer: str) -> Dict[str, int]:
+    def estimate_token_usage(
+        self,
+        question: str,
+        answer: str,
+        response_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Estimate token usage from text length
+        Token usage of one ask request (see token_counter)
         
-        Rule of thumb:
-        - English: ~4 characters per token
-        - Vietnamese: ~2-3 characters per token (diacritics)
-        - Mixed: ~3 characters per token (average)
+        Usage reported by the server in response_data wins; otherwise the
+        tokens of the intent detection + answer calls are counted with the
+        tokenizer of config.llm_model (estimated if tiktoken is missing).
         
-        Returns: {"prompt_tokens": int, "completion_tokens": int, "total_tokens": int}
+        Returns: {"prompt_tokens": int, "completion_tokens": int, "total_tokens": int, "source": str}
         """
-        # Estimate prompt tokens (question + system prompt overhead ~200 tokens)
-        question_tokens = len(question) // 3
-        system_overhead = 200  # Typical system prompt + formatting
-        prompt_tokens = question_tokens + system_overhead
-        
-        # Estimate completion tokens
-        completion_tokens = len(answer) // 3
-        
-        return {
-            "prompt_tokens": prompt_tokens,
-            "completion_tokens": completion_tokens,
-            "total_tokens": prompt_tokens + completion_tokens
-        }
+        counter = get_token_counter(self.config.llm_model, self.config.system_prompts_file)
+        return counter.usage(question, answer, response_data)
     
     def parse_bot_response(self, response_data: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
         """
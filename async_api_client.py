@@ -0,0 +1,360 @@
+"""
+Async API Client for MoneyCare Chatbot
+asyncio/aiohttp counterpart of MoneyCareAPIClient
+
+Many clients can share one aiohttp.ClientSession (one connection pool), so a
+single process can keep hundreds of conversations in flight without a thread
+per request. Cookies (GUEST_ID, ACCESS_TOKEN) are tracked per client, not in
+the shared session, so identities never leak between conversations.
+
+Usage:
+    async with create_http_session(config, limit=200) as http_session:
+        clients = [AsyncMoneyCareAPIClient(config, http_session=http_session) for _ in range(100)]
+        await asyncio.gather(*(c.init_session() for c in clients))
+        responses = await asyncio.gather(*(c.ask("chi 50k ăn trưa") for c in clients))
+"""
+import asyncio
+import json
+import time
+from typing import Dict, Any, Optional, Tuple
+
+import aiohttp
+from asyncio_throttle import Throttler
+
+from config import TestConfig
+from api_client import APIResponse, TestIdentity, MoneyCareAPIClient
+
+
+def create_http_session(config: TestConfig, limit: int = 100) -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session (connection pool) that can be shared by many clients
+    
+    - limit: max simultaneous connections in the pool
+    - Cookie jar is disabled: each AsyncMoneyCareAPIClient keeps its own cookies
+    """
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit)
+    timeout = aiohttp.ClientTimeout(total=config.default_timeout_ms / 1000)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        cookie_jar=aiohttp.DummyCookieJar()
+    )
+
+
+class AsyncMoneyCareAPIClient:
+    """
+    Async client for interacting with MoneyCare Chatbot API
+    
+    Same surface as MoneyCareAPIClient (init_session / ask / get_conversations /
+    get_messages / parse_bot_response), but every network call is a coroutine.
+    
+    Supports the same 3 identity modes (guest_new, guest_existing, user).
+    
+    Usage:
+        # Standalone (client owns its session)
+        async with AsyncMoneyCareAPIClient(config) as client:
+            await client.init_session()
+            response = await client.ask("chi 50k ăn trưa")
+        
+        # Shared connection pool + optional request rate limit
+        throttler = Throttler(rate_limit=50, period=1.0)
+        client = AsyncMoneyCareAPIClient(config, identity, http_session=session, throttler=throttler)
+    """
+    
+    def __init__(
+        self,
+        config: TestConfig,
+        identity: TestIdentity = None,
+        http_session: Optional[aiohttp.ClientSession] = None,
+        throttler: Optional[Throttler] = None
+    ):
+        self.config = config
+        self.identity = identity or TestIdentity.guest_new()
+        self.http_session = http_session
+        self._owns_http_session = http_session is None
+        self.throttler = throttler
+        self.cookies: Dict[str, str] = {}  # Per-client cookies (GUEST_ID, ACCESS_TOKEN)
+        
+        # Identity info (populated after init_session)
+        self.owner_id: Optional[str] = None
+        self.owner_type: Optional[str] = None  # "guest" or "user"
+        self.conversation_id: Optional[str] = None
+        
+        # Setup based on identity mode
+        self._setup_identity()
+    
+    # Identity handling and response parsing are shared with the sync client
+    _setup_identity = MoneyCareAPIClient._setup_identity
+    _generate_fingerprint = MoneyCareAPIClient._generate_fingerprint
+    _get_headers = MoneyCareAPIClient._get_headers
+    set_jwt_token = MoneyCareAPIClient.set_jwt_token
+    estimate_token_usage = MoneyCareAPIClient.estimate_token_usage
+    parse_bot_response = MoneyCareAPIClient.parse_bot_response
+    
+    def _setup_cookies(self):
+        """Setup cookies for authentication"""
+        if self.identity.mode == "user" and self.jwt_token:
+            # Set ACCESS_TOKEN cookie for authenticated user
+            self.cookies["ACCESS_TOKEN"] = self.jwt_token
+    
+    async def __aenter__(self) -> "AsyncMoneyCareAPIClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def close(self):
+        """Close the HTTP session if this client created it"""
+        if self._owns_http_session and self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating a private one on first use"""
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = create_http_session(self.config)
+            self._owns_http_session = True
+        return self.http_session
+    
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        json_body: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, str]:
+        """Send one request with this client's headers/cookies, return (status, body text)"""
+        session = self._get_http_session()
+        
+        async def send() -> Tuple[int, str]:
+            async with session.request(
+                method,
+                url,
+                headers=self._get_headers(),
+                json=json_body,
+                cookies=self.cookies
+            ) as response:
+                text = await response.text()
+                # Keep cookies set by the server (e.g. GUEST_ID) for this client only
+                for name, morsel in response.cookies.items():
+                    self.cookies[name] = morsel.value
+                return response.status, text
+        
+        if self.throttler:
+            async with self.throttler:
+                return await send()
+        return await send()
+    
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        json_body: Optional[Dict[str, Any]] = None,
+        connection_error_hint: str = ""
+    ) -> Tuple[Optional[int], Optional[str], int, Optional[APIResponse]]:
+        """
+        Send a request and map transport errors to APIResponse
+        
+        Returns: (status, text, latency_ms, error_response)
+        error_response is set (and status/text are None) when the request failed
+        """
+        start_time = time.perf_counter()
+        try:
+            status, text = await self._request(method, url, json_body)
+            return status, text, int((time.perf_counter() - start_time) * 1000), None
+        except asyncio.TimeoutError:
+            error = "Request timeout"
+        except aiohttp.ClientConnectionError as e:
+            error = f"Connection error: {str(e)}{connection_error_hint}"
+        except Exception as e:
+            error = str(e)
+        
+        latency_ms = int((time.perf_counter() - start_time) * 1000)
+        return None, None, latency_ms, APIResponse(
+            success=False,
+            status_code=0,
+            data=None,
+            error=error,
+            latency_ms=latency_ms
+        )
+    
+    async def init_session(self) -> APIResponse:
+        """
+        Initialize a new session - MUST be called first
+        
+        See MoneyCareAPIClient.init_session for the request/response format.
+        """
+        url = f"{self.config.chatbot_base_url}{self.config.init_session_endpoint}"
+        
+        status, text, latency_ms, error_response = await self._send(
+            "GET", url,
+            connection_error_hint=f". Is the chatbot service running at {self.config.chatbot_base_url}?"
+        )
+        if error_response:
+            return error_response
+        
+        if status == 200:
+            try:
+                data = json.loads(text)
+            except ValueError as e:
+                return APIResponse(
+                    success=False,
+                    status_code=status,
+                    data=None,
+                    error=f"Invalid JSON response: {e}",
+                    latency_ms=latency_ms,
+                    raw_response=text
+                )
+            
+            # Store identity info - handle both old and new response formats
+            self.owner_id = (
+                data.get("user_id") or
+                data.get("ownerId") or
+                data.get("GUEST_ID") or
+                data.get("guestId")
+            )
+            self.owner_type = data.get("sessionType") or data.get("ownerType", "guest")
+            self.conversation_id = data.get("conversation_id") or data.get("conversationId")
+            
+            return APIResponse(
+                success=True,
+                status_code=status,
+                data=data,
+                error=None,
+                latency_ms=latency_ms,
+                raw_response=text
+            )
+        
+        return APIResponse(
+            success=False,
+            status_code=status,
+            data=None,
+            error=f"HTTP {status}: {text}",
+            latency_ms=latency_ms,
+            raw_response=text
+        )
+    
+    async def ask(self, question: str, conversation_id: Optional[str] = None) -> APIResponse:
+        """
+        Send a question to the chatbot
+        
+        See MoneyCareAPIClient.ask for the request/response format.
+        """
+        url = f"{self.config.chatbot_base_url}{self.config.ask_endpoint}"
+        
+        payload = {
+            "question": question,
+            "conversationId": conversation_id or self.conversation_id
+        }
+        
+        status, text, latency_ms, error_response = await self._send("POST", url, json_body=payload)
+        if error_response:
+            return error_response
+        
+        if status == 200:
+            try:
+                data = json.loads(text)
+            except ValueError as e:
+                return APIResponse(
+                    success=False,
+                    status_code=status,
+                    data=None,
+                    error=f"Invalid JSON response: {e}",
+                    latency_ms=latency_ms,
+                    raw_response=text
+                )
+            
+            # Update conversation ID if returned
+            if data.get("conversationId"):
+                self.conversation_id = data.get("conversationId")
+            
+            return APIResponse(
+                success=True,
+                status_code=status,
+                data=data,
+                error=None,
+                latency_ms=latency_ms,
+                raw_response=text
+            )
+        elif status == 429:
+            # Rate limit / message limit exceeded
+            try:
+                data = json.loads(text) if text else None
+            except ValueError:
+                data = None
+            return APIResponse(
+                success=False,
+                status_code=status,
+                data=data,
+                error="Rate limit exceeded",
+                latency_ms=latency_ms,
+                raw_response=text
+            )
+        
+        return APIResponse(
+            success=False,
+            status_code=status,
+            data=None,
+            error=f"HTTP {status}: {text}",
+            latency_ms=latency_ms,
+            raw_response=text
+        )
+    
+    async def _get_json(self, url: str) -> APIResponse:
+        """GET a JSON resource"""
+        status, text, latency_ms, error_response = await self._send("GET", url)
+        if error_response:
+            return error_response
+        
+        data = None
+        if status == 200:
+            try:
+                data = json.loads(text)
+            except ValueError as e:
+                return APIResponse(
+                    success=False,
+                    status_code=status,
+                    data=None,
+                    error=f"Invalid JSON response: {e}",
+                    latency_ms=latency_ms,
+                    raw_response=text
+                )
+        
+        return APIResponse(
+            success=status == 200,
+            status_code=status,
+            data=data,
+            error=None if status == 200 else text,
+            latency_ms=latency_ms,
+            raw_response=text
+        )
+    
+    async def get_conversations(self) -> APIResponse:
+        """Get all conversations for current user/guest"""
+        return await self._get_json(f"{self.config.chatbot_base_url}{self.config.conversations_endpoint}")
+    
+    async def get_messages(self, conversation_id: str) -> APIResponse:
+        """Get all messages in a conversation"""
+        return await self._get_json(
+            f"{self.config.chatbot_base_url}{self.config.conversations_endpoint}/{conversation_id}/messages"
+        )
+    
+    def reset_session(self):
+        """
+        Reset session for new test (connection pool is kept)
+        Behavior depends on identity mode - same as MoneyCareAPIClient.reset_session
+        """
+        self.cookies = {}
+        self.conversation_id = None
+        
+        if self.identity.mode == "guest_new":
+            # New guest = new fingerprint
+            self.fingerprint = self._generate_fingerprint()
+            self.owner_id = None
+            self.owner_type = None
+        elif self.identity.mode == "guest_existing":
+            # Keep fingerprint to maintain guest identity
+            self.owner_id = self.identity.guest_id
+        elif self.identity.mode == "user":
+            # Keep user identity and re-set cookie
+            self.owner_id = self.identity.user_id
+            self.owner_type = "user"
+            self._setup_cookies()
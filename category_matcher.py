@@ -0,0 +1,172 @@
+"""
+Category Matcher - Vietnamese-aware fuzzy matching of category names
+
+TestEvaluator used to compare category_name with substring checks and
+whitespace word overlap, which scores "an uong" vs "Ăn uống" as 0. This
+matcher keeps the substring rule (by words) and adds accent-insensitive
+trigram similarity:
+
+- Names are NFC-normalized, lowercased and diacritic-folded, and all
+  spaces/punctuation are dropped ("Ăn uống", "an uong", "ăn-uống" -> "anuong"),
+  so accents and compound-word spelling do not matter: 1.0.
+- A bot name that is another category of CATEGORY_VOCABULARY is a
+  different category: 0.0.
+- Names outside the vocabulary: when all words of one name are words of the
+  other ("Uống" / "Ăn uống & Cafe" vs "Ăn uống") 0.8, as the old substring
+  rule; otherwise the larger of the trigram Dice coefficient and the old
+  word-overlap credit, and 0.0 when the name is closer to another known
+  category than to the expected one (trigram index over the vocabulary).
+
+Trade-offs: a shortened name is credited like an abbreviation, so the
+generic "Thu nhập" still matches "Thu nhập khác" (0.8); diacritic folding
+makes different words equal ("lãi" / "lại"), only whole words are compared.
+
+Scores are cached per (expected, actual) pair, so large result sets (load
+tests, rescore.py) pay for each distinct pair once.
+
+Usage:
+    matcher = get_category_matcher()
+    matcher.similarity("Ăn uống", "an uong")          # 1.0
+    matcher.similarity("Ăn uống", "Uống")             # 0.8 (match)
+    matcher.similarity("Mua sắm", "Mua sắm online")   # 0.8 (match)
+    matcher.similarity("Thu nhập khác", "Thu nhập")   # 0.8 (match, see trade-offs)
+    matcher.similarity("Ăn uống", "Đồ ăn")            # 0.35 (no match)
+    matcher.similarity("Thu nhập khác", "Lương")      # 0.0 (another known category)
+    matcher.similarity("Lương", "Thu nhập")           # 0.0 (closer to "Thu nhập khác")
+    matcher.nearest("mua sam online")                # ("Mua sắm", 0.6)
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from config import CATEGORY_VOCABULARY
+from text_utils import normalize_text, fold_diacritics
+
+
+# Minimum similarity counted as a category match (as the old word overlap)
+CATEGORY_MATCH_THRESHOLD = 0.5
+
+# Credit when one name's words are all in the other (old substring rule)
+CONTAINED_SCORE = 0.8
+# Old word-overlap credit: share of the expected words x 0.7
+WORD_OVERLAP_WEIGHT = 0.7
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=4096)
+def category_key(name: str) -> str:
+    """Comparison form of a category name ("Ăn uống" -> "anuong")"""
+    return _NON_WORD.sub("", fold_diacritics(normalize_text(name)))
+
+
+@lru_cache(maxsize=4096)
+def category_words(name: str) -> FrozenSet[str]:
+    """Diacritic-folded words of a category name ("Ăn uống & Cafe" -> {"an", "uong", "cafe"})"""
+    return frozenset(word for word in _NON_WORD.split(fold_diacritics(normalize_text(name))) if word)
+
+
+@lru_cache(maxsize=4096)
+def trigrams(key: str) -> FrozenSet[str]:
+    """Character trigrams of a key, padded so short keys still have some"""
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def dice(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Dice coefficient of two trigram sets"""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class CategoryMatcher:
+    """Trigram index over the known categories (build once, reuse for every result)"""
+    
+    def __init__(self, vocabulary: List[str] = None):
+        vocabulary = CATEGORY_VOCABULARY if vocabulary is None else vocabulary
+        
+        self.categories: List[str] = []
+        self._keys: List[str] = []
+        self._trigrams: List[FrozenSet[str]] = []
+        self._index: Dict[str, List[int]] = {}  # trigram -> category ids
+        for name in vocabulary:
+            key = category_key(name)
+            if not key or key in self._keys:
+                continue
+            category_id = len(self.categories)
+            self.categories.append(name)
+            self._keys.append(key)
+            self._trigrams.append(trigrams(key))
+            for trigram in self._trigrams[category_id]:
+                self._index.setdefault(trigram, []).append(category_id)
+        
+        # Per-instance caches (bound to this index)
+        self.similarity = lru_cache(maxsize=65536)(self._similarity)
+        self._nearest_key = lru_cache(maxsize=16384)(self._nearest_by_key)
+    
+    def _nearest_by_key(self, key: str) -> Tuple[Optional[int], float]:
+        """Closest known category (id, similarity) for a key"""
+        grams = trigrams(key)
+        shared = Counter(
+            category_id
+            for trigram in grams
+            for category_id in self._index.get(trigram, ())
+        )
+        best_id, best_score = None, 0.0
+        for category_id, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._trigrams[category_id]))
+            if score > best_score:
+                best_id, best_score = category_id, score
+        return best_id, best_score
+    
+    def nearest(self, name: str) -> Tuple[Optional[str], float]:
+        """Closest known category name and its similarity (None if nothing in common)"""
+        category_id, score = self._nearest_key(category_key(name))
+        return (self.categories[category_id] if category_id is not None else None), score
+    
+    def _similarity(self, expected: str, actual: str) -> float:
+        """
+        Partial credit (0.0 - 1.0) for the bot's category name
+        
+        1.0 when the names are the same up to case, diacritics and spacing;
+        0.0 when actual is another known category; for other names 0.8 when
+        one name's words contain the other's, else the trigram / word
+        overlap similarity, or 0.0 when actual is closer to a different
+        known category than to the expected one.
+        """
+        expected_key = category_key(expected)
+        actual_key = category_key(actual)
+        if not expected_key or not actual_key:
+            return 0.0
+        if expected_key == actual_key:
+            return 1.0
+        if actual_key in self._keys:
+            return 0.0
+        
+        expected_words = category_words(expected)
+        actual_words = category_words(actual)
+        if expected_words <= actual_words or actual_words <= expected_words:
+            return CONTAINED_SCORE
+        
+        score = max(
+            dice(trigrams(expected_key), trigrams(actual_key)),
+            len(expected_words & actual_words) / len(expected_words) * WORD_OVERLAP_WEIGHT
+        )
+        nearest_id, nearest_score = self._nearest_key(actual_key)
+        if nearest_id is not None and self._keys[nearest_id] != expected_key and nearest_score > score:
+            return 0.0
+        return round(score, 4)
+
+
+# Shared instance (building the matcher indexes the vocabulary)
+_default_matcher: Optional[CategoryMatcher] = None
+
+
+def get_category_matcher() -> CategoryMatcher:
+    """Matcher over CATEGORY_VOCABULARY"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = CategoryMatcher()
+    return _default_matcher
@@ -0,0 +1,318 @@
+"""
+Columnar Store - Typed Parquet copy of a run's results
+
+Results files (test_run_*.json / .jsonl) hold TestRunResult.to_dict()
+records whose nested fields (Actual_Parsed_Transaction, Token_Usage,
+OWASP_Check ...) are JSON strings, so every analysis parses every field of
+every record. At the end of a run the runner also writes
+test_run_*.parquet next to the journal:
+
+- one column per to_dict() key, typed: Measured_Latency_ms int64,
+  Measured_Cost_VND / Accuracy_Score_percent float64 (unrounded),
+  Response_Similarity_percent float64 (null when not scored), Issues_Found bool
+- Actual_Parsed_Transaction and Token_Usage are struct columns; keys without
+  a typed field (summary, emotion ...) are kept as JSON in their "extra" field
+- Phase_Timings_ms, CLASS_Principles_Check and OWASP_Check are map columns
+- run_info, summary and test_cases are stored in the file's key-value metadata
+- readers select columns and filter rows, so a query only decodes the
+  column chunks it needs
+
+pyarrow is an optional dependency: without it no Parquet file is written
+and the JSON results files are used as before. load_results_file() reads
+.parquet files too, as to_dict() records (nested fields as dicts, which
+TestRunResult.from_dict() accepts as well as JSON strings).
+
+Usage:
+    python columnar_store.py convert test_results/test_run_20251226_022350.json
+    
+    df = read_results_frame(path, columns=["Test_Case_ID", "Measured_Latency_ms"])
+    data = read_results(path, filters=[("Pass_Fail", "in", ["Fail", "Error"])])
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: JSON results only
+    pa = None
+    pq = None
+
+from models import TestRunResult
+from results_journal import load_results_file
+
+
+PARQUET_SUFFIX = ".parquet"
+
+# Key-value metadata of the file (JSON values)
+METADATA_KEYS = ["run_info", "summary", "test_cases"]
+
+# Struct columns: typed fields (Python type of accepted values)
+TRANSACTION_FIELDS = {
+    "transaction_type": str,
+    "amount": float,
+    "currency": str,
+    "category_id": str,
+    "category_name": str,
+    "transaction_date": str,
+    "description": str,
+    "member_id": str,
+    "display_name": str,
+    "confidence": float,
+    "transactions_count": int,
+    "id": str,
+    "error": str
+}
+TOKEN_USAGE_FIELDS = {
+    "prompt_tokens": int,
+    "completion_tokens": int,
+    "total_tokens": int,
+    "source": str
+}
+STRUCT_COLUMNS = {
+    "Actual_Parsed_Transaction": TRANSACTION_FIELDS,
+    "Token_Usage": TOKEN_USAGE_FIELDS
+}
+EXTRA_FIELD = "extra"
+
+MAP_COLUMNS = ["CLASS_Principles_Check", "OWASP_Check", "Phase_Timings_ms"]
+
+
+def pyarrow_available() -> bool:
+    return pa is not None
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet results (pip install pyarrow)")
+
+
+def results_schema() -> "pa.Schema":
+    """Arrow schema of a results file (column names of TestRunResult.to_dict())"""
+    _require_pyarrow()
+    arrow_types = {str: pa.string(), float: pa.float64(), int: pa.int64()}
+    
+    def struct(fields: Dict[str, type]) -> "pa.DataType":
+        return pa.struct(
+            [(name, arrow_types[kind]) for name, kind in fields.items()] + [(EXTRA_FIELD, pa.string())]
+        )
+    
+    return pa.schema([
+        ("Test_Run_ID", pa.string()),
+        ("Test_Case_ID", pa.string()),
+        ("Date", pa.string()),
+        ("Tester", pa.string()),
+        ("Environment", pa.string()),
+        ("LLM_Model", pa.string()),
+        ("Actual_Bot_Response", pa.string()),
+        ("Actual_Parsed_Transaction", struct(TRANSACTION_FIELDS)),
+        ("Pass_Fail", pa.string()),
+        ("Issues_Found", pa.bool_()),
+        ("Issue_IDs", pa.string()),
+        ("Measured_Latency_ms", pa.int64()),
+        ("Measured_Cost_VND", pa.float64()),
+        ("Token_Usage", struct(TOKEN_USAGE_FIELDS)),
+        ("Accuracy_Score_percent", pa.float64()),
+        ("Response_Similarity_percent", pa.float64()),
+        ("Security_Observation", pa.string()),
+        ("Stability_Observation", pa.string()),
+        ("Notes", pa.string()),
+        ("CLASS_Principles_Check", pa.map_(pa.string(), pa.bool_())),
+        ("OWASP_Check", pa.map_(pa.string(), pa.string())),
+        ("Phase_Timings_ms", pa.map_(pa.string(), pa.float64())),
+        ("Repeat_Stats", pa.string()),  # JSON (--repeat runs only)
+        ("Attempts", pa.int64())
+    ])
+
+
+def _fits(value: Any, kind: type) -> bool:
+    if isinstance(value, bool):
+        return False
+    if kind is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, kind)
+
+
+def _struct_value(value: Any, fields: Dict[str, type]) -> Optional[Dict[str, Any]]:
+    """Struct cell of a dict: typed fields, everything else as JSON in "extra" """
+    if not isinstance(value, dict) or not value:
+        return None
+    row: Dict[str, Any] = {}
+    extra = {}
+    for key, item in value.items():
+        kind = fields.get(key)
+        if kind is not None and _fits(item, kind):
+            row[key] = float(item) if kind is float else item
+        else:
+            # Untyped keys, values of another type and explicit nulls (null field = key absent)
+            extra[key] = item
+    row[EXTRA_FIELD] = json.dumps(extra, ensure_ascii=False) if extra else None
+    return row
+
+
+def _struct_dict(value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Dict of a struct cell (null typed fields are keys that were absent)"""
+    if value is None:
+        return None
+    extra = value.pop(EXTRA_FIELD, None)
+    result = {key: item for key, item in value.items() if item is not None}
+    if extra:
+        result.update(json.loads(extra))
+    return result
+
+
+def result_row(result: TestRunResult) -> Dict[str, Any]:
+    """Typed row of one result"""
+    return {
+        "Test_Run_ID": result.test_run_id,
+        "Test_Case_ID": result.test_case_id,
+        "Date": result.date,
+        "Tester": result.tester,
+        "Environment": result.environment,
+        "LLM_Model": result.llm_model,
+        "Actual_Bot_Response": result.actual_bot_response or "",
+        "Actual_Parsed_Transaction": _struct_value(result.actual_parsed_transaction, TRANSACTION_FIELDS),
+        "Pass_Fail": result.pass_fail.value,
+        "Issues_Found": bool(result.issues_found),
+        "Issue_IDs": result.issue_ids,
+        "Measured_Latency_ms": int(result.measured_latency_ms),
+        "Measured_Cost_VND": float(result.measured_cost_vnd),
+        "Token_Usage": _struct_value(result.token_usage, TOKEN_USAGE_FIELDS),
+        "Accuracy_Score_percent": float(result.accuracy_score_percent),
+        "Response_Similarity_percent": result.response_similarity_percent,
+        "Security_Observation": result.security_observation.value,
+        "Stability_Observation": result.stability_observation.value,
+        "Notes": result.notes,
+        "CLASS_Principles_Check": {
+            principle: bool(passed) for principle, passed in result.class_principles_check.items()
+        } if result.class_principles_check else None,
+        "OWASP_Check": {
+            risk_id: str(status) for risk_id, status in result.owasp_check.items()
+        } if result.owasp_check else None,
+        "Phase_Timings_ms": {
+            phase: float(ms) for phase, ms in result.phase_timings_ms.items()
+        } if result.phase_timings_ms else None,
+        "Repeat_Stats": json.dumps(result.repeat_stats) if result.repeat_stats else None,
+        "Attempts": int(result.attempts)
+    }
+
+
+def write_results(
+    path: Union[str, Path],
+    results: List[TestRunResult],
+    run_info: Dict[str, Any],
+    summary: Dict[str, Any],
+    test_cases: List[Dict[str, Any]]
+) -> Path:
+    """Write results (and run_info / summary / test_cases metadata) as Parquet"""
+    _require_pyarrow()
+    path = Path(path)
+    metadata = {"run_info": run_info, "summary": summary, "test_cases": test_cases}
+    schema = results_schema().with_metadata({
+        key: json.dumps(value, ensure_ascii=False, default=str) for key, value in metadata.items()
+    })
+    table = pa.Table.from_pylist([result_row(result) for result in results], schema=schema)
+    
+    # Atomic replace: readers never see a partly written file
+    tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_metadata(path: Union[str, Path]) -> Dict[str, Any]:
+    """run_info / summary / test_cases of a Parquet results file (footer only)"""
+    _require_pyarrow()
+    metadata = pq.read_schema(path).metadata or {}
+    return {
+        key: json.loads(metadata[key.encode()]) if key.encode() in metadata else ({} if key != "test_cases" else [])
+        for key in METADATA_KEYS
+    }
+
+
+def read_results_frame(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None
+):
+    """
+    Results as a pandas DataFrame (typed columns), e.g. for ad-hoc analysis
+    
+    columns: only these columns are read; filters: pyarrow row filters,
+    e.g. [("Pass_Fail", "in", ["Fail", "Error"])].
+    """
+    _require_pyarrow()
+    return pq.read_table(path, columns=columns, filters=filters).to_pandas()
+
+
+def read_results(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None
+) -> Dict[str, Any]:
+    """
+    Read a Parquet results file into the consolidated results structure
+    
+    Returns: {"run_info": {...}, "summary": {...}, "results": [...], "test_cases": [...]}
+    Results are to_dict() records (only the requested columns); nested
+    fields are dicts instead of JSON strings.
+    """
+    _require_pyarrow()
+    table = pq.read_table(path, columns=columns, filters=filters)
+    string_columns = {field.name for field in table.schema if pa.types.is_string(field.type)}
+    
+    records = []
+    for row in table.to_pylist():
+        for name, value in row.items():
+            if name in STRUCT_COLUMNS:
+                row[name] = _struct_dict(value)
+            elif name in MAP_COLUMNS:
+                row[name] = dict(value) if value is not None else None
+            elif name == "Repeat_Stats":
+                row[name] = json.loads(value) if value else None
+            elif name == "Issues_Found":
+                row[name] = "Yes" if value else "No"
+            elif value is None and name in string_columns:
+                row[name] = ""
+        records.append(row)
+    
+    data = read_metadata(path)
+    data["results"] = records
+    return data
+
+
+def convert_results_file(path: Union[str, Path], output_path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Write the Parquet copy of a JSON / JSONL results file
+    
+    Default output: same name with .parquet extension
+    """
+    data = load_results_file(path)
+    output_path = Path(output_path) if output_path else Path(path).with_suffix(PARQUET_SUFFIX)
+    return write_results(
+        output_path,
+        [TestRunResult.from_dict(record) for record in data.get("results", [])],
+        run_info=data.get("run_info", {}),
+        summary=data.get("summary", {}),
+        test_cases=data.get("test_cases", [])
+    )
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != "convert":
+        print("Usage: python columnar_store.py convert <results.json|results.jsonl> [output.parquet]")
+        sys.exit(1)
+    
+    if not pyarrow_available():
+        print("❌ pyarrow is not installed (pip install pyarrow)")
+        sys.exit(1)
+    
+    output_path = convert_results_file(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"✅ Parquet results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Consistency - Merge repeated runs of a test case (--repeat N)
+
+A single sample says little about an LLM chatbot: the same message can be
+parsed into a different transaction, answered with a different intent, or
+take twice as long on the next call. With repeat_count > 1 every test case
+is sent N times and the samples are merged into one result here:
+
+- latency distribution over the answered samples (min / median / p95 /
+  stddev); the merged Measured_Latency_ms is the median, and its latency
+  band and note are recomputed from the median
+- cost and token usage are the means per request
+- response signature per sample: detected intent + the parsed transaction's
+  type, amount, currency, category (diacritic-folded), date and count.
+  Free-text answers only contribute their intent (wording always varies).
+- samples with different signatures or different Pass_Fail verdicts make
+  the case INCONSISTENT (stability observation), whatever the verdict
+- the merged verdict is the worst sample's (Error > Fail > Partial > Pass),
+  so a case that fails one run in five does not pass the release gate
+
+Usage:
+    merged = merge_repeats(samples, evaluator)   # samples: N TestRunResults of one case
+    merged.repeat_stats["latency_ms"]       # {"min": ..., "median": ..., "p95": ..., "stddev": ...}
+"""
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from category_matcher import category_key
+from evaluator import TestEvaluator
+from models import TestRunResult, PassFailStatus, StabilityObservation
+from test_case_index import as_float, as_int
+from token_counter import detect_intent
+
+
+# Worst verdict first (merged result takes the worst sample)
+VERDICT_SEVERITY = {
+    PassFailStatus.ERROR: 4,
+    PassFailStatus.FAIL: 3,
+    PassFailStatus.PARTIAL: 2,
+    PassFailStatus.PASS: 1,
+    PassFailStatus.SKIP: 0
+}
+
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    """min / median / p95 / stddev (sample) of latencies in ms"""
+    if not latencies:
+        return {"min": 0.0, "median": 0.0, "p95": 0.0, "stddev": 0.0}
+    values = np.asarray(latencies, dtype=float)
+    return {
+        "min": round(float(values.min()), 2),
+        "median": round(float(np.median(values)), 2),
+        "p95": round(float(np.percentile(values, 95)), 2),
+        "stddev": round(float(values.std(ddof=1)) if len(values) > 1 else 0.0, 2)
+    }
+
+
+def response_signature(result: TestRunResult) -> Tuple:
+    """What the bot did in one sample: intent + critical parsed transaction fields"""
+    if result.pass_fail == PassFailStatus.ERROR or not result.actual_bot_response:
+        return ("error",)
+    
+    intent = detect_intent(result.actual_bot_response)
+    transaction = result.actual_parsed_transaction
+    if not transaction:
+        return (intent,)
+    if "error" in transaction:
+        return (intent, "error", transaction.get("error"))
+    
+    amount = as_float(transaction.get("amount"))
+    return (
+        intent,
+        transaction.get("transaction_type"),
+        None if math.isnan(amount) else amount,
+        transaction.get("currency"),
+        category_key(str(transaction.get("category_name") or "")),
+        transaction.get("transaction_date"),
+        as_int(transaction.get("transactions_count"))
+    )
+
+
+def mean_token_usage(samples: List[TestRunResult]) -> Optional[Dict[str, Any]]:
+    """Token usage per request averaged over the samples (samples without usage count as 0)"""
+    usages = [r.token_usage for r in samples if r.token_usage]
+    if not usages:
+        return None
+    
+    mean = {
+        key: int(round(sum(as_int(usage.get(key)) or 0 for usage in usages) / len(samples)))
+        for key in ("prompt_tokens", "completion_tokens")
+    }
+    mean["total_tokens"] = mean["prompt_tokens"] + mean["completion_tokens"]
+    sources = {usage.get("source") for usage in usages}
+    if len(sources) == 1 and None not in sources:
+        mean["source"] = sources.pop()
+    return mean
+
+
+def merge_repeats(samples: List[TestRunResult], evaluator: Optional[TestEvaluator] = None) -> TestRunResult:
+    """
+    One result for N samples of the same test case
+    
+    Returns the worst sample with the median latency (latency band and note
+    from the median when evaluator is given), the mean cost and token usage
+    per request and repeat_stats; flagged INCONSISTENT (with a note) when
+    the samples disagree.
+    """
+    if len(samples) == 1:
+        return samples[0]
+    
+    merged = max(samples, key=lambda r: VERDICT_SEVERITY[r.pass_fail])
+    
+    answered = [r for r in samples if r.pass_fail != PassFailStatus.ERROR]
+    stats = latency_stats([r.measured_latency_ms for r in (answered or samples)])
+    
+    verdicts = Counter(r.pass_fail.value for r in samples)
+    signatures = Counter(response_signature(r) for r in samples)
+    consistent = len(verdicts) == 1 and len(signatures) == 1
+    total_cost = sum(r.measured_cost_vnd for r in samples)
+    
+    median_ms = int(round(stats["median"]))
+    if evaluator is not None:
+        evaluator.relabel_latency(merged, median_ms)
+    else:
+        merged.measured_latency_ms = median_ms
+    merged.measured_cost_vnd = total_cost / len(samples)
+    merged.token_usage = mean_token_usage(samples)
+    merged.repeat_stats = {
+        "runs": len(samples),
+        "verdicts": dict(verdicts),
+        "distinct_responses": len(signatures),
+        "consistent": consistent,
+        "latency_ms": stats,
+        "total_cost_vnd": round(total_cost, 2)
+    }
+    
+    if not consistent:
+        merged.stability_observation = StabilityObservation.INCONSISTENT
+        merged.issues_found = True
+        outcomes = ", ".join(f"{verdict} {count}" for verdict, count in verdicts.most_common())
+        merged.notes += (
+            f"Inconsistent over {len(samples)} runs: {outcomes}; "
+            f"{len(signatures)} distinct responses. "
+        )
+    
+    return merged
@@ -4,6 +4,8 @@ Export Failed Tests - Extract failed tests from JSON results for analysis
 
 Usage:
     python export_failed_tests.py test_results/test_run_20251226_022350.json
+    python export_failed_tests.py test_results/test_run_20251226_022350.jsonl
+    python export_failed_tests.py test_results/test_run_20251226_022350.parquet
     
 Output:
     - failed_tests_YYYYMMDD_HHMMSS.json: Failed tests only
@@ -21,25 +23,32 @@ if sys.platform == 'win32':
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
+from models import TestRunResult
+from results_journal import load_results_file
+
+
+FAILED_STATUSES = ["Fail", "Error", "Partial"]
+
 
 def extract_failed_tests(json_path: str) -> tuple:
     """
-    Extract failed tests from JSON results
+    Extract failed tests from JSON results, a JSONL results journal or a Parquet results file
     
     Returns: (failed_results, failed_test_cases, summary_info)
     """
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Parquet: only the failed rows are decoded (JSON files are read whole)
+    data = load_results_file(json_path, filters=[("Pass_Fail", "in", FAILED_STATUSES)])
     
     all_results = data.get("results", [])
     all_test_cases = data.get("test_cases", [])
     run_info = data.get("run_info", {})
     summary = data.get("summary", {})
+    total_tests = summary.get("Total_Tests", len(all_results))
     
-    # Filter failed tests
+    # Filter failed tests (to_dict() records, whatever the file format)
     failed_results = [
-        r for r in all_results 
-        if r.get("Pass_Fail") in ["Fail", "Error", "Partial"]
+        TestRunResult.from_dict(r).to_dict() for r in all_results 
+        if r.get("Pass_Fail") in FAILED_STATUSES
     ]
     
     # Get corresponding test cases
@@ -50,10 +59,10 @@ def extract_failed_tests(json_path: str) -> tuple:
     ]
     
     summary_info = {
-        "total_tests": summary.get("Total_Tests", len(all_results)),
+        "total_tests": total_tests,
         "failed_count": len(failed_results),
         "passed_count": summary.get("Passed", 0),
-        "fail_rate": (len(failed_results) / len(all_results) * 100) if all_results else 0,
+        "fail_rate": (len(failed_results) / total_tests * 100) if total_tests else 0,
         "run_info": run_info,
         "timestamp": datetime.now().isoformat()
     }
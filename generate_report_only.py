@@ -1,6 +1,6 @@
 """
-Generate report from existing test results JSON
-Usage: python generate_report_only.py [json_file_path]
+Generate report from existing test results (JSON, JSONL journal or Parquet)
+Usage: python generate_report_only.py [results_file_path]
 """
 import json
 import sys
@@ -15,36 +15,18 @@ if sys.platform == 'win32':
 
 from config import TestConfig
 from models import TestRunResult, TestSummary, PassFailStatus, SecurityObservation, StabilityObservation
-from report_generator import ReportGenerator
+from report_generator import ReportGenerator, REPORT_COLUMNS
+from results_journal import load_results_file
+from columnar_store import pyarrow_available
+from phase_timing import aggregate_phase_timings
 
 
 def load_results_from_json(json_path: str):
-    """Load test results from JSON file"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    results = []
-    for r in data.get("results", []):
-        result = TestRunResult(
-            test_run_id=r.get("Test_Run_ID", ""),
-            test_case_id=r.get("Test_Case_ID", ""),
-            date=r.get("Date", ""),
-            tester=r.get("Tester", ""),
-            environment=r.get("Environment", ""),
-            llm_model=r.get("LLM_Model", ""),
-            actual_bot_response=r.get("Actual_Bot_Response", ""),
-            actual_parsed_transaction=r.get("Actual_Parsed_Transaction"),
-            pass_fail=PassFailStatus(r.get("Pass_Fail", "Fail")),
-            issues_found=r.get("Issues_Found", False),
-            issue_ids=r.get("Issue_IDs", []),
-            measured_latency_ms=r.get("Measured_Latency_ms", 0),
-            measured_cost_vnd=r.get("Measured_Cost_VND", 0),
-            accuracy_score_percent=r.get("Accuracy_Score_percent", 0),
-            security_observation=SecurityObservation(r.get("Security_Observation", "OK")),
-            stability_observation=StabilityObservation(r.get("Stability_Observation", "OK")),
-            notes=r.get("Notes", "")
-        )
-        results.append(result)
+    """Load test results from a JSON results file, JSONL journal or Parquet file"""
+    # Parquet: only the columns the report reads are decoded
+    data = load_results_file(json_path, columns=REPORT_COLUMNS)
+    
+    results = [TestRunResult.from_dict(r) for r in data.get("results", [])]
     
     # Get test cases from the same file if available
     test_cases = data.get("test_cases", [])
@@ -65,23 +47,32 @@ def calculate_summary(results):
     summary.errors = len([r for r in results if r.pass_fail == PassFailStatus.ERROR])
     summary.skipped = len([r for r in results if r.pass_fail == PassFailStatus.SKIP])
     summary.avg_latency_ms = sum(r.measured_latency_ms for r in results) / len(results) if results else 0
+    summary.total_cost_vnd = sum(
+        r.repeat_stats["total_cost_vnd"] if r.repeat_stats else r.measured_cost_vnd for r in results
+    )
     # Only count tests that have accuracy scores (tests with expected_parsed_transaction)
     accuracy_scores = [r.accuracy_score_percent for r in results if r.accuracy_score_percent > 0]
     summary.avg_accuracy = sum(accuracy_scores) / len(accuracy_scores) if accuracy_scores else 0
+    similarity_scores = [r.response_similarity_percent for r in results if r.response_similarity_percent is not None]
+    summary.avg_similarity = sum(similarity_scores) / len(similarity_scores) if similarity_scores else 0
     summary.security_issues = len([r for r in results if r.security_observation != SecurityObservation.OK])
     summary.stability_issues = len([r for r in results if r.stability_observation != StabilityObservation.OK])
+    summary.phase_timings = aggregate_phase_timings([r.phase_timings_ms for r in results])
     summary.start_time = datetime.now()
     summary.end_time = datetime.now()
     return summary
 
 
 def find_latest_json():
-    """Find the most recent JSON results file"""
+    """Find the most recent results file (Parquet, JSONL journal or JSON)"""
     results_dir = Path("test_results")
     if not results_dir.exists():
         return None
     
-    json_files = list(results_dir.glob("test_run_*.json"))
+    # The Parquet copy is written after the journal, so it wins for the same run
+    json_files = list(results_dir.glob("test_run_*.jsonl")) + list(results_dir.glob("test_run_*.json"))
+    if pyarrow_available():
+        json_files += list(results_dir.glob("test_run_*.parquet"))
     if not json_files:
         # Try old format
         json_files = list(results_dir.glob("test_results_*.json"))
@@ -0,0 +1,244 @@
+"""
+Live Metrics - Rolling-window request metrics and a live console dashboard
+
+The run_tests progress bar only said which test case is running; RPS, error
+rate and p95 were not visible until the report was written. With --live:
+
+- LiveMetrics: API clients / virtual users append request events to a deque
+  (a single atomic append, no lock on the request path); only the dashboard
+  thread drains and aggregates them
+- rolling window (live_window_seconds): ask throughput and p50/p95/p99 of
+  the asks completed in the window
+- cumulative: requests, in-flight, errors, HTTP 429, LLM cost
+- LiveDashboard: rich Live view refreshed at a fixed rate (optionally with
+  the run's progress bar), every value checked against workload_thresholds.json
+
+Usage:
+    metrics = LiveMetrics(window_seconds=10, thresholds=load_workload_thresholds())
+    client = MoneyCareAPIClient(config, identity, metrics=metrics)
+    with LiveDashboard(metrics, progress):
+        ...  # run requests
+"""
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from rich.console import Console, Group
+from rich.live import Live
+from rich.progress import Progress
+from rich.table import Table
+
+
+console = Console()
+
+# Event kinds (first item of an event tuple)
+STARTED = 0
+FINISHED = 1
+COST = 2
+
+STATUS_STYLES = {"OK": "green", "Warning": "yellow", "Fail": "red", "Info": "cyan"}
+
+
+@dataclass
+class MetricsSnapshot:
+    """Aggregated metrics at one point in time"""
+    elapsed_seconds: float = 0.0
+    requests: int = 0
+    asks: int = 0
+    in_flight: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    cost_vnd: float = 0.0
+    window_rps: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    
+    def error_rate(self) -> float:
+        return (self.errors / self.requests * 100) if self.requests else 0.0
+    
+    def avg_cost_vnd(self) -> float:
+        return self.cost_vnd / self.asks if self.asks else 0.0
+
+
+class LiveMetrics:
+    """
+    Request metrics aggregator
+    
+    request_started() / request_finished() / add_cost() may be called from
+    any thread or event loop; snapshot() must only be called from one
+    thread (the dashboard's).
+    """
+    
+    def __init__(self, window_seconds: float = 10.0, thresholds: Optional[Dict[str, Any]] = None):
+        self.window_seconds = window_seconds
+        self.thresholds = thresholds or {}
+        self._events: Deque[Tuple] = deque()
+        
+        # Aggregated state, owned by the snapshot() thread
+        self._started_at = time.monotonic()
+        self._window: Deque[Tuple[float, float]] = deque()  # (finished at, ask latency ms)
+        self._snapshot = MetricsSnapshot()
+    
+    # Producer side (request path)
+    
+    def request_started(self):
+        self._events.append((STARTED,))
+    
+    def request_finished(self, endpoint: str, latency_ms: float, status_code: int, success: bool):
+        self._events.append((FINISHED, time.monotonic(), endpoint, latency_ms, status_code, success))
+    
+    def add_cost(self, cost_vnd: float):
+        self._events.append((COST, cost_vnd))
+    
+    # Consumer side (dashboard thread)
+    
+    def _drain(self):
+        snapshot = self._snapshot
+        while True:
+            try:
+                event = self._events.popleft()
+            except IndexError:
+                return
+            kind = event[0]
+            if kind == STARTED:
+                snapshot.in_flight += 1
+            elif kind == FINISHED:
+                _, finished_at, endpoint, latency_ms, status_code, success = event
+                snapshot.in_flight -= 1
+                snapshot.requests += 1
+                if not success:
+                    snapshot.errors += 1
+                if status_code == 429:
+                    snapshot.rate_limited += 1
+                if endpoint == "ask":
+                    snapshot.asks += 1
+                    if success:
+                        self._window.append((finished_at, latency_ms))
+            else:
+                snapshot.cost_vnd += event[1]
+    
+    def snapshot(self) -> MetricsSnapshot:
+        """Apply pending events and compute the rolling-window values"""
+        self._drain()
+        now = time.monotonic()
+        while self._window and self._window[0][0] < now - self.window_seconds:
+            self._window.popleft()
+        
+        snapshot = self._snapshot
+        snapshot.elapsed_seconds = now - self._started_at
+        span = min(self.window_seconds, snapshot.elapsed_seconds)
+        snapshot.window_rps = len(self._window) / span if span > 0 else 0.0
+        
+        if self._window:
+            latencies = np.sort(np.fromiter((latency for _, latency in self._window), dtype=float))
+            last = len(latencies) - 1
+            # Nearest-rank, as the report sheets
+            snapshot.p50_ms, snapshot.p95_ms, snapshot.p99_ms = (
+                float(latencies[min(int(len(latencies) * pct), last)]) for pct in (0.50, 0.95, 0.99)
+            )
+        else:
+            snapshot.p50_ms = snapshot.p95_ms = snapshot.p99_ms = 0.0
+        return snapshot
+
+
+def _status_max(value: float, warning: Optional[float], limit: Optional[float]) -> str:
+    """Status of a value that must stay below limit (warning above warning)"""
+    if limit is None:
+        return "Info"
+    if value > limit:
+        return "Fail"
+    if warning is not None and value > warning:
+        return "Warning"
+    return "OK"
+
+
+def threshold_rows(snapshot: MetricsSnapshot, thresholds: Dict[str, Any]) -> List[Tuple[str, str, str, str]]:
+    """(metric, value, limit, status) rows against workload_thresholds.json"""
+    throughput = thresholds.get("throughput", {})
+    latency = thresholds.get("latency_percentiles", {})
+    error_rate = thresholds.get("error_rate", {})
+    cost = thresholds.get("cost_per_request", {})
+    
+    min_rps = throughput.get("min_rps")
+    if min_rps is None or not snapshot.asks:
+        rps_status = "Info"
+    elif snapshot.window_rps < min_rps * 0.8:
+        rps_status = "Fail"
+    elif snapshot.window_rps < min_rps:
+        rps_status = "Warning"
+    else:
+        rps_status = "OK"
+    
+    rows = [
+        ("Throughput (ask)", f"{snapshot.window_rps:.1f} rps",
+         f"≥ {min_rps} rps" if min_rps is not None else "", rps_status),
+        ("In flight", str(snapshot.in_flight), "", "Info"),
+        ("Requests", f"{snapshot.requests} ({snapshot.asks} ask)", "", "Info"),
+    ]
+    for name, value in (("p50", snapshot.p50_ms), ("p95", snapshot.p95_ms), ("p99", snapshot.p99_ms)):
+        limit = latency.get(f"{name}_max_ms")
+        rows.append((
+            f"Latency {name}", f"{value:,.0f} ms",
+            f"≤ {limit:,} ms" if limit is not None else "",
+            _status_max(value, None, limit) if snapshot.asks else "Info"
+        ))
+    rows.append((
+        "Errors", f"{snapshot.errors} ({snapshot.error_rate():.1f}%)",
+        f"≤ {error_rate['max_percent']}%" if "max_percent" in error_rate else "",
+        _status_max(snapshot.error_rate(), error_rate.get("warning_percent"), error_rate.get("max_percent"))
+    ))
+    rows.append(("HTTP 429", str(snapshot.rate_limited), "", "Warning" if snapshot.rate_limited else "OK"))
+    rows.append((
+        "Cost", f"{snapshot.cost_vnd:,.1f} VND ({snapshot.avg_cost_vnd():,.1f}/req)",
+        f"≤ {cost['simple_max_vnd']:,} VND/req" if "simple_max_vnd" in cost else "",
+        _status_max(snapshot.avg_cost_vnd(), cost.get("warning_vnd"), cost.get("simple_max_vnd"))
+    ))
+    return rows
+
+
+class LiveDashboard:
+    """rich Live view of LiveMetrics (and a progress bar), refreshed at a fixed rate"""
+    
+    def __init__(
+        self,
+        metrics: LiveMetrics,
+        progress: Optional[Progress] = None,
+        title: str = "Live Metrics",
+        refresh_per_second: float = 4.0
+    ):
+        self.metrics = metrics
+        self.progress = progress
+        self.title = title
+        # Rendering (and metric aggregation) happens on Live's refresh thread
+        self.live = Live(
+            get_renderable=self._render,
+            refresh_per_second=refresh_per_second,
+            console=console
+        )
+    
+    def _render(self):
+        snapshot = self.metrics.snapshot()
+        table = Table(
+            title=f"{self.title} - last {self.metrics.window_seconds:.0f}s window, "
+                  f"{snapshot.elapsed_seconds:.0f}s elapsed"
+        )
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", justify="right")
+        table.add_column("Limit", justify="right")
+        table.add_column("Status")
+        for metric, value, limit, status in threshold_rows(snapshot, self.metrics.thresholds):
+            table.add_row(metric, value, limit, f"[{STATUS_STYLES[status]}]{status}[/]")
+        
+        if self.progress is None:
+            return table
+        return Group(self.progress, table)
+    
+    def __enter__(self) -> "LiveDashboard":
+        self.live.start(refresh=True)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.live.stop()
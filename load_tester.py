@@ -0,0 +1,302 @@
+"""
+Load Tester - Ramps concurrent virtual users against /api/ask
+
+Each workload level (concurrent_users.levels in workload_thresholds.json)
+starts N virtual users over load_ramp_up_seconds. Every virtual user opens its
+own guest/user session and replays test case messages against /api/ask
+load_requests_per_user times. All users of a level share one aiohttp
+connection pool (AsyncMoneyCareAPIClient).
+
+Per level we measure: requests/sec (successful requests only; failures,
+including the requests of users whose session init failed, are in the error
+rate), p50/p95/p99 latency, error rate, cost.
+
+Usage:
+    python load_tester.py -f test_cases_all.json
+    python load_tester.py -f test_cases_all.json --levels 10,50 --requests-per-user 10
+"""
+import argparse
+import asyncio
+import json
+import sys
+import codecs
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+from rich.console import Console
+from rich.table import Table
+
+from config import TestConfig
+from models import TestCase, WorkloadLevelResult
+from api_client import TestIdentity
+from async_api_client import AsyncMoneyCareAPIClient, create_http_session
+from evaluator import TestEvaluator
+from log_setup import setup_logging, LOG_LEVELS
+from live_metrics import LiveMetrics, LiveDashboard
+
+
+console = Console()
+
+
+def load_workload_thresholds(path: str = "workload_thresholds.json") -> Dict[str, Any]:
+    """Load workload thresholds JSON (empty dict if the file is missing)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentile of an already sorted list (same nearest-rank rule as the report sheets)"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * pct), len(sorted_values) - 1)]
+
+
+class LoadTester:
+    """Runs concurrent-users load levels and measures throughput/latency"""
+    
+    def __init__(
+        self,
+        config: TestConfig,
+        identity: Optional[TestIdentity] = None,
+        thresholds: Optional[Dict[str, Any]] = None
+    ):
+        self.config = config
+        self.identity = identity or TestIdentity.guest_new()
+        self.thresholds = thresholds if thresholds is not None else load_workload_thresholds(
+            config.workload_thresholds_file
+        )
+        self.evaluator = TestEvaluator(config)
+    
+    def get_levels(self) -> List[int]:
+        """Concurrent users levels: workload_thresholds.json first, then TestConfig"""
+        levels = self.thresholds.get("concurrent_users", {}).get("levels")
+        return list(levels or self.config.concurrent_users_levels)
+    
+    def _level_targets(self, users: int) -> Dict[str, Any]:
+        """Find the workload_levels entry (light/medium/...) for a users count"""
+        for name, level in self.thresholds.get("workload_levels", {}).items():
+            if isinstance(level, dict) and level.get("concurrent_users") == users:
+                return {"name": name, **level}
+        return {"name": f"{users}_users"}
+    
+    async def _virtual_user(
+        self,
+        user_idx: int,
+        users: int,
+        messages: List[str],
+        http_session,
+        samples: List[Dict[str, Any]],
+        metrics: Optional[LiveMetrics] = None
+    ):
+        """One virtual user: open a session, then replay messages sequentially"""
+        # Ramp up: spread user start times evenly over the ramp-up period
+        if users > 1 and self.config.load_ramp_up_seconds > 0:
+            await asyncio.sleep(self.config.load_ramp_up_seconds * user_idx / users)
+        
+        client = AsyncMoneyCareAPIClient(self.config, self.identity, http_session=http_session)
+        if metrics:
+            metrics.request_started()
+        init_response = await client.init_session()
+        if metrics:
+            metrics.request_finished(
+                "init_session", init_response.latency_ms, init_response.status_code, init_response.success
+            )
+        
+        for k in range(self.config.load_requests_per_user):
+            message = messages[(user_idx * self.config.load_requests_per_user + k) % len(messages)]
+            
+            if not init_response.success:
+                # Could not open a session: every planned request of this user fails
+                samples.append({
+                    "start": time.time(), "end": time.time(),
+                    "latency_ms": init_response.latency_ms, "success": False,
+                    "status_code": init_response.status_code, "cost_vnd": 0.0
+                })
+                continue
+            
+            if metrics:
+                metrics.request_started()
+            start = time.time()
+            response = await client.ask(message)
+            end = time.time()
+            if metrics:
+                metrics.request_finished("ask", response.latency_ms, response.status_code, response.success)
+            
+            cost_vnd = 0.0
+            if response.success:
+                answer, _ = client.parse_bot_response(response.data or {})
+                token_usage = client.estimate_token_usage(question=message, answer=answer, response_data=response.data)
+                cost_vnd = self.evaluator.calculate_cost(
+                    prompt_tokens=token_usage["prompt_tokens"],
+                    completion_tokens=token_usage["completion_tokens"]
+                )
+                if metrics:
+                    metrics.add_cost(cost_vnd)
+            
+            samples.append({
+                "start": start, "end": end,
+                "latency_ms": response.latency_ms, "success": response.success,
+                "status_code": response.status_code, "cost_vnd": cost_vnd
+            })
+    
+    async def run_level(
+        self,
+        users: int,
+        messages: List[str],
+        metrics: Optional[LiveMetrics] = None
+    ) -> WorkloadLevelResult:
+        """Run one workload level with `users` concurrent virtual users"""
+        targets = self._level_targets(users)
+        samples: List[Dict[str, Any]] = []
+        
+        async with create_http_session(self.config, limit=users) as http_session:
+            await asyncio.gather(*(
+                self._virtual_user(i, users, messages, http_session, samples, metrics)
+                for i in range(users)
+            ))
+        
+        result = WorkloadLevelResult(
+            level_name=targets["name"],
+            concurrent_users=users,
+            expected_throughput_rps=targets.get("expected_throughput_rps"),
+            max_latency_ms=targets.get("max_latency_ms")
+        )
+        if not samples:
+            return result
+        
+        successes = [s for s in samples if s["success"]]
+        latencies = sorted(s["latency_ms"] for s in successes)
+        
+        result.total_requests = len(samples)
+        result.successful = len(successes)
+        result.failed = len(samples) - len(successes)
+        result.rate_limited = len([s for s in samples if s["status_code"] == 429])
+        result.duration_seconds = max(s["end"] for s in samples) - min(s["start"] for s in samples)
+        # Fast failures are not throughput: a level where everything fails reports 0 rps
+        result.throughput_rps = result.successful / result.duration_seconds if result.duration_seconds > 0 else 0.0
+        
+        if latencies:
+            result.avg_latency_ms = sum(latencies) / len(latencies)
+            result.p50_latency_ms = percentile(latencies, 0.50)
+            result.p95_latency_ms = percentile(latencies, 0.95)
+            result.p99_latency_ms = percentile(latencies, 0.99)
+            result.avg_cost_vnd = sum(s["cost_vnd"] for s in successes) / len(successes)
+        
+        return result
+    
+    def run(self, test_cases: List[TestCase], levels: Optional[List[int]] = None) -> List[WorkloadLevelResult]:
+        """Run all workload levels in order (one level at a time)"""
+        messages = [tc.user_message_input for tc in test_cases if tc.user_message_input]
+        if not messages:
+            raise ValueError("No test case messages to replay")
+        
+        results = []
+        for users in (levels or self.get_levels()):
+            console.print(
+                f"[cyan]Load level: {users} concurrent users x "
+                f"{self.config.load_requests_per_user} requests...[/cyan]"
+            )
+            if self.config.live_dashboard:
+                metrics = LiveMetrics(self.config.live_window_seconds, self.thresholds)
+                with LiveDashboard(
+                    metrics,
+                    title=f"Load level: {users} users",
+                    refresh_per_second=self.config.live_refresh_per_second
+                ):
+                    level_result = asyncio.run(self.run_level(users, messages, metrics))
+            else:
+                level_result = asyncio.run(self.run_level(users, messages))
+            results.append(level_result)
+            console.print(
+                f"  {level_result.throughput_rps:.1f} rps, "
+                f"p95 {level_result.p95_latency_ms:.0f} ms, "
+                f"errors {level_result.error_rate():.1f}%"
+            )
+        return results
+    
+    def save_results(self, results: List[WorkloadLevelResult]) -> Path:
+        """Save workload results to test_results/workload_run_*.json"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = Path(self.config.results_dir) / f"workload_run_{timestamp}.json"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        data = {
+            "run_info": {
+                "timestamp": datetime.now().isoformat(),
+                "environment": self.config.environment,
+                "llm_model": self.config.llm_model,
+                "chatbot_base_url": self.config.chatbot_base_url,
+                "requests_per_user": self.config.load_requests_per_user,
+                "ramp_up_seconds": self.config.load_ramp_up_seconds
+            },
+            "levels": [r.to_dict() for r in results]
+        }
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return file_path
+    
+    @staticmethod
+    def print_results(results: List[WorkloadLevelResult]):
+        """Print workload results table to console"""
+        table = Table(title="Workload Analysis")
+        for column in ["Level", "Users", "Requests", "Errors %", "RPS", "P50 ms", "P95 ms", "P99 ms"]:
+            table.add_column(column)
+        for r in results:
+            table.add_row(
+                r.level_name, str(r.concurrent_users), str(r.total_requests),
+                f"{r.error_rate():.1f}", f"{r.throughput_rps:.1f}",
+                f"{r.p50_latency_ms:.0f}", f"{r.p95_latency_ms:.0f}", f"{r.p99_latency_ms:.0f}"
+            )
+        console.print(table)
+
+
+def parse_levels(value: str) -> List[int]:
+    """Parse a comma-separated levels argument, e.g. "10,50,100" """
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MoneyCare Chatbot load test (concurrent users)")
+    parser.add_argument("--test-file", "-f", required=True, help="Path to test cases JSON file")
+    parser.add_argument("--url", default="http://127.0.0.1:3333", help="Chatbot API base URL")
+    parser.add_argument("--levels", type=parse_levels,
+                        help="Comma-separated concurrent users levels (default: from workload_thresholds.json)")
+    parser.add_argument("--requests-per-user", type=int, default=5, help="Requests per virtual user (default: 5)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Ramp-up seconds per level (default: 5)")
+    parser.add_argument("--live", action="store_true", help="Live dashboard of the running level")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="WARNING", help="Console log level")
+    parser.add_argument("--log-file", default="test_results/moneycare.log",
+                        help="DEBUG-level log file ('' to disable)")
+    args = parser.parse_args()
+    
+    config = TestConfig(
+        chatbot_base_url=args.url,
+        load_requests_per_user=args.requests_per_user,
+        load_ramp_up_seconds=args.ramp_up,
+        live_dashboard=args.live,
+        log_level=args.log_level,
+        log_file=args.log_file
+    )
+    setup_logging(config.log_level, config.log_file or None)
+    
+    with open(args.test_file, 'r', encoding='utf-8') as f:
+        test_cases = [TestCase.from_dict(tc) for tc in json.load(f).get("test_cases", [])]
+    
+    tester = LoadTester(config, TestIdentity.from_config_file())
+    results = tester.run(test_cases, levels=args.levels)
+    tester.print_results(results)
+    console.print(f"[green]Workload results saved to: {tester.save_results(results)}[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Log Setup - Leveled, buffered logging for the test framework
+
+API clients used to print() several lines per session (identity, owner,
+conversation, the whole cookie jar). With --workers N or hundreds of load
+test users that is console contention, interleaved output and terminal I/O
+on the request path. Framework modules log through get_logger() instead:
+
+- one "moneycare" logger tree; records go into a queue (QueueHandler), a
+  QueueListener thread does all formatting I/O off the request path
+- console: rich handler at the chosen level (WARNING by default, so
+  per-session debug messages cost only a level check)
+- file (optional): JSON lines at DEBUG with the record's extra fields
+  (structured, e.g. owner_id / conversation_id), rotated at 10 MB
+- without setup_logging() (library use) only warnings reach stderr
+
+Usage:
+    setup_logging("INFO", "test_results/moneycare.log")
+    logger = get_logger("api_client")
+    logger.debug("Session initialized", extra={"owner_id": owner_id})
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from pathlib import Path
+from typing import Optional
+
+from rich.logging import RichHandler
+
+
+ROOT_LOGGER = "moneycare"
+
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+# LogRecord attributes that are not user "extra" fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger of a framework module (child of the "moneycare" logger)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, thread, message + extra fields"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: str = "WARNING", log_file: Optional[str] = None) -> logging.Logger:
+    """
+    Route the "moneycare" loggers through a queue to console (level) and file (DEBUG)
+    
+    Calling it again replaces the previous handlers.
+    """
+    global _listener
+    shutdown_logging()
+    
+    console_level = logging.getLevelName(level.upper())
+    console_handler = RichHandler(show_path=False, markup=False)
+    console_handler.setLevel(console_level)
+    handlers = [console_handler]
+    
+    logger_level = console_level
+    if log_file:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8'
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(JsonLineFormatter())
+        handlers.append(file_handler)
+        logger_level = logging.DEBUG
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(logger_level)
+    logger.propagate = False
+    
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return logger
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
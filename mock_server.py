@@ -0,0 +1,473 @@
+"""
+Mock Chatbot Server - Local stand-in for the MoneyCare chatbot API
+
+Implements the endpoints used by MoneyCareAPIClient / AsyncMoneyCareAPIClient:
+    GET  /api/init-session
+    POST /api/ask
+    GET  /api/conversations
+    GET  /api/conversations/{id}/messages
+
+Answers are canned from a test cases file: test cases with an
+Expected_Parsed_Transaction get a {"transactions": [...]} JSON answer (the
+format parse_bot_response() extracts), the others get Expected_Bot_Response
+as plain text. Latency, 5xx error rate and 429 rate are configurable and all
+randomness comes from one seeded generator, so runs are reproducible.
+
+/api/ask streams the answer as Server-Sent Events when the request asks for
+it ("stream": true or Accept: text/event-stream, see
+MoneyCareAPIClient.ask_stream): the latency is spent before the first chunk,
+then the answer is sent in --chunk-chars pieces --chunk-delay-ms apart.
+
+Usage:
+    python mock_server.py -f test_cases_all.json --port 3334
+    python mock_server.py -f test_cases_all.json --latency-ms 800 --jitter-ms 300 \\
+        --latency-dist lognormal --error-rate 0.02 --rate-limit-rate 0.05 --seed 42
+    python mock_server.py -f test_cases_all.json --latency-ms 400 --chunk-chars 12 --chunk-delay-ms 30
+    
+    # Then point the framework at it
+    python run_tests.py -f test_cases_all.json --url http://127.0.0.1:3334 --workers 8
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import codecs
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+
+LATENCY_DISTRIBUTIONS = ["fixed", "uniform", "normal", "lognormal"]
+
+DEFAULT_ANSWER = "Xin lỗi, mình chưa hiểu yêu cầu của bạn. Bạn có thể nói rõ hơn không?"
+
+# Not the real service's port (3333): a forgotten --url never hits the mock
+MOCK_PORT = 3334
+
+
+def _normalize_message(message: str) -> str:
+    """Lookup key for canned answers"""
+    return " ".join((message or "").lower().split())
+
+
+def build_canned_answers(test_cases: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Map User_Message_Input -> answer text the real bot would return
+    
+    - Expected_Parsed_Transaction with a transaction_type: JSON string
+      {"transactions": [...]} (same as the real transaction response)
+    - Otherwise: Expected_Bot_Response as plain text
+    """
+    answers = {}
+    for tc in test_cases:
+        message = tc.get("User_Message_Input")
+        if not message:
+            continue
+        
+        expected_tx = tc.get("Expected_Parsed_Transaction")
+        if isinstance(expected_tx, dict) and expected_tx.get("transaction_type"):
+            transaction = {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, tc.get("Test_Case_ID", message))),
+                "currency": "VND",
+                "transaction_date": datetime.now().strftime("%Y-%m-%d"),
+                "confidence": 0.95,
+                **expected_tx
+            }
+            answer = json.dumps({"transactions": [transaction]}, ensure_ascii=False)
+        else:
+            answer = tc.get("Expected_Bot_Response") or DEFAULT_ANSWER
+        
+        answers[_normalize_message(message)] = answer
+    return answers
+
+
+class MockBehavior:
+    """
+    Latency and failure injection for the mock server
+    
+    - latency_dist: fixed | uniform | normal | lognormal
+      (latency_ms = mean, jitter_ms = spread / standard deviation)
+    - error_rate: fraction of /api/ask calls answered with HTTP 500
+    - rate_limit_rate: fraction of /api/ask calls answered with HTTP 429
+    - chunk_chars / chunk_delay_ms: chunk size and pause of streamed answers
+    """
+    
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        latency_dist: str = "fixed",
+        init_latency_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_seconds: int = 1,
+        chunk_chars: int = 20,
+        chunk_delay_ms: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_dist}")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.latency_dist = latency_dist
+        self.init_latency_ms = init_latency_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.chunk_chars = max(chunk_chars, 1)
+        self.chunk_delay_ms = chunk_delay_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def sample_latency_ms(self) -> float:
+        """Draw one /api/ask latency from the configured distribution"""
+        with self._lock:
+            if self.latency_dist == "uniform":
+                value = self._rng.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)
+            elif self.latency_dist == "normal":
+                value = self._rng.gauss(self.latency_ms, self.jitter_ms)
+            elif self.latency_dist == "lognormal" and self.latency_ms > 0:
+                # Parametrized so that mean = latency_ms and stddev = jitter_ms (long right tail)
+                sigma = math.sqrt(math.log(1 + (self.jitter_ms / self.latency_ms) ** 2))
+                mu = math.log(self.latency_ms) - sigma ** 2 / 2
+                value = self._rng.lognormvariate(mu, sigma)
+            else:
+                value = self.latency_ms
+        return max(value, 0.0)
+    
+    def sample_outcome(self) -> str:
+        """Decide the outcome of one /api/ask call: ok | error | rate_limited"""
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return "rate_limited"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return "ok"
+
+
+class MockChatbotState:
+    """Sessions, conversations and counters shared by all handler threads"""
+    
+    def __init__(self, answers: Dict[str, str], behavior: MockBehavior):
+        self.answers = answers
+        self.behavior = behavior
+        self.lock = threading.Lock()
+        self.guests_by_fingerprint: Dict[str, str] = {}
+        self.conversations: Dict[str, Dict[str, Any]] = {}
+        self.request_counts: Dict[str, int] = {}
+    
+    def count(self, key: str):
+        with self.lock:
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+    
+    def answer_for(self, question: str) -> str:
+        return self.answers.get(_normalize_message(question), DEFAULT_ANSWER)
+
+
+class MockChatbotHandler(BaseHTTPRequestHandler):
+    """HTTP handler - response shapes follow the real chatbot service"""
+    
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real service
+    disable_nagle_algorithm = True  # headers and body are written separately
+    server_version = "MoneyCareMock/1.0"
+    
+    @property
+    def state(self) -> MockChatbotState:
+        return self.server.state
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _cookies(self) -> Dict[str, str]:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return {name: morsel.value for name, morsel in cookie.items()}
+    
+    def _send_json(self, status: int, body: Any, extra_headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _send_event_stream(self, events: List[Dict[str, Any]], delay_ms: float = 0.0):
+        """Send events as Server-Sent Events (chunked, one write per event; stops if the client disconnects)"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i, event in enumerate(events):
+                if i and delay_ms > 0:
+                    time.sleep(delay_ms / 1000)
+                payload = f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(payload):X}\r\n".encode("ascii") + payload + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client cancelled the stream (e.g. early security abort)
+            self.state.count("ask_stream_cancelled")
+            self.close_connection = True
+    
+    def _wants_stream(self, body: Dict[str, Any]) -> bool:
+        return bool(body.get("stream")) or "text/event-stream" in self.headers.get("Accept", "")
+    
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError):
+            return {}
+    
+    def _owner(self) -> Tuple[str, str]:
+        """Resolve (owner_id, owner_type) from cookies / headers"""
+        cookies = self._cookies()
+        if cookies.get("ACCESS_TOKEN"):
+            return f"user_{uuid.uuid5(uuid.NAMESPACE_OID, cookies['ACCESS_TOKEN'])}", "user"
+        owner_id = cookies.get("GUEST_ID") or self.headers.get("X-Owner-Id")
+        if owner_id:
+            return owner_id, "guest"
+        
+        fingerprint = self.headers.get("X-Fingerprint") or uuid.uuid4().hex
+        with self.state.lock:
+            owner_id = self.state.guests_by_fingerprint.setdefault(fingerprint, str(uuid.uuid4()))
+        return owner_id, "guest"
+    
+    def _new_conversation(self, owner_id: str) -> str:
+        conversation_id = str(uuid.uuid4())
+        with self.state.lock:
+            self.state.conversations[conversation_id] = {
+                "id": conversation_id,
+                "ownerId": owner_id,
+                "createdAt": datetime.now().isoformat(),
+                "messages": []
+            }
+        return conversation_id
+    
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        
+        if path == "/api/init-session":
+            self._handle_init_session()
+        elif path == "/api/conversations":
+            self._handle_conversations()
+        elif path.startswith("/api/conversations/") and path.endswith("/messages"):
+            self._handle_messages(path[len("/api/conversations/"):-len("/messages")])
+        else:
+            self._send_json(404, {"error": "Not found"})
+    
+    def do_POST(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        
+        if path == "/api/ask":
+            self._handle_ask()
+        else:
+            self._send_json(404, {"error": "Not found"})
+    
+    def _handle_init_session(self):
+        self.state.count("init-session")
+        if self.state.behavior.init_latency_ms > 0:
+            time.sleep(self.state.behavior.init_latency_ms / 1000)
+        
+        owner_id, owner_type = self._owner()
+        conversation_id = self._new_conversation(owner_id)
+        
+        body = {
+            "ownerId": owner_id,
+            "ownerType": owner_type,
+            "conversationId": conversation_id,
+            "authenticated": owner_type == "user"
+        }
+        headers = {}
+        if owner_type == "guest":
+            headers["Set-Cookie"] = f"GUEST_ID={owner_id}; Path=/; HttpOnly"
+        self._send_json(200, body, headers)
+    
+    def _handle_ask(self):
+        self.state.count("ask")
+        body = self._read_json()
+        question = body.get("question", "")
+        if not question:
+            self._send_json(400, {"error": "question is required"})
+            return
+        
+        behavior = self.state.behavior
+        time.sleep(behavior.sample_latency_ms() / 1000)
+        
+        outcome = behavior.sample_outcome()
+        if outcome == "rate_limited":
+            self.state.count("ask_429")
+            self._send_json(
+                429,
+                {"error": "Message limit exceeded", "retryAfter": behavior.retry_after_seconds},
+                {"Retry-After": str(behavior.retry_after_seconds)}
+            )
+            return
+        if outcome == "error":
+            self.state.count("ask_500")
+            self._send_json(500, {"error": "Internal server error"})
+            return
+        
+        owner_id, _ = self._owner()
+        conversation_id = body.get("conversationId")
+        with self.state.lock:
+            known = conversation_id in self.state.conversations
+        if not known:
+            conversation_id = self._new_conversation(owner_id)
+        
+        answer = self.state.answer_for(question)
+        now = datetime.now().isoformat()
+        with self.state.lock:
+            self.state.conversations[conversation_id]["messages"].extend([
+                {"role": "user", "content": question, "createdAt": now},
+                {"role": "assistant", "content": answer, "createdAt": now}
+            ])
+        
+        if self._wants_stream(body):
+            self.state.count("ask_stream")
+            size = behavior.chunk_chars
+            events = [{"delta": answer[i:i + size]} for i in range(0, len(answer), size)]
+            events.append({"done": True, "success": True, "conversationId": conversation_id})
+            self._send_event_stream(events, behavior.chunk_delay_ms)
+            return
+        
+        self._send_json(200, {"success": True, "answer": answer, "conversationId": conversation_id})
+    
+    def _handle_conversations(self):
+        self.state.count("conversations")
+        owner_id, _ = self._owner()
+        with self.state.lock:
+            conversations = [
+                {"id": c["id"], "createdAt": c["createdAt"], "messageCount": len(c["messages"])}
+                for c in self.state.conversations.values()
+                if c["ownerId"] == owner_id
+            ]
+        self._send_json(200, {"conversations": conversations})
+    
+    def _handle_messages(self, conversation_id: str):
+        self.state.count("messages")
+        with self.state.lock:
+            conversation = self.state.conversations.get(conversation_id)
+            messages = list(conversation["messages"]) if conversation else None
+        if messages is None:
+            self._send_json(404, {"error": "Conversation not found"})
+            return
+        self._send_json(200, {"conversationId": conversation_id, "messages": messages})
+
+
+class MockChatbotServer:
+    """
+    Threaded mock chatbot server
+    
+    Usage:
+        server = MockChatbotServer(test_cases, MockBehavior(latency_ms=500, seed=1), port=0)
+        server.start()                       # background thread
+        config = TestConfig(chatbot_base_url=server.base_url)
+        ...
+        server.stop()
+    """
+    
+    def __init__(
+        self,
+        test_cases: List[Dict[str, Any]],
+        behavior: Optional[MockBehavior] = None,
+        host: str = "127.0.0.1",
+        port: int = MOCK_PORT,
+        verbose: bool = False
+    ):
+        self.state = MockChatbotState(build_canned_answers(test_cases), behavior or MockBehavior())
+        self.httpd = ThreadingHTTPServer((host, port), MockChatbotHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self.httpd.verbose = verbose
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+    
+    def serve_forever(self):
+        self.httpd.serve_forever()
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MoneyCare chatbot mock server (offline benchmarking)")
+    parser.add_argument("--test-file", "-f", default="test_cases_all.json",
+                        help="Test cases JSON used for canned answers")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument(
+        "--port", type=int, default=MOCK_PORT,
+        help=f"Port (default: {MOCK_PORT}; the real service uses 3333)"
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean /api/ask latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Latency spread / standard deviation")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed",
+                        help="Latency distribution")
+    parser.add_argument("--init-latency-ms", type=float, default=0.0, help="/api/init-session latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 answers")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429 answers")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429")
+    parser.add_argument("--chunk-chars", type=int, default=20, help="Characters per streamed answer chunk")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0, help="Pause between streamed answer chunks")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    
+    with open(args.test_file, 'r', encoding='utf-8') as f:
+        test_cases = json.load(f).get("test_cases", [])
+    
+    behavior = MockBehavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        latency_dist=args.latency_dist,
+        init_latency_ms=args.init_latency_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        chunk_chars=args.chunk_chars,
+        chunk_delay_ms=args.chunk_delay_ms,
+        seed=args.seed
+    )
+    server = MockChatbotServer(test_cases, behavior, host=args.host, port=args.port, verbose=args.verbose)
+    
+    print(f"🧪 Mock chatbot server at {server.base_url} ({len(server.state.answers)} canned answers)")
+    print(f"   Latency: {args.latency_dist} {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, "
+          f"errors: {args.error_rate:.1%}, 429: {args.rate_limit_rate:.1%}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping mock server...")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 Data models for test framework
 """
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, FrozenSet, Tuple
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -49,6 +49,8 @@ class TestCase:
     target_class_principles: List[str] = field(default_factory=list)
     priority: str = "Medium"
     severity_if_failed: Optional[str] = None
+    # Normalized expected side, built once (see test_case_index.get_compiled)
+    compiled: Optional["CompiledTestCase"] = field(default=None, repr=False, compare=False)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TestCase":
@@ -68,6 +70,33 @@ class TestCase:
         )
 
 
+@dataclass(frozen=True)
+class ExpectedField:
+    """One scored field of an expected parsed transaction, normalized once"""
+    name: str
+    value: Any                  # As written in the test case (used in notes)
+    weight: float
+    tier: str                   # "critical" / "important" / "minor"
+    text: str                   # NFC + lowercase str(value) (uppercase for currency, stripped for category_name)
+    tokens: FrozenSet[str]      # Whitespace tokens of text
+    number: float               # float(value), NaN if not numeric
+    integer: Optional[int]      # int(value), None if not an integer
+
+
+@dataclass(frozen=True)
+class CompiledTestCase:
+    """Immutable, precomputed view of a TestCase for the evaluator hot path"""
+    test_case_id: str
+    mentions_delete: bool                      # "xóa" in the message (LLM08 check)
+    mentions_other_user: bool                  # "user có id" in the message (LLM08 check)
+    owasp_risks: Tuple[str, ...]               # Checks that apply
+    class_principles: Tuple[str, ...]
+    has_expected_transaction: bool
+    expected_keys: Tuple[str, ...]
+    expects_critical_field: bool               # Any critical field in the expected transaction
+    expected_fields: Tuple[ExpectedField, ...]  # Scored fields, in test case order
+
+
 @dataclass
 class ParsedTransaction:
     """Parsed transaction from bot response"""
@@ -135,9 +164,17 @@ class TestRunResult:
     
     # Metrics
     measured_latency_ms: int = 0
+    # Requests sent for this answer (> 1 when the API client retried)
+    attempts: int = 1
     measured_cost_vnd: float = 0.0
-    token_usage: Optional[Dict[str, int]] = None
+    token_usage: Optional[Dict[str, Any]] = None  # prompt/completion/total tokens + source
     accuracy_score_percent: float = 0.0
+    # TF-IDF similarity to Expected_Bot_Response (plain-text cases only, not used for pass/fail)
+    response_similarity_percent: Optional[float] = None
+    # Latency breakdown (ms): connect, ttfb, transfer, decode, init_session, ask, evaluate
+    phase_timings_ms: Optional[Dict[str, float]] = None
+    # --repeat N: runs, verdicts, distinct responses, latency min/median/p95/stddev
+    repeat_stats: Optional[Dict[str, Any]] = None
     
     # Observations
     security_observation: SecurityObservation = SecurityObservation.OK
@@ -175,13 +212,72 @@ class TestRunResult:
             "Measured_Cost_VND": round(self.measured_cost_vnd, 2),
             "Token_Usage": json.dumps(self.token_usage) if self.token_usage else "",
             "Accuracy_Score_percent": round(self.accuracy_score_percent, 2),
+            "Response_Similarity_percent": round(self.response_similarity_percent, 2)
+            if self.response_similarity_percent is not None else "",
             "Security_Observation": self.security_observation.value,
             "Stability_Observation": self.stability_observation.value,
             "Notes": self.notes,
             "CLASS_Principles_Check": json.dumps(self.class_principles_check) if self.class_principles_check else "",
-            "OWASP_Check": json.dumps(self.owasp_check) if self.owasp_check else ""
+            "OWASP_Check": json.dumps(self.owasp_check) if self.owasp_check else "",
+            "Phase_Timings_ms": json.dumps(
+                {phase: round(ms, 2) for phase, ms in self.phase_timings_ms.items()}
+            ) if self.phase_timings_ms else "",
+            "Repeat_Stats": json.dumps(self.repeat_stats) if self.repeat_stats else "",
+            "Attempts": self.attempts
         }
     
+    @staticmethod
+    def _load_json_field(value: Any) -> Any:
+        """Decode a field stored as JSON string by to_dict() ("" means None)"""
+        if isinstance(value, str):
+            if not value:
+                return None
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return None
+        return value
+    
+    @staticmethod
+    def _load_optional_float(value: Any) -> Optional[float]:
+        """Numeric field stored as "" when missing (None)"""
+        if value is None or value == "":
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestRunResult":
+        """Rebuild a result from its to_dict() form (as stored in results files)"""
+        return cls(
+            test_run_id=data.get("Test_Run_ID", ""),
+            test_case_id=data.get("Test_Case_ID", ""),
+            date=data.get("Date", ""),
+            tester=data.get("Tester", "LLM_Test_Agent"),
+            environment=data.get("Environment", ""),
+            llm_model=data.get("LLM_Model", ""),
+            actual_bot_response=data.get("Actual_Bot_Response", ""),
+            actual_parsed_transaction=cls._load_json_field(data.get("Actual_Parsed_Transaction")),
+            pass_fail=PassFailStatus(data.get("Pass_Fail", PassFailStatus.SKIP.value)),
+            issues_found=data.get("Issues_Found") in ("Yes", True),
+            issue_ids=data.get("Issue_IDs", ""),
+            measured_latency_ms=data.get("Measured_Latency_ms", 0),
+            attempts=int(data.get("Attempts") or 1),
+            measured_cost_vnd=data.get("Measured_Cost_VND", 0.0),
+            token_usage=cls._load_json_field(data.get("Token_Usage")),
+            accuracy_score_percent=data.get("Accuracy_Score_percent", 0.0),
+            response_similarity_percent=cls._load_optional_float(data.get("Response_Similarity_percent")),
+            security_observation=SecurityObservation(data.get("Security_Observation", "OK")),
+            stability_observation=StabilityObservation(data.get("Stability_Observation", "OK")),
+            notes=data.get("Notes", ""),
+            class_principles_check=cls._load_json_field(data.get("CLASS_Principles_Check")),
+            owasp_check=cls._load_json_field(data.get("OWASP_Check")),
+            phase_timings_ms=cls._load_json_field(data.get("Phase_Timings_ms")),
+            repeat_stats=cls._load_json_field(data.get("Repeat_Stats"))
+        )
+    
     def to_log_json(self) -> Dict[str, Any]:
         """Full JSON for logging"""
         result = self.to_dict()
@@ -204,10 +300,14 @@ class TestSummary:
     avg_latency_ms: float = 0.0
     total_cost_vnd: float = 0.0
     avg_accuracy: float = 0.0
+    avg_similarity: float = 0.0  # Plain-text cases with a Response_Similarity_percent
     
     security_issues: int = 0
     stability_issues: int = 0
     
+    # Per-phase latency: {"ttfb": {"avg": ms, "p95": ms}, ...}
+    phase_timings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     
@@ -228,7 +328,72 @@ class TestSummary:
             "Avg_Latency_ms": round(self.avg_latency_ms, 2),
             "Total_Cost_VND": round(self.total_cost_vnd, 2),
             "Avg_Accuracy_Percent": round(self.avg_accuracy, 2),
+            "Avg_Response_Similarity_Percent": round(self.avg_similarity, 2),
             "Security_Issues": self.security_issues,
             "Stability_Issues": self.stability_issues,
-            "Duration_Seconds": (self.end_time - self.start_time).total_seconds() if self.start_time and self.end_time else 0
+            "Duration_Seconds": (self.end_time - self.start_time).total_seconds() if self.start_time and self.end_time else 0,
+            **self._phase_timings_dict()
+        }
+    
+    def _phase_timings_dict(self) -> Dict[str, float]:
+        """Flatten phase timings into Avg_<Phase>_ms / P95_<Phase>_ms columns"""
+        columns = {}
+        for phase, stats in self.phase_timings.items():
+            name = phase.title()
+            columns[f"Avg_{name}_ms"] = round(stats["avg"], 2)
+            columns[f"P95_{name}_ms"] = round(stats["p95"], 2)
+        return columns
+
+
+@dataclass
+class WorkloadLevelResult:
+    """Measured result of one concurrent-users level in a load test"""
+    level_name: str
+    concurrent_users: int
+    total_requests: int = 0
+    successful: int = 0
+    failed: int = 0
+    rate_limited: int = 0  # HTTP 429 responses (counted in failed)
+    duration_seconds: float = 0.0
+    
+    throughput_rps: float = 0.0  # Successful requests per second
+    avg_latency_ms: float = 0.0
+    p50_latency_ms: float = 0.0
+    p95_latency_ms: float = 0.0
+    p99_latency_ms: float = 0.0
+    avg_cost_vnd: float = 0.0
+    
+    # Level-specific targets from workload_thresholds.json (workload_levels)
+    expected_throughput_rps: Optional[float] = None
+    max_latency_ms: Optional[float] = None
+    
+    def success_rate(self) -> float:
+        if self.total_requests == 0:
+            return 0.0
+        return (self.successful / self.total_requests) * 100
+    
+    def error_rate(self) -> float:
+        if self.total_requests == 0:
+            return 0.0
+        return (self.failed / self.total_requests) * 100
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "Workload_Level": self.level_name,
+            "Concurrent_Users": self.concurrent_users,
+            "Total_Requests": self.total_requests,
+            "Successful": self.successful,
+            "Failed": self.failed,
+            "Rate_Limited": self.rate_limited,
+            "Duration_Seconds": round(self.duration_seconds, 3),
+            "Success_Rate_Percent": round(self.success_rate(), 2),
+            "Error_Rate_Percent": round(self.error_rate(), 2),
+            "Throughput_rps": round(self.throughput_rps, 2),
+            "Avg_Latency_ms": round(self.avg_latency_ms, 2),
+            "P50_Latency_ms": round(self.p50_latency_ms, 2),
+            "P95_Latency_ms": round(self.p95_latency_ms, 2),
+            "P99_Latency_ms": round(self.p99_latency_ms, 2),
+            "Avg_Cost_VND": round(self.avg_cost_vnd, 2),
+            "Expected_Throughput_rps": self.expected_throughput_rps,
+            "Max_Latency_ms": self.max_latency_ms
         }
@@ -0,0 +1,101 @@
+"""
+Phase Timing - Per-phase latency breakdown for chatbot requests
+
+HTTP phases of one request (time.perf_counter, milliseconds):
+- connect:  TCP (+TLS) connection setup, 0 when a keep-alive connection is reused
+- ttfb:     request sent -> response headers received (server think time)
+- transfer: response body download
+- decode:   JSON decode of the body
+
+Streamed answers (MoneyCareAPIClient.ask_stream) add:
+- ttft:          request sent -> first answer chunk (time to first token)
+- max_chunk_gap: longest pause between two answer chunks
+
+Retried requests add:
+- retries: failed attempts and backoff before the last attempt (included
+  in the request's latency)
+
+Test phases added by the runner:
+- init_session: GET /api/init-session latency (done by the session pool
+  off the critical path when pooling is enabled)
+- ask:          total POST /api/ask latency (= Measured_Latency_ms)
+- evaluate:     TestEvaluator.evaluate()
+
+Connect time is not exposed by requests, so TimedHTTPAdapter swaps in
+urllib3 connection classes that time connect() and report it per thread.
+"""
+import threading
+import time
+from typing import Dict, List
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+HTTP_PHASES = ["connect", "ttfb", "transfer", "decode"]
+STREAM_PHASES = ["ttft", "max_chunk_gap"]
+PHASES = HTTP_PHASES + STREAM_PHASES + ["retries", "init_session", "ask", "evaluate"]
+
+_timing = threading.local()
+
+
+def reset_connect_timing():
+    """Start timing a new request on the current thread"""
+    _timing.connect_ms = 0.0
+
+
+def last_connect_ms() -> float:
+    """Connect time of the current thread's last request (0 if the connection was reused)"""
+    return getattr(_timing, "connect_ms", 0.0)
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _timing.connect_ms = last_connect_ms() + (time.perf_counter() - start) * 1000
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _timing.connect_ms = last_connect_ms() + (time.perf_counter() - start) * 1000
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """requests adapter whose connections record their connect() time"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+
+def aggregate_phase_timings(timings: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """
+    Average and p95 per phase over many results
+    
+    Returns: {"connect": {"avg": ..., "p95": ...}, ...} for phases present in timings
+    """
+    aggregated = {}
+    for phase in PHASES:
+        values = sorted(t[phase] for t in timings if t and phase in t)
+        if not values:
+            continue
+        aggregated[phase] = {
+            "avg": sum(values) / len(values),
+            "p95": values[min(int(len(values) * 0.95), len(values) - 1)]
+        }
+    return aggregated
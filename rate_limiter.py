@@ -0,0 +1,96 @@
+"""
+Client-side rate limiting and retry backoff for the chatbot API
+
+- TokenBucket: request rate limiter shared by all workers of a run. A 429
+  from the server pauses the whole bucket, so every worker backs off
+  together instead of each one hammering the service.
+- backoff_delay(): jittered exponential backoff that honours Retry-After.
+
+Usage:
+    limiter = TokenBucket(rate_per_second=10, capacity=5)
+    client = MoneyCareAPIClient(config, identity, rate_limiter=limiter)
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+# Status codes worth retrying (rate limit / temporarily unavailable)
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# Status codes at which the server did not process the request: the only
+# ones a non-idempotent request (POST /api/ask) is resent for
+RESEND_STATUS_CODES = {429, 503}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    
+    - rate_per_second <= 0 disables rate limiting (pause() still applies)
+    - capacity: max burst of requests sent without waiting
+    """
+    
+    def __init__(self, rate_per_second: float = 0.0, capacity: int = 5):
+        self.rate = rate_per_second
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self.rate <= 0:
+                        return
+                    # Refill
+                    self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                    self._last_refill = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. after a 429)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    retry_after: Optional[float] = None
+) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1 = first retry)
+    
+    Retry-After from the server wins (plus a little jitter so workers do not
+    retry in lockstep); otherwise "full jitter" exponential backoff.
+    """
+    if retry_after is not None:
+        return min(retry_after + random.uniform(0, base_delay), max_delay)
+    return random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
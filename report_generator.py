@@ -1,6 +1,11 @@
 """
 Report Generator - Generates comprehensive test reports
 Following LLM_Test_Design_Framework_Template.xlsx format
+
+The workbook is written in openpyxl write-only mode: every row is streamed
+to its sheet as it is produced, so memory stays flat as the number of
+results grows, and cells reference a few shared named styles instead of
+each carrying its own Border / Fill.
 """
 import json
 import os
@@ -10,11 +15,42 @@ from pathlib import Path
 
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Font, Fill, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Fill, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 
 from config import TestConfig, OWASP_RISKS, CLASS_PRINCIPLES
-from models import TestRunResult, TestSummary, PassFailStatus
+from models import TestRunResult, TestSummary, PassFailStatus, WorkloadLevelResult
+
+
+# Named styles (registered once per workbook, referenced by every cell)
+HEADER_STYLE = "Report_Header"
+CELL_STYLE = "Report_Cell"
+PASS_STYLE = "Report_Pass"
+FAIL_STYLE = "Report_Fail"
+PARTIAL_STYLE = "Report_Partial"
+DIMENSION_STYLE = "Report_Dimension"
+
+PASS_FAIL_STYLES = {
+    PassFailStatus.PASS: PASS_STYLE,
+    PassFailStatus.FAIL: FAIL_STYLE,
+    PassFailStatus.PARTIAL: PARTIAL_STYLE
+}
+
+# Metrics sheet Status column
+METRIC_STATUS_STYLES = {"OK": PASS_STYLE, "Warning": PARTIAL_STYLE, "Critical": FAIL_STYLE}
+
+# Longest text Excel accepts in one cell
+MAX_CELL_CHARS = 32767
+
+# Result columns the report (and calculate_summary) reads; enough to load from a Parquet results file
+REPORT_COLUMNS = [
+    "Test_Case_ID", "Actual_Bot_Response", "Pass_Fail", "Measured_Latency_ms", "Measured_Cost_VND",
+    "Accuracy_Score_percent", "Response_Similarity_percent", "Security_Observation",
+    "Stability_Observation", "Notes", "CLASS_Principles_Check", "OWASP_Check", "Phase_Timings_ms",
+    "Repeat_Stats"
+]
 
 
 class ReportGenerator:
@@ -36,6 +72,21 @@ class ReportGenerator:
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
+        # Styled cells of the workbook being written: (sheet, column, style) -> cell
+        self._cells: Dict[Tuple[str, int, str], WriteOnlyCell] = {}
+    
+    def _add_named_styles(self, wb: Workbook):
+        """Register the report's named styles (new objects per workbook: openpyxl binds them)"""
+        styles = [
+            (HEADER_STYLE, dict(font=self.header_font, fill=self.header_fill, alignment=Alignment(wrap_text=True))),
+            (CELL_STYLE, {}),
+            (PASS_STYLE, dict(fill=self.pass_fill)),
+            (FAIL_STYLE, dict(fill=self.fail_fill)),
+            (PARTIAL_STYLE, dict(fill=self.partial_fill)),
+            (DIMENSION_STYLE, dict(font=Font(bold=True)))
+        ]
+        for name, attributes in styles:
+            wb.add_named_style(NamedStyle(name=name, border=self.thin_border, **attributes))
     
     def _calc_security_pass_rate(self, results: List[TestRunResult]) -> float:
         """Calculate security test pass rate"""
@@ -50,18 +101,25 @@ class ReportGenerator:
         results: List[TestRunResult],
         summary: TestSummary,
         test_cases: List[Dict] = None,
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        workload_results: Optional[List[WorkloadLevelResult]] = None
     ) -> str:
-        """Generate comprehensive Excel report following template format"""
+        """
+        Generate comprehensive Excel report following template format
+        
+        workload_results: measured load test levels (LoadTester); when given,
+        the workload sheet shows one row per concurrent-users level.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         if not output_path:
             output_path = Path(self.config.results_dir) / f"test_report_{timestamp}.xlsx"
         
-        wb = Workbook()
+        wb = Workbook(write_only=True)
+        self._add_named_styles(wb)
+        self._cells.clear()
         
         # Sheet 1: 00_Summary
-        ws_overview = wb.active
-        ws_overview.title = "00_Summary"
+        ws_overview = wb.create_sheet("00_Summary")
         self._create_framework_overview(ws_overview, summary)
         
         # Group results by category
@@ -105,7 +163,7 @@ class ReportGenerator:
         
         # Sheet 10: 09_Workload_Analysis
         ws_workload = wb.create_sheet("09_Workload_Analysis")
-        self._create_workload_analysis(ws_workload, results, summary)
+        self._create_workload_analysis(ws_workload, results, summary, workload_results)
         
         wb.save(output_path)
         return str(output_path)
@@ -171,12 +229,19 @@ class ReportGenerator:
         
         headers.append("Notes")
         
-        self._apply_header_style(ws, 1, headers)
+        # Column widths based on number of columns
+        widths = [15, 15, 40, 10, 40, 35, 40, 10, 10, 12, 12, 15, 15]  # Base columns
+        if category == "Security":
+            widths.extend([20, 30])  # OWASP columns
+        elif category == "C-L-A-S-S":
+            widths.append(20)  # CLASS Dimensions
+        elif category == "CLASS_Design":
+            widths.extend([20, 25])  # CLASS Dimensions + Principles
+        widths.append(50)  # Notes
+        
+        self._write_header(ws, headers, widths[:len(headers)])
         
-        row_idx = 2
         for result in results:
-            col = 1
-            
             # Get test case info
             tc_info = tc_map.get(result.test_case_id, {})
             tc = tc_info.get("test_case", {})
@@ -195,146 +260,114 @@ class ReportGenerator:
                 user_msg = getattr(tc, 'user_message_input', '')
                 expected_resp = getattr(tc, 'expected_bot_response', '')
             
-            # Basic info
-            ws.cell(row=row_idx, column=col, value=result.test_case_id).border = self.thin_border
-            col += 1
-            ws.cell(row=row_idx, column=col, value=feature).border = self.thin_border
-            col += 1
-            ws.cell(row=row_idx, column=col, value=desc).border = self.thin_border
-            col += 1
-            ws.cell(row=row_idx, column=col, value=priority).border = self.thin_border
-            col += 1
-            ws.cell(row=row_idx, column=col, value=user_msg).border = self.thin_border
-            col += 1
-            ws.cell(row=row_idx, column=col, value=expected_resp).border = self.thin_border
-            col += 1
-            
             # Actual response
             actual_resp = result.actual_bot_response or ""
             if len(actual_resp) > 150:
                 actual_resp = actual_resp[:150] + "..."
-            ws.cell(row=row_idx, column=col, value=actual_resp).border = self.thin_border
-            col += 1
-            
-            # Pass/Fail with color
-            status_cell = ws.cell(row=row_idx, column=col, value=result.pass_fail.value)
-            status_cell.border = self.thin_border
-            if result.pass_fail == PassFailStatus.PASS:
-                status_cell.fill = self.pass_fill
-            elif result.pass_fail == PassFailStatus.FAIL:
-                status_cell.fill = self.fail_fill
-            elif result.pass_fail == PassFailStatus.PARTIAL:
-                status_cell.fill = self.partial_fill
-            col += 1
             
-            ws.cell(row=row_idx, column=col, value=f"{result.accuracy_score_percent:.1f}").border = self.thin_border
-            col += 1
-            ws.cell(row=row_idx, column=col, value=result.measured_latency_ms).border = self.thin_border
-            col += 1
-            ws.cell(row=row_idx, column=col, value=f"{result.measured_cost_vnd:.0f}").border = self.thin_border
-            col += 1
-            
-            # Security status
-            sec_cell = ws.cell(row=row_idx, column=col, value=result.security_observation.value)
-            sec_cell.border = self.thin_border
-            if result.security_observation.value != "OK":
-                sec_cell.fill = self.fail_fill
-            col += 1
-            
-            # Stability status
-            stab_cell = ws.cell(row=row_idx, column=col, value=result.stability_observation.value)
-            stab_cell.border = self.thin_border
-            if result.stability_observation.value not in ["OK", "High_latency"]:
-                stab_cell.fill = self.fail_fill
-            elif result.stability_observation.value == "High_latency":
-                stab_cell.fill = self.partial_fill
-            col += 1
+            row = [
+                result.test_case_id, feature, desc, priority, user_msg, expected_resp, actual_resp,
+                result.pass_fail.value, f"{result.accuracy_score_percent:.1f}",
+                result.measured_latency_ms, f"{result.measured_cost_vnd:.0f}",
+                result.security_observation.value, result.stability_observation.value
+            ]
+            # Pass/Fail, security and stability status with color
+            sec_style, stab_style = self._observation_styles(result)
+            styles = {8: PASS_FAIL_STYLES.get(result.pass_fail, CELL_STYLE), 12: sec_style, 13: stab_style}
             
             # Category-specific columns
             if category == "Security":
                 # OWASP Risks
-                owasp_risks = ""
                 if isinstance(tc, dict):
                     risks = tc.get("Target_OWASP_Risks", [])
                 else:
                     risks = getattr(tc, 'target_owasp_risks', [])
-                owasp_risks = ",".join(risks) if isinstance(risks, list) else str(risks or "")
-                ws.cell(row=row_idx, column=col, value=owasp_risks).border = self.thin_border
-                col += 1
+                row.append(",".join(risks) if isinstance(risks, list) else str(risks or ""))
                 
                 # OWASP Result
-                owasp_result = ""
-                if result.owasp_check:
-                    parts = []
-                    for risk_id, status in result.owasp_check.items():
-                        if status == "OK":
-                            parts.append(f"{risk_id}:✓")
-                        else:
-                            parts.append(f"{risk_id}:✗ {status}")
-                    owasp_result = "; ".join(parts)
-                
-                owasp_cell = ws.cell(row=row_idx, column=col, value=owasp_result)
-                owasp_cell.border = self.thin_border
-                if "✗" in owasp_result:
-                    owasp_cell.fill = self.fail_fill
-                elif owasp_result:
-                    owasp_cell.fill = self.pass_fill
-                col += 1
+                owasp_result, owasp_style = self._owasp_result(result.owasp_check)
+                row.append(owasp_result)
+                styles[len(row)] = owasp_style
             
             elif category in ["C-L-A-S-S", "CLASS_Design"]:
                 # CLASS Dimensions
-                class_dims = ""
                 if isinstance(tc, dict):
                     dims = tc.get("Target_Dimensions_CLASSS", [])
                 else:
                     dims = getattr(tc, 'target_dimensions_classs', [])
-                class_dims = ",".join(dims) if isinstance(dims, list) else str(dims or "")
-                ws.cell(row=row_idx, column=col, value=class_dims).border = self.thin_border
-                col += 1
+                row.append(",".join(dims) if isinstance(dims, list) else str(dims or ""))
                 
                 if category == "CLASS_Design":
                     # CLASS Principles
-                    class_principles = ""
                     if isinstance(tc, dict):
                         principles = tc.get("Target_CLASS_Principles", [])
                     else:
                         principles = getattr(tc, 'target_class_principles', [])
-                    class_principles = ",".join(principles) if isinstance(principles, list) else str(principles or "")
-                    ws.cell(row=row_idx, column=col, value=class_principles).border = self.thin_border
-                    col += 1
+                    row.append(",".join(principles) if isinstance(principles, list) else str(principles or ""))
             
             # Notes
-            ws.cell(row=row_idx, column=col, value=result.notes or "").border = self.thin_border
+            row.append(result.notes or "")
             
-            row_idx += 1
-        
-        # Set column widths dynamically based on number of columns
-        num_cols = len(headers)
-        base_widths = [15, 15, 40, 10, 40, 35, 40, 10, 10, 12, 12, 15, 15]  # Base columns
-        if category == "Security":
-            base_widths.extend([20, 30])  # OWASP columns
-        elif category == "C-L-A-S-S":
-            base_widths.append(20)  # CLASS Dimensions
-        elif category == "CLASS_Design":
-            base_widths.extend([20, 25])  # CLASS Dimensions + Principles
-        base_widths.append(50)  # Notes
-        
-        for i, w in enumerate(base_widths[:num_cols]):
-            ws.column_dimensions[chr(65 + i)].width = w
+            self._append_row(ws, row, styles)
+    
+    def _write_header(self, ws, headers: List[str], widths: List[int]):
+        """Set column widths and write the header row (write-only sheets need widths first)"""
+        for col, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        self._append_row(ws, headers, style=HEADER_STYLE)
     
-    def _apply_header_style(self, ws, row, headers):
-        """Apply header style to a row"""
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.border = self.thin_border
-            cell.alignment = Alignment(wrap_text=True)
+    def _append_row(self, ws, values: List[Any], styles: Optional[Dict[int, str]] = None, style: str = CELL_STYLE):
+        """
+        Append one row of cells in a named style
+        
+        styles: column (1-based) -> named style of that cell instead of style.
+        """
+        row = []
+        for col, value in enumerate(values, start=1):
+            cell_style = styles.get(col, style) if styles else style
+            # append() writes the row out, so the styled cell of a column is reused by the next row
+            key = (ws.title, col, cell_style)
+            cell = self._cells.get(key)
+            if cell is None:
+                cell = self._cells[key] = WriteOnlyCell(ws)
+                cell.style = cell_style
+            if isinstance(value, str) and len(value) > MAX_CELL_CHARS:
+                value = value[:MAX_CELL_CHARS - 3] + "..."
+            cell.value = value
+            row.append(cell)
+        ws.append(row)
     
+    @staticmethod
+    def _observation_styles(result: TestRunResult) -> Tuple[str, str]:
+        """Styles of the Security_Status and Stability_Status cells"""
+        sec_style = FAIL_STYLE if result.security_observation.value != "OK" else CELL_STYLE
+        stability = result.stability_observation.value
+        if stability not in ["OK", "High_latency"]:
+            stab_style = FAIL_STYLE
+        elif stability == "High_latency":
+            stab_style = PARTIAL_STYLE
+        else:
+            stab_style = CELL_STYLE
+        return sec_style, stab_style
+    
+    @staticmethod
+    def _owasp_result(owasp_check: Optional[Dict[str, str]]) -> Tuple[str, str]:
+        """OWASP check results ("LLM01:✓; LLM02:✗ Leak") and the style of its cell"""
+        if not owasp_check:
+            return "", CELL_STYLE
+        parts = []
+        for risk_id, status in owasp_check.items():
+            if status == "OK":
+                parts.append(f"{risk_id}:✓")
+            else:
+                parts.append(f"{risk_id}:✗ {status}")
+        owasp_result = "; ".join(parts)
+        return owasp_result, FAIL_STYLE if "✗" in owasp_result else PASS_STYLE
+
     def _create_framework_overview(self, ws, summary: TestSummary):
         """Create 00_Framework_Overview sheet"""
         headers = ["Section", "Item", "Value_Example", "Notes"]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [20, 25, 40, 50])
         
         # Metadata section
         data = [
@@ -360,20 +393,13 @@ class ReportGenerator:
             ("Test_Summary", "Pass_Rate_%", f"{summary.pass_rate():.1f}", ""),
             ("Test_Summary", "Avg_Latency_ms", f"{summary.avg_latency_ms:.0f}", ""),
             ("Test_Summary", "Avg_Accuracy_%", f"{summary.avg_accuracy:.1f}", ""),
+            ("Test_Summary", "Avg_Response_Similarity_%", f"{summary.avg_similarity:.1f}", "TF-IDF vs Expected_Bot_Response (plain-text cases)"),
             ("Test_Summary", "Security_Issues", str(summary.security_issues), ""),
             ("Test_Summary", "Stability_Issues", str(summary.stability_issues), ""),
         ]
         
-        for row_idx, row_data in enumerate(data, start=2):
-            for col, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col, value=value)
-                cell.border = self.thin_border
-        
-        # Set column widths
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['C'].width = 40
-        ws.column_dimensions['D'].width = 50
+        for row_data in data:
+            self._append_row(ws, row_data)
 
     def _create_merged_test_results(self, ws, test_cases: List, results: List[TestRunResult]):
         """Create 01_Test_Results sheet - merged Test_Cases + Test_Run_Log + OWASP"""
@@ -393,7 +419,7 @@ class ReportGenerator:
             # Notes
             "Notes"
         ]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [12, 12, 35, 8, 45, 35, 45, 8, 10, 10, 15, 12, 15, 35, 35])
         
         # Create test case lookup
         tc_map = {}
@@ -403,7 +429,7 @@ class ReportGenerator:
             else:
                 tc_map[tc.get("Test_Case_ID", "")] = tc
         
-        for row_idx, result in enumerate(results, start=2):
+        for result in results:
             tc = tc_map.get(result.test_case_id, {})
             
             # Extract test case info
@@ -429,72 +455,21 @@ class ReportGenerator:
             
             # Format OWASP check results
             owasp_risks_str = ",".join(risks) if isinstance(risks, list) else str(risks or "")
-            owasp_result_str = ""
-            if result.owasp_check:
-                owasp_parts = []
-                for risk_id, status in result.owasp_check.items():
-                    if status == "OK":
-                        owasp_parts.append(f"{risk_id}:✓")
-                    else:
-                        owasp_parts.append(f"{risk_id}:✗ {status}")
-                owasp_result_str = "; ".join(owasp_parts)
-            
-            # Write row
-            ws.cell(row=row_idx, column=1, value=result.test_case_id).border = self.thin_border
-            ws.cell(row=row_idx, column=2, value=feature).border = self.thin_border
-            ws.cell(row=row_idx, column=3, value=desc).border = self.thin_border
-            ws.cell(row=row_idx, column=4, value=priority).border = self.thin_border
-            ws.cell(row=row_idx, column=5, value=user_msg).border = self.thin_border
-            ws.cell(row=row_idx, column=6, value=expected_resp).border = self.thin_border
-            ws.cell(row=row_idx, column=7, value=actual_resp).border = self.thin_border
-            
-            # Pass/Fail with color
-            status_cell = ws.cell(row=row_idx, column=8, value=result.pass_fail.value)
-            status_cell.border = self.thin_border
-            if result.pass_fail == PassFailStatus.PASS:
-                status_cell.fill = self.pass_fill
-            elif result.pass_fail == PassFailStatus.FAIL:
-                status_cell.fill = self.fail_fill
-            elif result.pass_fail == PassFailStatus.PARTIAL:
-                status_cell.fill = self.partial_fill
-            
-            ws.cell(row=row_idx, column=9, value=f"{result.accuracy_score_percent:.1f}").border = self.thin_border
-            ws.cell(row=row_idx, column=10, value=result.measured_latency_ms).border = self.thin_border
-            
-            # Security status with color
-            sec_cell = ws.cell(row=row_idx, column=11, value=result.security_observation.value)
-            sec_cell.border = self.thin_border
-            if result.security_observation.value != "OK":
-                sec_cell.fill = self.fail_fill
-            
-            # Stability status with color
-            stab_cell = ws.cell(row=row_idx, column=12, value=result.stability_observation.value)
-            stab_cell.border = self.thin_border
-            if result.stability_observation.value not in ["OK", "High_latency"]:
-                stab_cell.fill = self.fail_fill
-            elif result.stability_observation.value == "High_latency":
-                stab_cell.fill = self.partial_fill
-            
-            # OWASP Check (target risks)
-            ws.cell(row=row_idx, column=13, value=owasp_risks_str).border = self.thin_border
-            
-            # OWASP Result with color
-            owasp_cell = ws.cell(row=row_idx, column=14, value=owasp_result_str)
-            owasp_cell.border = self.thin_border
-            if owasp_result_str:
-                if "✗" in owasp_result_str:
-                    owasp_cell.fill = self.fail_fill
-                else:
-                    owasp_cell.fill = self.pass_fill
-            
-            ws.cell(row=row_idx, column=15, value=result.notes or "").border = self.thin_border
-        
-        # Set column widths
-        widths = [12, 12, 35, 8, 45, 35, 45, 8, 10, 10, 15, 12, 15, 35, 35]
-        for i, w in enumerate(widths):
-            if i < 15:
-                ws.column_dimensions[chr(65 + i)].width = w
-    
+            owasp_result_str, owasp_style = self._owasp_result(result.owasp_check)
+            
+            # Pass/Fail, security, stability and OWASP result with color
+            sec_style, stab_style = self._observation_styles(result)
+            self._append_row(
+                ws,
+                [
+                    result.test_case_id, feature, desc, priority, user_msg, expected_resp, actual_resp,
+                    result.pass_fail.value, f"{result.accuracy_score_percent:.1f}", result.measured_latency_ms,
+                    result.security_observation.value, result.stability_observation.value,
+                    owasp_risks_str, owasp_result_str, result.notes or ""
+                ],
+                {8: PASS_FAIL_STYLES.get(result.pass_fail, CELL_STYLE), 11: sec_style, 12: stab_style, 14: owasp_style}
+            )
+
     def _create_metrics_classs(self, ws, results: List[TestRunResult], summary: TestSummary):
         """Create 03_Metrics_C_L_A_S_S sheet"""
         headers = [
@@ -502,7 +477,7 @@ class ReportGenerator:
             "Data_Source", "Acceptable_Threshold", "Alert_Threshold",
             "Actual_Value", "Status", "Related_OWASP_Risks", "Related_CLASS_Principles"
         ]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [12, 10, 25, 55, 18, 20, 18, 15, 15, 10, 20, 25])
         
         # Calculate metrics
         latencies = [r.measured_latency_ms for r in results if r.measured_latency_ms > 0]
@@ -514,12 +489,22 @@ class ReportGenerator:
         accuracies = [r.accuracy_score_percent for r in results if r.accuracy_score_percent > 0]
         avg_accuracy = sum(accuracies) / len(accuracies) if accuracies else 0
         
+        similarities = [r.response_similarity_percent for r in results if r.response_similarity_percent is not None]
+        avg_similarity = sum(similarities) / len(similarities) if similarities else 0
+        
         error_count = len([r for r in results if r.pass_fail == PassFailStatus.ERROR])
         error_rate = (error_count / len(results) * 100) if results else 0
         
         timeout_count = len([r for r in results if r.stability_observation.value == "Timeout"])
         timeout_rate = (timeout_count / len(results) * 100) if results else 0
         
+        # Time to first token / chunk gaps (streamed runs only)
+        ttfts = sorted(r.phase_timings_ms["ttft"] for r in results if r.phase_timings_ms and "ttft" in r.phase_timings_ms)
+        chunk_gaps = sorted(
+            r.phase_timings_ms["max_chunk_gap"] for r in results
+            if r.phase_timings_ms and "max_chunk_gap" in r.phase_timings_ms
+        )
+        
         # Cost estimation for GPT-4o-mini
         # Pricing: Input $0.15/1M tokens, Output $0.60/1M tokens
         # Estimate: ~500 input tokens + ~200 output tokens per request
@@ -550,9 +535,11 @@ class ReportGenerator:
             ("L", "L3", "Min_Latency", "Latency thấp nhất", "ms", "Test results", "", "", f"{min_latency:,.0f}", "Info", "", ""),
             ("L", "L4", "Max_Latency", "Latency cao nhất", "ms", "Test results", "< 15,000", "> 20,000", f"{max_latency:,.0f}", "OK" if max_latency < 15000 else "Warning", "", ""),
             ("L", "L5", "High_Latency_Rate", f"Tỷ lệ request > {self.config.latency_critical_ms}ms", "%", "Test results", "< 15%", "> 25%", f"{timeout_rate:.1f}", "OK" if timeout_rate < 15 else ("Critical" if timeout_rate > 25 else "Warning"), "", ""),
+            *self._ttft_metrics(ttfts, chunk_gaps),
             ("A", "A1", "Overall_Accuracy", "Độ chính xác trung bình (parse transaction)", "%", "Test results", "≥ 80%", "< 70%", f"{avg_accuracy:.1f}", "OK" if avg_accuracy >= 80 else ("Critical" if avg_accuracy < 70 else "Warning"), "LLM04,LLM09", "Scaffolding"),
             ("A", "A2", "Pass_Rate", "Tỷ lệ test case Pass", "%", "Test results", "≥ 80%", "< 70%", f"{summary.pass_rate():.1f}", "OK" if summary.pass_rate() >= 80 else ("Critical" if summary.pass_rate() < 70 else "Warning"), "LLM04,LLM09", "Step-by-step"),
             ("A", "A3", "Partial_Rate", "Tỷ lệ test case Partial Pass", "%", "Test results", "", "", f"{(summary.partial / max(summary.total_tests, 1) * 100):.1f}", "Info", "", ""),
+            ("A", "A4", "Response_Similarity", f"Độ tương đồng TF-IDF với Expected_Bot_Response ({len(similarities)} test case dạng text)", "%", "Test results", "", "", f"{avg_similarity:.1f}", "Info", "", ""),
             ("S", "S1", "Total_Tests_Executed", "Số test case đã chạy", "count", "Test runner", "", "", str(summary.total_tests), "Info", "", ""),
             ("S", "S2", "Tests_Per_Minute", "Tốc độ chạy test", "tests/min", "Calculated", "", "", f"{len(results) / max(summary.duration_seconds() / 60, 1):.1f}" if hasattr(summary, 'duration_seconds') else "N/A", "Info", "", ""),
             ("Stability", "ST1", "Error_Rate", "Tỷ lệ request lỗi (crash, exception)", "%", "Test results", "< 1%", "> 3%", f"{error_rate:.1f}", "OK" if error_rate < 1 else ("Critical" if error_rate > 3 else "Warning"), "", ""),
@@ -562,23 +549,39 @@ class ReportGenerator:
             ("Security", "SEC2", "Security_Pass_Rate", "Tỷ lệ security tests Pass", "%", "Test results", "100%", "< 95%", f"{self._calc_security_pass_rate(results):.1f}", "OK" if self._calc_security_pass_rate(results) >= 100 else "Warning", "LLM01-LLM10", ""),
         ]
         
-        for row_idx, row_data in enumerate(metrics_data, start=2):
-            for col, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col, value=value)
-                cell.border = self.thin_border
-                # Color status column
-                if col == 10:
-                    if value == "OK":
-                        cell.fill = self.pass_fill
-                    elif value == "Warning":
-                        cell.fill = self.partial_fill
-                    elif value == "Critical":
-                        cell.fill = self.fail_fill
-        
-        # Set column widths
-        widths = [12, 10, 25, 55, 18, 20, 18, 15, 15, 10, 20, 25]
-        for i, w in enumerate(widths):
-            ws.column_dimensions[chr(65 + i)].width = w
+        for row_data in metrics_data:
+            # Color status column
+            self._append_row(ws, row_data, {10: METRIC_STATUS_STYLES.get(row_data[9], CELL_STYLE)})
+    
+    @staticmethod
+    def _percentile(sorted_values: List[float], q: float) -> float:
+        return sorted_values[min(int(len(sorted_values) * q), len(sorted_values) - 1)]
+    
+    def _ttft_metrics(self, ttfts: List[float], chunk_gaps: List[float]) -> List[Tuple]:
+        """L6-L9 rows: TTFT percentiles and chunk gaps (no rows if nothing was streamed)"""
+        if not ttfts:
+            return []
+        
+        def status(value: float) -> str:
+            if value > self.config.ttft_critical_ms:
+                return "Critical"
+            return "Warning" if value > self.config.ttft_warning_ms else "OK"
+        
+        acceptable = f"< {self.config.ttft_warning_ms:,}"
+        alert = f"> {self.config.ttft_critical_ms:,}"
+        rows = []
+        for metric_id, q in (("L6", 0.50), ("L7", 0.95), ("L8", 0.99)):
+            value = self._percentile(ttfts, q)
+            rows.append((
+                "L", metric_id, f"P{int(q * 100)}_TTFT", f"Thời gian đến chunk đầu tiên (P{int(q * 100)}, streaming)",
+                "ms", "Streamed responses", acceptable, alert, f"{value:,.0f}", status(value), "", ""
+            ))
+        if chunk_gaps:
+            rows.append((
+                "L", "L9", "P95_Max_Chunk_Gap", "Khoảng dừng dài nhất giữa 2 chunk (P95)",
+                "ms", "Streamed responses", "", "", f"{self._percentile(chunk_gaps, 0.95):,.0f}", "Info", "", ""
+            ))
+        return rows
     
     def _create_owasp_coverage(self, ws, results: List[TestRunResult]):
         """Create 04_OWASP_Coverage sheet"""
@@ -586,7 +589,7 @@ class ReportGenerator:
             "OWASP_ID", "Risk_Name", "Relevant_to_System", "Mitigation_Summary",
             "Owner", "Status", "Last_Reviewed_Date", "Related_Test_Cases", "Pass_Rate_%"
         ]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [10, 35, 18, 40, 15, 15, 18, 40, 12])
         
         # Calculate coverage per OWASP risk
         owasp_stats = {}
@@ -602,40 +605,32 @@ class ReportGenerator:
                         if status == "OK":
                             owasp_stats[risk_id]["passed"] += 1
         
-        row_idx = 2
         for risk_id, risk_info in OWASP_RISKS.items():
             stats = owasp_stats.get(risk_id, {"test_cases": [], "passed": 0, "total": 0})
             pass_rate = (stats["passed"] / stats["total"] * 100) if stats["total"] > 0 else 0
             
-            ws.cell(row=row_idx, column=1, value=risk_id).border = self.thin_border
-            ws.cell(row=row_idx, column=2, value=risk_info["name"]).border = self.thin_border
-            ws.cell(row=row_idx, column=3, value="Yes" if stats["total"] > 0 else "Not tested").border = self.thin_border
-            ws.cell(row=row_idx, column=4, value=risk_info.get("mitigation", "")).border = self.thin_border
-            ws.cell(row=row_idx, column=5, value="Security Team").border = self.thin_border
-            
             status = "Tested" if stats["total"] > 0 else "Not started"
-            status_cell = ws.cell(row=row_idx, column=6, value=status)
-            status_cell.border = self.thin_border
             
-            ws.cell(row=row_idx, column=7, value=datetime.now().strftime("%Y-%m-%d") if stats["total"] > 0 else "").border = self.thin_border
-            ws.cell(row=row_idx, column=8, value=", ".join(stats["test_cases"][:5]) + ("..." if len(stats["test_cases"]) > 5 else "")).border = self.thin_border
-            
-            rate_cell = ws.cell(row=row_idx, column=9, value=f"{pass_rate:.1f}" if stats["total"] > 0 else "N/A")
-            rate_cell.border = self.thin_border
+            rate_style = CELL_STYLE
             if stats["total"] > 0:
                 if pass_rate >= 80:
-                    rate_cell.fill = self.pass_fill
+                    rate_style = PASS_STYLE
                 elif pass_rate >= 50:
-                    rate_cell.fill = self.partial_fill
+                    rate_style = PARTIAL_STYLE
                 else:
-                    rate_cell.fill = self.fail_fill
-            
-            row_idx += 1
-        
-        # Set column widths
-        widths = [10, 35, 18, 40, 15, 15, 18, 40, 12]
-        for i, w in enumerate(widths):
-            ws.column_dimensions[chr(65 + i)].width = w
+                    rate_style = FAIL_STYLE
+            
+            self._append_row(
+                ws,
+                [
+                    risk_id, risk_info["name"], "Yes" if stats["total"] > 0 else "Not tested",
+                    risk_info.get("mitigation", ""), "Security Team", status,
+                    datetime.now().strftime("%Y-%m-%d") if stats["total"] > 0 else "",
+                    ", ".join(stats["test_cases"][:5]) + ("..." if len(stats["test_cases"]) > 5 else ""),
+                    f"{pass_rate:.1f}" if stats["total"] > 0 else "N/A"
+                ],
+                {9: rate_style}
+            )
 
     def _create_owasp_test_results(self, ws, results: List[TestRunResult]):
         """Create 05_OWASP_Test_Results sheet"""
@@ -644,47 +639,33 @@ class ReportGenerator:
             "User_Message_Input", "Expected_Behavior", "Actual_Behavior",
             "Pass_Fail", "Severity_if_Failed", "Notes"
         ]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [15, 10, 15, 35, 50, 40, 30, 10, 18, 40])
         
-        row_idx = 2
         owasp_test_counter = 1
         
         for result in results:
             if result.owasp_check:
                 for risk_id, status in result.owasp_check.items():
-                    ws.cell(row=row_idx, column=1, value=f"OWASP_TC_{owasp_test_counter:03d}").border = self.thin_border
-                    ws.cell(row=row_idx, column=2, value=risk_id).border = self.thin_border
-                    ws.cell(row=row_idx, column=3, value=result.test_case_id).border = self.thin_border
-                    ws.cell(row=row_idx, column=4, value=OWASP_RISKS.get(risk_id, {}).get("name", "")).border = self.thin_border
-                    
                     # User message (truncated)
                     user_msg = result.actual_bot_response[:100] + "..." if result.actual_bot_response and len(result.actual_bot_response) > 100 else ""
-                    ws.cell(row=row_idx, column=5, value=user_msg).border = self.thin_border
-                    
-                    ws.cell(row=row_idx, column=6, value=f"Bot should handle {risk_id} securely").border = self.thin_border
-                    ws.cell(row=row_idx, column=7, value=status).border = self.thin_border
                     
                     # Pass/Fail
                     pass_fail = "Pass" if status == "OK" else "Fail"
-                    pf_cell = ws.cell(row=row_idx, column=8, value=pass_fail)
-                    pf_cell.border = self.thin_border
-                    if pass_fail == "Pass":
-                        pf_cell.fill = self.pass_fill
-                    else:
-                        pf_cell.fill = self.fail_fill
                     
                     # Severity
                     severity = OWASP_RISKS.get(risk_id, {}).get("severity", "Medium") if pass_fail == "Fail" else ""
-                    ws.cell(row=row_idx, column=9, value=severity).border = self.thin_border
-                    ws.cell(row=row_idx, column=10, value=result.notes or "").border = self.thin_border
                     
-                    row_idx += 1
+                    self._append_row(
+                        ws,
+                        [
+                            f"OWASP_TC_{owasp_test_counter:03d}", risk_id, result.test_case_id,
+                            OWASP_RISKS.get(risk_id, {}).get("name", ""), user_msg,
+                            f"Bot should handle {risk_id} securely", status, pass_fail, severity,
+                            result.notes or ""
+                        ],
+                        {8: PASS_STYLE if pass_fail == "Pass" else FAIL_STYLE}
+                    )
                     owasp_test_counter += 1
-        
-        # Set column widths
-        widths = [15, 10, 15, 35, 50, 40, 30, 10, 18, 40]
-        for i, w in enumerate(widths):
-            ws.column_dimensions[chr(65 + i)].width = w
     
     def _create_class_checklist(self, ws, results: List[TestRunResult]):
         """Create 06_CLASS_Checklist sheet"""
@@ -692,7 +673,7 @@ class ReportGenerator:
             "CLASS_Component", "Description", "Implemented_YN", "Evidence_Link",
             "Test_Cases", "Pass_Rate_%", "Notes"
         ]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [30, 70, 15, 20, 40, 12, 40])
         
         # Calculate stats per CLASS principle
         class_stats = {}
@@ -708,7 +689,6 @@ class ReportGenerator:
                         if passed:
                             class_stats[principle]["passed"] += 1
         
-        row_idx = 2
         for principle, principle_info in CLASS_PRINCIPLES.items():
             stats = class_stats.get(principle, {"test_cases": [], "passed": 0, "total": 0})
             pass_rate = (stats["passed"] / stats["total"] * 100) if stats["total"] > 0 else 0
@@ -719,38 +699,28 @@ class ReportGenerator:
             else:
                 description = str(principle_info)
             
-            ws.cell(row=row_idx, column=1, value=principle).border = self.thin_border
-            ws.cell(row=row_idx, column=2, value=description).border = self.thin_border
-            
             # Implemented status
             impl_status = "Yes" if stats["total"] > 0 and pass_rate >= 80 else ("Partial" if stats["total"] > 0 else "No")
-            impl_cell = ws.cell(row=row_idx, column=3, value=impl_status)
-            impl_cell.border = self.thin_border
             if impl_status == "Yes":
-                impl_cell.fill = self.pass_fill
+                impl_style = PASS_STYLE
             elif impl_status == "Partial":
-                impl_cell.fill = self.partial_fill
+                impl_style = PARTIAL_STYLE
             else:
-                impl_cell.fill = self.fail_fill
-            
-            ws.cell(row=row_idx, column=4, value="").border = self.thin_border
-            ws.cell(row=row_idx, column=5, value=", ".join(stats["test_cases"][:5]) + ("..." if len(stats["test_cases"]) > 5 else "")).border = self.thin_border
-            
-            rate_cell = ws.cell(row=row_idx, column=6, value=f"{pass_rate:.1f}" if stats["total"] > 0 else "N/A")
-            rate_cell.border = self.thin_border
-            
-            ws.cell(row=row_idx, column=7, value="").border = self.thin_border
-            
-            row_idx += 1
-        
-        # Set column widths
-        widths = [30, 70, 15, 20, 40, 12, 40]
-        for i, w in enumerate(widths):
-            ws.column_dimensions[chr(65 + i)].width = w
+                impl_style = FAIL_STYLE
+            
+            self._append_row(
+                ws,
+                [
+                    principle, description, impl_status, "",
+                    ", ".join(stats["test_cases"][:5]) + ("..." if len(stats["test_cases"]) > 5 else ""),
+                    f"{pass_rate:.1f}" if stats["total"] > 0 else "N/A", ""
+                ],
+                {3: impl_style}
+            )
     def _create_class_metrics_explanation(self, ws):
         """Create 05_CLASS_Metrics_Explanation sheet"""
         headers = ["Dimension", "Metric", "Description", "Unit", "Threshold", "Calculation", "Notes"]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [12, 20, 40, 10, 30, 60, 50])
         
         data = [
             # C - Cost
@@ -809,26 +779,15 @@ class ReportGenerator:
              "Check if errors are handled gracefully", "Lỗi phải được handle đúng cách"),
         ]
         
-        row_idx = 2
         for row_data in data:
-            for col, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col, value=value)
-                cell.border = self.thin_border
-                if col == 1:  # Dimension column
-                    cell.font = Font(bold=True)
-            row_idx += 1
-        
-        # Set column widths
-        widths = [12, 20, 40, 10, 30, 60, 50]
-        for i, w in enumerate(widths):
-            ws.column_dimensions[chr(65 + i)].width = w
+            self._append_row(ws, row_data, {1: DIMENSION_STYLE})  # Dimension column bold
     
     def _create_thresholds_comparison(self, ws, results: List[TestRunResult], summary: TestSummary):
         """Create 06_Thresholds_Comparison sheet"""
         headers = [
             "Metric", "Threshold", "Actual", "Status", "Difference", "Percentage", "Notes"
         ]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [25, 20, 20, 15, 20, 15, 40])
         
         # Calculate actual values
         latencies = [r.measured_latency_ms for r in results if r.measured_latency_ms > 0]
@@ -874,7 +833,6 @@ class ReportGenerator:
             },
         ]
         
-        row_idx = 2
         for comp in comparisons:
             threshold = comp["threshold"]
             actual = comp["actual"]
@@ -885,24 +843,24 @@ class ReportGenerator:
                 # Lower is better
                 if actual <= threshold:
                     status = "✅ Pass"
-                    status_color = self.pass_fill
+                    status_style = PASS_STYLE
                 elif actual <= threshold * 1.5:
                     status = "⚠️ Warning"
-                    status_color = self.partial_fill
+                    status_style = PARTIAL_STYLE
                 else:
                     status = "❌ Fail"
-                    status_color = self.fail_fill
+                    status_style = FAIL_STYLE
             else:
                 # Higher is better
                 if actual >= threshold:
                     status = "✅ Pass"
-                    status_color = self.pass_fill
+                    status_style = PASS_STYLE
                 elif actual >= threshold * 0.9:
                     status = "⚠️ Warning"
-                    status_color = self.partial_fill
+                    status_style = PARTIAL_STYLE
                 else:
                     status = "❌ Fail"
-                    status_color = self.fail_fill
+                    status_style = FAIL_STYLE
             
             # Calculate difference
             if comp["metric"] in ["Average Latency", "P95 Latency", "Average Cost per Request"]:
@@ -912,17 +870,6 @@ class ReportGenerator:
                 diff = actual - threshold
                 percentage = (actual / threshold - 1) * 100 if threshold > 0 else 0
             
-            ws.cell(row=row_idx, column=1, value=comp["metric"]).border = self.thin_border
-            ws.cell(row=row_idx, column=2, value=f"{threshold} {unit}").border = self.thin_border
-            ws.cell(row=row_idx, column=3, value=f"{actual:.2f} {unit}").border = self.thin_border
-            
-            status_cell = ws.cell(row=row_idx, column=4, value=status)
-            status_cell.border = self.thin_border
-            status_cell.fill = status_color
-            
-            ws.cell(row=row_idx, column=5, value=f"{diff:+.2f} {unit}").border = self.thin_border
-            ws.cell(row=row_idx, column=6, value=f"{percentage:+.1f}%").border = self.thin_border
-            
             # Notes
             if status == "❌ Fail":
                 notes = f"Actual value {'exceeds' if diff > 0 else 'below'} threshold by {abs(percentage):.1f}%"
@@ -931,26 +878,74 @@ class ReportGenerator:
             else:
                 notes = "Within acceptable range"
             
-            ws.cell(row=row_idx, column=7, value=notes).border = self.thin_border
-            
-            row_idx += 1
-        
-        # Set column widths
-        widths = [25, 20, 20, 15, 20, 15, 40]
-        for i, w in enumerate(widths):
-            ws.column_dimensions[chr(65 + i)].width = w
+            self._append_row(
+                ws,
+                [
+                    comp["metric"], f"{threshold} {unit}", f"{actual:.2f} {unit}", status,
+                    f"{diff:+.2f} {unit}", f"{percentage:+.1f}%", notes
+                ],
+                {4: status_style}
+            )
     
-    def _create_workload_analysis(self, ws, results: List[TestRunResult], summary: TestSummary):
+    def _create_workload_analysis(
+        self,
+        ws,
+        results: List[TestRunResult],
+        summary: TestSummary,
+        workload_results: Optional[List[WorkloadLevelResult]] = None
+    ):
         """Create 07_Workload_Analysis sheet"""
         headers = [
             "Workload_Level", "Concurrent_Users", "Total_Requests", "Successful", "Failed",
             "Success_Rate_%", "Error_Rate_%", "Avg_Latency_ms", "P95_Latency_ms", "P99_Latency_ms",
             "Throughput_rps", "Avg_Cost_VND", "Status", "Notes"
         ]
-        self._apply_header_style(ws, 1, headers)
+        self._write_header(ws, headers, [18, 15, 12, 12, 12, 12, 12, 15, 15, 15, 15, 15, 12, 40])
         
-        # Group results by workload level (if available)
-        # For now, show overall statistics
+        if workload_results:
+            # One row per measured concurrent-users level
+            for level in workload_results:
+                self._write_workload_level_row(ws, level)
+        else:
+            self._write_workload_overall_row(ws, results, summary)
+    
+    def _write_workload_level_row(self, ws, level: WorkloadLevelResult):
+        """Write one measured workload level (load test) row"""
+        success_rate = level.success_rate()
+        error_rate = level.error_rate()
+        max_latency = level.max_latency_ms or self.config.p95_latency_max_ms
+        min_rps = level.expected_throughput_rps or self.config.throughput_min_rps
+        
+        # Determine status (workload_thresholds.json evaluation_criteria)
+        if (success_rate >= self.config.success_rate_min * 100
+                and error_rate < self.config.error_rate_max_percent
+                and level.p95_latency_ms <= max_latency
+                and level.throughput_rps >= min_rps):
+            status = "✅ Pass"
+            status_style = PASS_STYLE
+        elif success_rate >= 90 and error_rate < 5 and level.throughput_rps >= min_rps * 0.8:
+            status = "⚠️ Warning"
+            status_style = PARTIAL_STYLE
+        else:
+            status = "❌ Fail"
+            status_style = FAIL_STYLE
+        
+        values = [
+            level.level_name, level.concurrent_users, level.total_requests,
+            level.successful, level.failed,
+            f"{success_rate:.1f}", f"{error_rate:.1f}",
+            f"{level.avg_latency_ms:.0f}", f"{level.p95_latency_ms:.0f}", f"{level.p99_latency_ms:.0f}",
+            f"{level.throughput_rps:.1f}", f"{level.avg_cost_vnd:.0f}"
+        ]
+        notes = (
+            f"P50 latency: {level.p50_latency_ms:.0f}ms. "
+            f"Targets: >= {min_rps} rps, P95 <= {max_latency}ms. "
+            f"429 responses: {level.rate_limited}. Duration: {level.duration_seconds:.1f}s"
+        )
+        self._append_row(ws, values + [status, notes], {13: status_style})
+    
+    def _write_workload_overall_row(self, ws, results: List[TestRunResult], summary: TestSummary):
+        """Write the overall row when no load test was run (functional results only)"""
         latencies = [r.measured_latency_ms for r in results if r.measured_latency_ms > 0]
         costs = [r.measured_cost_vnd for r in results if r.measured_cost_vnd > 0]
         
@@ -972,45 +967,30 @@ class ReportGenerator:
         success_rate = (successful / total * 100) if total > 0 else 0
         error_rate = (failed / total * 100) if total > 0 else 0
         
-        # Estimate throughput (assuming test duration)
-        # This is a placeholder - actual throughput should be measured during concurrent tests
-        estimated_throughput = 0  # Would need actual test duration
+        # Throughput is only measured by the load test (run_tests.py --load)
+        estimated_throughput = 0
         
         # Determine status
         if success_rate >= 95 and error_rate < 1 and p95 < self.config.p95_latency_max_ms:
             status = "✅ Pass"
-            status_color = self.pass_fill
+            status_style = PASS_STYLE
         elif success_rate >= 90 and error_rate < 5:
             status = "⚠️ Warning"
-            status_color = self.partial_fill
+            status_style = PARTIAL_STYLE
         else:
             status = "❌ Fail"
-            status_color = self.fail_fill
+            status_style = FAIL_STYLE
+        
+        notes = f"Overall test results. P50 latency: {p50:.0f}ms. Run with --load to measure concurrent users levels"
         
-        row_idx = 2
         # Overall row
-        ws.cell(row=row_idx, column=1, value="Overall").border = self.thin_border
-        ws.cell(row=row_idx, column=2, value="N/A").border = self.thin_border
-        ws.cell(row=row_idx, column=3, value=total).border = self.thin_border
-        ws.cell(row=row_idx, column=4, value=successful).border = self.thin_border
-        ws.cell(row=row_idx, column=5, value=failed).border = self.thin_border
-        ws.cell(row=row_idx, column=6, value=f"{success_rate:.1f}").border = self.thin_border
-        ws.cell(row=row_idx, column=7, value=f"{error_rate:.1f}").border = self.thin_border
-        ws.cell(row=row_idx, column=8, value=f"{avg_latency:.0f}").border = self.thin_border
-        ws.cell(row=row_idx, column=9, value=f"{p95:.0f}").border = self.thin_border
-        ws.cell(row=row_idx, column=10, value=f"{p99:.0f}").border = self.thin_border
-        ws.cell(row=row_idx, column=11, value=f"{estimated_throughput:.1f}").border = self.thin_border
-        ws.cell(row=row_idx, column=12, value=f"{avg_cost:.0f}").border = self.thin_border
-        
-        status_cell = ws.cell(row=row_idx, column=13, value=status)
-        status_cell.border = self.thin_border
-        status_cell.fill = status_color
-        
-        notes = f"Overall test results. P50 latency: {p50:.0f}ms"
-        ws.cell(row=row_idx, column=14, value=notes).border = self.thin_border
-        
-        # Set column widths
-        widths = [18, 15, 12, 12, 12, 12, 12, 15, 15, 15, 15, 15, 12, 40]
-        for i, w in enumerate(widths):
-            ws.column_dimensions[chr(65 + i)].width = w
+        self._append_row(
+            ws,
+            [
+                "Overall", "N/A", total, successful, failed,
+                f"{success_rate:.1f}", f"{error_rate:.1f}", f"{avg_latency:.0f}", f"{p95:.0f}", f"{p99:.0f}",
+                f"{estimated_throughput:.1f}", f"{avg_cost:.0f}", status, notes
+            ],
+            {13: status_style}
+        )
 
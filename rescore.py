@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Rescore - Re-evaluate stored test results with the current evaluator rules
+
+generate_report_only.py trusts the stored Pass_Fail / Accuracy_Score_percent.
+When the evaluator rules change, rescore.py re-runs TestEvaluator over the
+recorded bot responses (no chatbot calls) and writes a new results file:
+
+- results are split into chunks and evaluated with
+  TestEvaluator.evaluate_many() in a ProcessPoolExecutor (all cores)
+- all files of an archive share one process pool, so re-scoring the whole
+  test_results/ directory keeps every core busy; files are streamed (the
+  next file is loaded while the current one finishes), so memory is bounded
+  by two files, not the archive
+- each file is re-scored against the test cases embedded in it
+  (fallback: --test-cases)
+
+Results without a response (Error, or Skip from a --replay miss) are kept
+as recorded. Run metadata (run ID, date, cost, token usage, phase timings,
+repeat stats) is preserved; only the evaluation fields change.
+
+Output: <name>_rescored_YYYYMMDD_HHMMSS.jsonl next to each input file
+(results journal format, readable by generate_report_only.py; convert with
+`python results_journal.py compact` if a consolidated JSON is needed).
+
+Usage:
+    python rescore.py test_results/test_run_20251226_174422.json
+    python rescore.py test_results/ --workers 8 --chunk-size 500
+"""
+import argparse
+import codecs
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Any, List, Optional, Tuple
+
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+from rich.console import Console
+from rich.table import Table
+
+from config import TestConfig
+from models import TestCase, TestRunResult, PassFailStatus, StabilityObservation
+from evaluator import TestEvaluator
+from results_journal import ResultsJournal, load_results_file, one_file_per_run, JOURNAL_SUFFIX
+from generate_report_only import calculate_summary
+from similarity_scorer import get_similarity_scorer
+
+
+console = Console()
+
+RESCORED_MARKER = "_rescored_"
+
+# Files loaded and queued ahead of the one being collected (bounds memory)
+LOOKAHEAD_FILES = 1
+
+# Retry note of results files written before the Attempts field existed
+_LEGACY_ATTEMPTS_NOTE = re.compile(r"Succeeded after (\d+) attempts")
+
+# Per-process state of pool workers
+_evaluator: Optional[TestEvaluator] = None
+_test_case_sets: Dict[str, Dict[str, TestCase]] = {}
+
+
+def _get_evaluator() -> TestEvaluator:
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = TestEvaluator(TestConfig())
+    return _evaluator
+
+
+def _get_test_cases(key: str, test_cases_data: List[Dict[str, Any]]) -> Dict[str, TestCase]:
+    """Test_Case_ID -> TestCase for one results file (built once per process)"""
+    test_cases = _test_case_sets.get(key)
+    if test_cases is None:
+        test_cases = {}
+        for tc_data in test_cases_data:
+            test_case = TestCase.from_dict(tc_data)
+            test_cases[test_case.test_case_id] = test_case
+        _test_case_sets[key] = test_cases
+    return test_cases
+
+
+def _recorded_attempts(row: Dict[str, Any], result: TestRunResult) -> int:
+    """Attempts of a recorded result (Attempts field; retry note of older files)"""
+    if "Attempts" in row:
+        return result.attempts
+    match = _LEGACY_ATTEMPTS_NOTE.search(result.notes)
+    return int(match.group(1)) if match else 1
+
+
+def rescore_chunk(
+    key: str,
+    test_cases_data: List[Dict[str, Any]],
+    rows: List[Dict[str, Any]]
+) -> List[TestRunResult]:
+    """
+    Re-evaluate stored results (TestRunResult.to_dict() rows)
+    
+    Runs in a pool worker; key identifies the test case set so it is only
+    parsed once per process. Returns the re-scored results in input order.
+    """
+    evaluator = _get_evaluator()
+    test_cases = _get_test_cases(key, test_cases_data)
+    # Loaded from the .npz cache after the first chunk of a test case set
+    evaluator.similarity_scorer = get_similarity_scorer(
+        test_cases.values(), evaluator.config.similarity_cache_dir or None
+    )
+    
+    stored = [TestRunResult.from_dict(row) for row in rows]
+    rescorable = [
+        i for i, result in enumerate(stored)
+        if result.pass_fail not in (PassFailStatus.ERROR, PassFailStatus.SKIP)
+        and result.test_case_id in test_cases
+    ]
+    
+    rescored = evaluator.evaluate_many(
+        test_cases,
+        [stored[i].test_case_id for i in rescorable],
+        [stored[i].actual_bot_response for i in rescorable],
+        [stored[i].actual_parsed_transaction for i in rescorable],
+        [stored[i].measured_latency_ms for i in rescorable],
+        attempts=[_recorded_attempts(rows[i], stored[i]) for i in rescorable]
+    )
+    
+    for i, result in zip(rescorable, rescored):
+        old = stored[i]
+        # Keep the run metadata, replace the evaluation
+        result.test_run_id = old.test_run_id
+        result.date = old.date
+        result.tester = old.tester
+        result.environment = old.environment
+        result.llm_model = old.llm_model
+        result.issue_ids = old.issue_ids
+        result.measured_cost_vnd = old.measured_cost_vnd
+        result.token_usage = old.token_usage
+        result.phase_timings_ms = old.phase_timings_ms
+        # Repeated runs: only the merged sample is re-scored, keep the consistency verdict
+        result.repeat_stats = old.repeat_stats
+        if old.stability_observation == StabilityObservation.INCONSISTENT:
+            result.stability_observation = old.stability_observation
+        stored[i] = result
+    return stored
+
+
+def find_results_files(paths: List[str]) -> List[Path]:
+    """
+    Expand directories to their test_run_* results files (skips re-scored outputs)
+    
+    One file per run: of a run's .json and .jsonl copies the consolidated
+    .json is used, so no run is re-scored (and written) twice.
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            candidates = list(path.glob("test_run_*.json")) + list(path.glob(f"test_run_*{JOURNAL_SUFFIX}"))
+            files.extend(p for p in candidates if RESCORED_MARKER not in p.stem)
+        else:
+            files.append(path)
+    return one_file_per_run(files, [".json", JOURNAL_SUFFIX])
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+class _InlineExecutor(Executor):
+    """Executor running tasks in the calling process (--workers 1)"""
+    
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def rescore_files(
+    paths: List[Path],
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    fallback_test_cases: Optional[List[Dict[str, Any]]] = None,
+    output_path: Optional[Path] = None,
+    lookahead_files: int = LOOKAHEAD_FILES
+) -> List[Tuple[Path, Path, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Re-score results files in a process pool
+    
+    Files are streamed: a file's chunks are submitted when it is loaded and
+    it is written as soon as they are done. Only lookahead_files files past
+    the one being collected are loaded (and queued as pickled chunks), which
+    keeps the pool busy across file boundaries without holding the whole
+    archive in memory. output_path only applies when a single file is
+    re-scored.
+    
+    Returns [(input_path, output_path, old_summary, new_summary)].
+    """
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else _InlineExecutor()
+    
+    def submit(path: Path):
+        data = load_results_file(path)
+        test_cases_data = data.get("test_cases") or fallback_test_cases or []
+        futures = [
+            executor.submit(rescore_chunk, str(path), test_cases_data, chunk)
+            for chunk in _chunks(data.pop("results", []), chunk_size)
+        ]
+        return path, data, test_cases_data, futures
+    
+    def collect(path: Path, data: Dict[str, Any], test_cases_data: List[Dict[str, Any]], futures: List[Future]):
+        results = [result for future in futures for result in future.result()]
+        target = output_path if output_path and len(paths) == 1 else _rescored_path(path)
+        new_summary = _write_rescored(path, target, data, results, test_cases_data)
+        return path, target, data.get("summary", {}), new_summary
+    
+    report = []
+    pending: Deque[Tuple] = deque()
+    with executor:
+        for path in paths:
+            pending.append(submit(path))
+            if len(pending) > lookahead_files:
+                report.append(collect(*pending.popleft()))
+        while pending:
+            report.append(collect(*pending.popleft()))
+    return report
+
+
+def _rescored_path(path: Path) -> Path:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return path.with_name(f"{path.stem}{RESCORED_MARKER}{timestamp}{JOURNAL_SUFFIX}")
+
+
+def _write_rescored(
+    source: Path,
+    target: Path,
+    data: Dict[str, Any],
+    results: List[TestRunResult],
+    test_cases_data: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Write the re-scored results journal, return its summary"""
+    summary = calculate_summary(results)
+    summary.start_time = summary.end_time = None
+    summary_dict = summary.to_dict()
+    
+    run_info = dict(data.get("run_info", {}))
+    run_info["rescored_from"] = str(source)
+    run_info["rescored_at"] = datetime.now().isoformat()
+    
+    journal = ResultsJournal(target)
+    journal.open(run_info=run_info, test_cases=test_cases_data)
+    for result in results:
+        journal.append(result.to_dict())
+    journal.close(run_info={"status": "completed"}, summary=summary_dict)
+    return summary_dict
+
+
+def print_report(report: List[Tuple[Path, Path, Dict[str, Any], Dict[str, Any]]]):
+    """Before / after pass counts per file"""
+    table = Table(title="Re-scored Results")
+    table.add_column("File", style="cyan")
+    table.add_column("Tests", justify="right")
+    table.add_column("Passed", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Pass Rate", justify="right")
+    
+    def change(old: Dict[str, Any], new: Dict[str, Any], key: str, fmt: str = "{}") -> str:
+        if key not in old:
+            return fmt.format(new[key])
+        return f"{fmt.format(old[key])} → {fmt.format(new[key])}"
+    
+    for source, _, old, new in report:
+        table.add_row(
+            source.name,
+            str(new["Total_Tests"]),
+            change(old, new, "Passed"),
+            change(old, new, "Failed"),
+            change(old, new, "Pass_Rate_Percent", "{:.1f}%")
+        )
+    console.print(table)
+    for _, target, _, _ in report:
+        console.print(f"[green]✅ Saved: {target}[/green]")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-score stored test results with the current evaluator rules",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Re-score one run
+  python rescore.py test_results/test_run_20251226_174422.json
+  
+  # Re-score the whole archive on all cores
+  python rescore.py test_results/
+        """
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="Results files (JSON or JSONL journal) or directories of test_run_* files"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: number of CPUs, 1 = no process pool)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="Results per worker task (default: 500)"
+    )
+    parser.add_argument(
+        "--test-cases",
+        default="test_cases_all.json",
+        help="Test cases for results files without embedded test cases (default: test_cases_all.json)"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Output file (only when re-scoring a single results file)"
+    )
+    
+    args = parser.parse_args()
+    
+    files = find_results_files(args.paths)
+    if not files:
+        console.print("[red]❌ No results files found[/red]")
+        sys.exit(1)
+    
+    fallback_test_cases = []
+    if Path(args.test_cases).exists():
+        with open(args.test_cases, 'r', encoding='utf-8') as f:
+            fallback_test_cases = json.load(f).get("test_cases", [])
+    
+    console.print(f"[cyan]Re-scoring {len(files)} results file(s) with {args.workers} worker(s)...[/cyan]")
+    start = datetime.now()
+    report = rescore_files(
+        files,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        fallback_test_cases=fallback_test_cases,
+        output_path=Path(args.output) if args.output else None
+    )
+    print_report(report)
+    console.print(f"[cyan]Done in {(datetime.now() - start).total_seconds():.1f}s[/cyan]")
+
+
+if __name__ == "__main__":
+    main()
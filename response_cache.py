@@ -0,0 +1,207 @@
+"""
+Response Cache - Record and replay chatbot responses
+
+Real runs record every successful /api/ask response to a JSON file on disk.
+In replay mode (run_tests.py --replay) the runner feeds the cached
+APIResponse to the evaluator instead of calling the chatbot, so scoring
+rules can be changed and re-run over all test cases in well under a second
+and at no LLM cost.
+
+Cache key: chatbot URL + LLM model + endpoint + identity mode + system
+prompt version + message. The system prompt version is a hash of
+system_prompts.json, so editing the prompts automatically invalidates
+recorded responses; runs against another server or with another --model
+record and replay their own entries. Responses of the mock server
+(mock_server.py, Server: MoneyCareMock/...) are never recorded.
+
+The cache is bounded (max entries and max size in bytes) with LRU eviction.
+
+Usage:
+    cache = ResponseCache(
+        "test_results/response_cache.json", prompt_version=prompt_version_hash(),
+        base_url="http://127.0.0.1:3333", llm_model="gpt-4o-mini"
+    )
+    cached = cache.get("/api/ask", "guest_new", "chi 50k ăn trưa")
+    if cached is None:
+        response = client.ask("chi 50k ăn trưa")
+        cache.put("/api/ask", "guest_new", "chi 50k ăn trưa", response)
+    cache.save()
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+from api_client import APIResponse
+
+
+CACHE_FORMAT_VERSION = 2  # 2: chatbot URL and LLM model in the key
+
+# Server header prefix of mock_server.py (canned answers, not recorded)
+MOCK_SERVER_PREFIX = "MoneyCareMock/"
+
+
+def prompt_version_hash(path: Union[str, Path] = "system_prompts.json") -> str:
+    """Short sha256 of the system prompts file ("none" if it does not exist)"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except FileNotFoundError:
+        return "none"
+
+
+def make_cache_key(
+    base_url: str,
+    llm_model: str,
+    endpoint: str,
+    identity_mode: str,
+    prompt_version: str,
+    message: str
+) -> str:
+    """Stable key for one cached request"""
+    raw = json.dumps(
+        [base_url.rstrip("/"), llm_model, endpoint, identity_mode, prompt_version, message], ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded LRU cache of APIResponse objects
+    
+    Thread-safe: concurrent workers (--workers N) share one instance.
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        prompt_version: Optional[str] = None,
+        max_entries: int = 5000,
+        max_bytes: int = 50 * 1024 * 1024,
+        base_url: str = "",
+        llm_model: str = ""
+    ):
+        self.path = Path(path)
+        self.prompt_version = prompt_version or prompt_version_hash()
+        self.base_url = base_url
+        self.llm_model = llm_model
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        
+        self.hits = 0
+        self.misses = 0
+        self.mock_responses = 0  # Not recorded (mock server)
+        
+        self.load()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+    
+    def load(self):
+        """Load entries from disk (missing or unreadable file = empty cache)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            return
+        
+        with self._lock:
+            # Stored least recently used first
+            for key, entry in data.get("entries", {}).items():
+                self._insert(key, entry)
+            self._evict()
+    
+    def save(self):
+        """Write the cache to disk (atomic replace) if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": CACHE_FORMAT_VERSION,
+                "saved_at": datetime.now().isoformat(),
+                "entries": dict(self._entries)
+            }
+            self._dirty = False
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+    
+    def get(self, endpoint: str, identity_mode: str, message: str) -> Optional[APIResponse]:
+        """Cached response for a request, or None (marks the entry as recently used)"""
+        key = self._key(endpoint, identity_mode, message)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return APIResponse(**entry["response"])
+    
+    def put(self, endpoint: str, identity_mode: str, message: str, response: APIResponse):
+        """Record a response (only successful responses of the real chatbot are cached)"""
+        if not response.success:
+            return
+        if (response.server or "").startswith(MOCK_SERVER_PREFIX):
+            with self._lock:
+                self.mock_responses += 1
+            return
+        
+        key = self._key(endpoint, identity_mode, message)
+        entry = {
+            "base_url": self.base_url,
+            "llm_model": self.llm_model,
+            "endpoint": endpoint,
+            "identity_mode": identity_mode,
+            "prompt_version": self.prompt_version,
+            "message": message,
+            "recorded_at": datetime.now().isoformat(),
+            "response": asdict(response)
+        }
+        with self._lock:
+            self._insert(key, entry)
+            self._evict()
+            self._dirty = True
+    
+    def _key(self, endpoint: str, identity_mode: str, message: str) -> str:
+        return make_cache_key(self.base_url, self.llm_model, endpoint, identity_mode, self.prompt_version, message)
+    
+    def _insert(self, key: str, entry: Dict[str, Any]):
+        """Insert/replace an entry as most recently used (caller holds the lock)"""
+        if key in self._entries:
+            self._total_bytes -= self._sizes[key]
+        size = len(json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._sizes[key] = size
+        self._total_bytes += size
+    
+    def _evict(self):
+        """Drop least recently used entries until within limits (caller holds the lock)"""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            key, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(key)
+            self._dirty = True
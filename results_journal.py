@@ -0,0 +1,160 @@
+"""
+Results Journal - Append-only JSONL results file for test runs
+
+Instead of rewriting the whole test_run_*.json after every test, the runner
+appends one JSON line per TestRunResult and flushes it, so each write costs
+O(1) and a crashed run keeps every completed result.
+
+File layout (test_run_YYYYMMDD_HHMMSS.jsonl, one JSON object per line):
+    {"type": "header", "run_info": {...}, "test_cases": [...]}
+    {"type": "result", "result": {...TestRunResult.to_dict()...}}
+    ...
+    {"type": "footer", "run_info": {...}, "summary": {...}}
+
+The footer is only present when the run completed. load_results_file() reads
+both this format and the consolidated JSON format (and the typed Parquet copy,
+see columnar_store.py), and compact_journal() converts a journal into the
+consolidated JSON on demand.
+
+Usage:
+    python results_journal.py compact test_results/test_run_20251226_022350.jsonl
+"""
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+
+JOURNAL_SUFFIX = ".jsonl"
+
+
+class ResultsJournal:
+    """Append-only writer for a JSONL results journal"""
+    
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = None
+    
+    def open(self, run_info: Dict[str, Any], test_cases: List[Dict[str, Any]]):
+        """Create the journal and write the header record"""
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write({"type": "header", "run_info": run_info, "test_cases": test_cases})
+    
+    def append(self, result: Dict[str, Any]):
+        """Append one result record (TestRunResult.to_dict())"""
+        self._write({"type": "result", "result": result})
+    
+    def close(self, run_info: Dict[str, Any], summary: Dict[str, Any]):
+        """Write the footer record and close the journal"""
+        self._write({"type": "footer", "run_info": run_info, "summary": summary})
+        self._file.close()
+        self._file = None
+    
+    def _write(self, record: Dict[str, Any]):
+        """Write one line and flush it so it survives a crash"""
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+
+def read_journal(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Read a JSONL journal into the consolidated results structure
+    
+    Returns: {"run_info": {...}, "summary": {...}, "results": [...], "test_cases": [...]}
+    A journal without footer (run still going or crashed) keeps
+    run_info["status"] == "running" and an empty summary. A partially
+    written last line is ignored.
+    """
+    data = {"run_info": {}, "summary": {}, "results": [], "test_cases": []}
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Truncated last line from an interrupted write
+                continue
+            
+            record_type = record.get("type")
+            if record_type == "result":
+                data["results"].append(record["result"])
+            elif record_type == "header":
+                data["run_info"] = record.get("run_info", {})
+                data["test_cases"] = record.get("test_cases", [])
+            elif record_type == "footer":
+                data["run_info"].update(record.get("run_info", {}))
+                data["summary"] = record.get("summary", {})
+    
+    return data
+
+
+def load_results_file(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None
+) -> Dict[str, Any]:
+    """
+    Load a results file - JSONL journal, consolidated JSON or Parquet
+    
+    columns / filters (result columns to read, pyarrow row filters) only
+    apply to Parquet files; JSON files are always read whole.
+    """
+    suffix = Path(path).suffix
+    if suffix == JOURNAL_SUFFIX:
+        return read_journal(path)
+    if suffix == ".parquet":
+        # Imported here: columnar_store imports this module (and pyarrow)
+        from columnar_store import read_results
+        return read_results(path, columns=columns, filters=filters)
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compact_journal(path: Union[str, Path], output_path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Write the consolidated JSON (run_info, summary, results, test_cases) for a journal
+    
+    Default output: same name with .json extension
+    """
+    data = read_journal(path)
+    output_path = Path(output_path) if output_path else Path(path).with_suffix(".json")
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    return output_path
+
+
+def one_file_per_run(files: List[Path], suffixes: List[str]) -> List[Path]:
+    """
+    One results file per run (stem), sorted by stem
+    
+    A run can have several copies (compact_journal() writes test_run_X.json
+    next to test_run_X.jsonl); the one whose suffix comes first in suffixes
+    is used.
+    """
+    by_run: Dict[Path, List[Path]] = {}
+    for path in files:
+        by_run.setdefault(path.with_suffix(""), []).append(path)
+    
+    def preference(path: Path) -> int:
+        return suffixes.index(path.suffix) if path.suffix in suffixes else len(suffixes)
+    
+    return [min(copies, key=preference) for _, copies in sorted(by_run.items())]
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != "compact":
+        print("Usage: python results_journal.py compact <journal.jsonl> [output.json]")
+        sys.exit(1)
+    
+    output_path = compact_journal(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"✅ Consolidated results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Run History - SQLite database of all test runs for trend queries
+
+test_results/ holds one timestamped results file per run, so "how did
+TC_001 latency and accuracy move over the last 50 runs" meant opening every
+file. Runs are ingested into test_results/run_history.db instead (the runner
+adds each run when it completes; older files with `ingest`):
+
+- runs: one row per run (results file stem), run_info and summary totals
+- results: one row per (run, test case) with the numeric metrics; feature
+  area, model, environment and run start are copied onto the row so a trend
+  is a single index range scan (indexes by test case, feature area and
+  model + environment, each ordered by run start)
+- test_case_versions: every distinct definition of a test case (sha256 of
+  its JSON), so a trend shows where the test itself changed
+- phase_timings: per-phase latency (connect, ttfb, ask ...) per result
+
+A run's .parquet / .json / .jsonl files share a stem and are one run;
+ingesting a run again replaces its rows. Re-scored outputs and replay runs
+(run_info mode "replay": recorded responses with their old latencies) are
+skipped.
+
+Usage:
+    python run_history.py ingest test_results/
+    python run_history.py trend --case TC_001 --last 50
+    python run_history.py trend --feature Security --model gpt-4o-mini
+    python run_history.py phases --case TC_001 --phase ttfb
+    python run_history.py runs
+    
+    with RunHistory("test_results/run_history.db") as history:
+        history.case_trend("TC_001", last=50)
+"""
+import argparse
+import codecs
+import hashlib
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Fix encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+from rich.console import Console
+from rich.table import Table
+
+from models import TestRunResult, PassFailStatus
+from results_journal import load_results_file, one_file_per_run, JOURNAL_SUFFIX
+from columnar_store import PARQUET_SUFFIX, pyarrow_available
+from rescore import RESCORED_MARKER
+
+
+console = Console()
+
+DEFAULT_DB = "test_results/run_history.db"
+
+# Result columns ingestion reads (Parquet files decode only these)
+HISTORY_COLUMNS = [
+    "Test_Case_ID", "Environment", "LLM_Model", "Pass_Fail", "Measured_Latency_ms",
+    "Measured_Cost_VND", "Accuracy_Score_percent", "Response_Similarity_percent",
+    "Security_Observation", "Stability_Observation", "Phase_Timings_ms", "Repeat_Stats"
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    source_file TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    status TEXT,
+    environment TEXT,
+    llm_model TEXT,
+    total_tests INTEGER,
+    passed INTEGER,
+    failed INTEGER,
+    avg_latency_ms REAL,
+    avg_accuracy REAL,
+    total_cost_vnd REAL,
+    ingested_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS test_case_versions (
+    test_case_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    feature_area TEXT,
+    priority TEXT,
+    definition TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    PRIMARY KEY (test_case_id, version)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    test_case_id TEXT NOT NULL,
+    version TEXT,
+    feature_area TEXT,
+    environment TEXT,
+    llm_model TEXT,
+    started_at TEXT NOT NULL,
+    pass_fail TEXT,
+    latency_ms INTEGER,
+    cost_vnd REAL,
+    accuracy_percent REAL,
+    similarity_percent REAL,
+    security_observation TEXT,
+    stability_observation TEXT,
+    PRIMARY KEY (run_id, test_case_id)
+);
+CREATE INDEX IF NOT EXISTS idx_results_case ON results (test_case_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_results_feature ON results (feature_area, started_at);
+CREATE INDEX IF NOT EXISTS idx_results_model_env ON results (llm_model, environment, started_at);
+
+CREATE TABLE IF NOT EXISTS phase_timings (
+    test_case_id TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    ms REAL NOT NULL,
+    PRIMARY KEY (test_case_id, phase, started_at, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_phase_timings_run ON phase_timings (run_id);
+"""
+
+# Preferred file when a run has several (same stem): typed columns first
+_SOURCE_PREFERENCE = [PARQUET_SUFFIX, ".json", JOURNAL_SUFFIX]
+
+
+def _run_started_at(run_id: str, run_info: Dict[str, Any], path: Optional[Path]) -> str:
+    """Run start: run_info, else the file name timestamp, else the file mtime"""
+    if run_info.get("start_time"):
+        return run_info["start_time"]
+    try:
+        return datetime.strptime(run_id[-15:], "%Y%m%d_%H%M%S").isoformat()
+    except ValueError:
+        if path is not None and path.exists():
+            return datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+        return datetime.now().isoformat()
+
+
+def find_history_files(paths: List[Union[str, Path]]) -> List[Path]:
+    """
+    Results files to ingest, one per run
+    
+    Directories are expanded to their test_run_* / test_results_* files;
+    of a run's .parquet / .json / .jsonl copies the first in that order is
+    used (Parquet only with pyarrow installed).
+    """
+    suffixes = _SOURCE_PREFERENCE if pyarrow_available() else _SOURCE_PREFERENCE[1:]
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                p for pattern in ("test_run_*", "test_results_*") for p in path.glob(pattern)
+                if p.suffix in suffixes and RESCORED_MARKER not in p.stem
+            )
+        else:
+            files.append(path)
+    return one_file_per_run(files, suffixes)
+
+
+class RunHistory:
+    """SQLite run history (ingest runs, query trends)"""
+    
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL: trend queries do not block on a runner ingesting a run
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+    
+    def close(self):
+        # Refresh the query planner statistics when they are stale (cheap otherwise)
+        self.conn.execute("PRAGMA optimize")
+        self.conn.close()
+    
+    def __enter__(self) -> "RunHistory":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    # Ingestion
+    
+    def has_run(self, run_id: str) -> bool:
+        """Run already ingested as completed"""
+        row = self.conn.execute("SELECT status FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return row is not None and row["status"] == "completed"
+    
+    def ingest_file(self, path: Union[str, Path], force: bool = False) -> bool:
+        """
+        Ingest one results file (JSON, JSONL journal or Parquet)
+        
+        Completed runs already in the database are skipped unless force;
+        replay runs are always skipped.
+        Returns: True if the run was (re)ingested
+        """
+        path = Path(path)
+        run_id = path.stem
+        if not force and self.has_run(run_id):
+            return False
+        
+        data = load_results_file(path, columns=HISTORY_COLUMNS)
+        if data.get("run_info", {}).get("mode") == "replay":
+            return False
+        self.ingest_run(run_id, data, source_file=str(path))
+        return True
+    
+    def ingest_run(self, run_id: str, data: Dict[str, Any], source_file: str = ""):
+        """
+        Ingest a run from its consolidated results structure (one transaction)
+        
+        data: {"run_info", "summary", "results", "test_cases"} as returned by
+        load_results_file(); results as to_dict() records.
+        """
+        run_info = data.get("run_info", {})
+        summary = data.get("summary", {})
+        started_at = _run_started_at(run_id, run_info, Path(source_file) if source_file else None)
+        
+        # Test case definitions of this run (feature area and version per Test_Case_ID)
+        versions = {}
+        version_rows = []
+        for tc in data.get("test_cases", []):
+            test_case_id = tc.get("Test_Case_ID")
+            if not test_case_id:
+                continue
+            definition = json.dumps(tc, sort_keys=True, ensure_ascii=False)
+            version = hashlib.sha256(definition.encode('utf-8')).hexdigest()[:16]
+            versions[test_case_id] = (version, tc.get("Feature_Area", ""))
+            version_rows.append((
+                test_case_id, version, tc.get("Feature_Area", ""), tc.get("Priority", ""), definition, started_at
+            ))
+        
+        results = [TestRunResult.from_dict(record) for record in data.get("results", [])]
+        result_rows = []
+        phase_rows = []
+        for result in results:
+            version, feature_area = versions.get(result.test_case_id, (None, ""))
+            if not feature_area:
+                feature_area = self._known_feature_area(result.test_case_id)
+            result_rows.append((
+                run_id, result.test_case_id, version, feature_area,
+                result.environment or run_info.get("environment", ""),
+                result.llm_model or run_info.get("llm_model", ""),
+                started_at, result.pass_fail.value, int(result.measured_latency_ms),
+                result.measured_cost_vnd, result.accuracy_score_percent, result.response_similarity_percent,
+                result.security_observation.value, result.stability_observation.value
+            ))
+            for phase, ms in (result.phase_timings_ms or {}).items():
+                phase_rows.append((result.test_case_id, phase, started_at, run_id, ms))
+        
+        accuracy_scores = [r.accuracy_score_percent for r in results if r.accuracy_score_percent > 0]
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self.conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, source_file, started_at, run_info.get("end_time"),
+                    run_info.get("status", "completed" if summary else "running"),
+                    run_info.get("environment", ""), run_info.get("llm_model", ""),
+                    len(results),
+                    sum(1 for r in results if r.pass_fail == PassFailStatus.PASS),
+                    sum(1 for r in results if r.pass_fail == PassFailStatus.FAIL),
+                    sum(r.measured_latency_ms for r in results) / len(results) if results else 0.0,
+                    sum(accuracy_scores) / len(accuracy_scores) if accuracy_scores else 0.0,
+                    # As calculate_summary: all samples of a --repeat run
+                    sum(r.repeat_stats["total_cost_vnd"] if r.repeat_stats else r.measured_cost_vnd for r in results),
+                    datetime.now().isoformat()
+                )
+            )
+            # Runs may be ingested out of order: keep the earliest run start per version
+            self.conn.executemany(
+                """
+                INSERT INTO test_case_versions VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (test_case_id, version) DO UPDATE SET first_seen = MIN(first_seen, excluded.first_seen)
+                """,
+                version_rows
+            )
+            # A --resume file may carry a test case twice: the later result wins
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", result_rows
+            )
+            self.conn.executemany("INSERT OR REPLACE INTO phase_timings VALUES (?, ?, ?, ?, ?)", phase_rows)
+    
+    def _known_feature_area(self, test_case_id: str) -> str:
+        """Feature area of a test case from an earlier version (files without test cases)"""
+        row = self.conn.execute(
+            "SELECT feature_area FROM test_case_versions WHERE test_case_id = ? ORDER BY first_seen DESC LIMIT 1",
+            (test_case_id,)
+        ).fetchone()
+        return row["feature_area"] if row else ""
+    
+    # Queries
+    
+    @staticmethod
+    def _filters(llm_model: Optional[str], environment: Optional[str]) -> tuple:
+        clauses, params = "", []
+        if llm_model:
+            clauses += " AND llm_model = ?"
+            params.append(llm_model)
+        if environment:
+            clauses += " AND environment = ?"
+            params.append(environment)
+        return clauses, params
+    
+    def case_trend(
+        self,
+        test_case_id: str,
+        last: int = 50,
+        llm_model: Optional[str] = None,
+        environment: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Latency / accuracy / cost of one test case over its last runs (oldest first)"""
+        clauses, params = self._filters(llm_model, environment)
+        rows = self.conn.execute(
+            f"""
+            SELECT run_id, started_at, version, llm_model, environment, pass_fail, latency_ms,
+                   accuracy_percent, similarity_percent, cost_vnd
+            FROM results
+            WHERE test_case_id = ?{clauses}
+            ORDER BY started_at DESC
+            LIMIT ?
+            """,
+            [test_case_id, *params, last]
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+    
+    def feature_trend(
+        self,
+        feature_area: str,
+        last: int = 50,
+        llm_model: Optional[str] = None,
+        environment: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Per-run averages of a feature area over its last runs (oldest first)"""
+        clauses, params = self._filters(llm_model, environment)
+        # Start of the last runs first (backward index scan), then aggregate only those rows
+        rows = self.conn.execute(
+            f"""
+            WITH recent AS (
+                SELECT DISTINCT started_at FROM results
+                WHERE feature_area = ?{clauses}
+                ORDER BY started_at DESC
+                LIMIT ?
+            )
+            SELECT run_id, started_at, COUNT(*) AS tests,
+                   SUM(pass_fail = 'Pass') AS passed,
+                   AVG(latency_ms) AS avg_latency_ms, MAX(latency_ms) AS max_latency_ms,
+                   AVG(NULLIF(accuracy_percent, 0)) AS avg_accuracy_percent,
+                   SUM(cost_vnd) AS cost_vnd
+            FROM results
+            WHERE feature_area = ?{clauses} AND started_at >= (SELECT MIN(started_at) FROM recent)
+            GROUP BY started_at, run_id
+            ORDER BY started_at DESC
+            LIMIT ?
+            """,
+            [feature_area, *params, last, feature_area, *params, last]
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+    
+    def phase_trend(self, test_case_id: str, phase: str, last: int = 50) -> List[Dict[str, Any]]:
+        """One latency phase of a test case over its last runs (oldest first)"""
+        rows = self.conn.execute(
+            """
+            SELECT run_id, started_at, ms
+            FROM phase_timings
+            WHERE test_case_id = ? AND phase = ?
+            ORDER BY started_at DESC
+            LIMIT ?
+            """,
+            (test_case_id, phase, last)
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+    
+    def runs(self, last: int = 20) -> List[Dict[str, Any]]:
+        """Last runs with their totals (oldest first)"""
+        rows = self.conn.execute(
+            "SELECT * FROM runs ORDER BY started_at DESC LIMIT ?", (last,)
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+    
+    def versions(self, test_case_id: str) -> List[Dict[str, Any]]:
+        """Known definitions of a test case (oldest first)"""
+        rows = self.conn.execute(
+            "SELECT * FROM test_case_versions WHERE test_case_id = ? ORDER BY first_seen", (test_case_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def _format(value: Any, fmt: str) -> str:
+    return "-" if value is None else format(value, fmt)
+
+
+def print_case_trend(test_case_id: str, rows: List[Dict[str, Any]]):
+    table = Table(title=f"{test_case_id} - last {len(rows)} runs")
+    table.add_column("Run", style="cyan", no_wrap=True)
+    table.add_column("Started")
+    table.add_column("Version")
+    table.add_column("Model")
+    table.add_column("Result")
+    table.add_column("Latency (ms)", justify="right")
+    table.add_column("Accuracy (%)", justify="right")
+    table.add_column("Cost (VND)", justify="right")
+    
+    previous_version = None
+    for row in rows:
+        # Mark the runs where the test case definition changed
+        version = row["version"] or "-"
+        changed = previous_version is not None and version != previous_version
+        previous_version = version
+        table.add_row(
+            row["run_id"], row["started_at"][:16], f"[yellow]{version[:8]}*[/]" if changed else version[:8],
+            row["llm_model"], row["pass_fail"], _format(row["latency_ms"], ",d"),
+            _format(row["accuracy_percent"], ".1f"), _format(row["cost_vnd"], ".2f")
+        )
+    console.print(table)
+
+
+def print_feature_trend(feature_area: str, rows: List[Dict[str, Any]]):
+    table = Table(title=f"{feature_area} - last {len(rows)} runs")
+    table.add_column("Run", style="cyan", no_wrap=True)
+    table.add_column("Started")
+    table.add_column("Passed", justify="right")
+    table.add_column("Avg Latency (ms)", justify="right")
+    table.add_column("Max Latency (ms)", justify="right")
+    table.add_column("Avg Accuracy (%)", justify="right")
+    table.add_column("Cost (VND)", justify="right")
+    for row in rows:
+        table.add_row(
+            row["run_id"], row["started_at"][:16], f"{row['passed']}/{row['tests']}",
+            _format(row["avg_latency_ms"], ",.0f"), _format(row["max_latency_ms"], ",d"),
+            _format(row["avg_accuracy_percent"], ".1f"), _format(row["cost_vnd"], ".2f")
+        )
+    console.print(table)
+
+
+def print_phase_trend(test_case_id: str, phase: str, rows: List[Dict[str, Any]]):
+    table = Table(title=f"{test_case_id} {phase} - last {len(rows)} runs")
+    table.add_column("Run", style="cyan", no_wrap=True)
+    table.add_column("Started")
+    table.add_column(f"{phase} (ms)", justify="right")
+    for row in rows:
+        table.add_row(row["run_id"], row["started_at"][:16], f"{row['ms']:,.1f}")
+    console.print(table)
+
+
+def print_runs(rows: List[Dict[str, Any]]):
+    table = Table(title=f"Last {len(rows)} runs")
+    table.add_column("Run", style="cyan", no_wrap=True)
+    table.add_column("Started")
+    table.add_column("Status")
+    table.add_column("Model")
+    table.add_column("Env")
+    table.add_column("Passed", justify="right")
+    table.add_column("Avg Latency (ms)", justify="right")
+    table.add_column("Avg Accuracy (%)", justify="right")
+    table.add_column("Cost (VND)", justify="right")
+    for row in rows:
+        table.add_row(
+            row["run_id"], row["started_at"][:16], row["status"], row["llm_model"], row["environment"],
+            f"{row['passed']}/{row['total_tests']}", f"{row['avg_latency_ms']:,.0f}",
+            f"{row['avg_accuracy']:.1f}", f"{row['total_cost_vnd']:.2f}"
+        )
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run history database: ingest results files, query trends",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Ingest the archive (completed runs already in the database are skipped)
+  python run_history.py ingest test_results/
+  
+  # Latency / accuracy / cost of one test case over the last 50 runs
+  python run_history.py trend --case TC_001 --last 50
+  
+  # Per-run averages of a feature area for one model
+  python run_history.py trend --feature Security --model gpt-4o-mini
+  
+  # Server think time (ttfb) of one test case
+  python run_history.py phases --case TC_001 --phase ttfb
+        """
+    )
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"History database (default: {DEFAULT_DB})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    ingest_parser = subparsers.add_parser("ingest", help="Ingest results files or directories")
+    ingest_parser.add_argument("paths", nargs="*", default=["test_results"], help="Files or directories (default: test_results)")
+    ingest_parser.add_argument("--force", action="store_true", help="Re-ingest runs already in the database")
+    
+    trend_parser = subparsers.add_parser("trend", help="Latency / accuracy / cost trend of a test case or feature area")
+    target = trend_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--case", help="Test_Case_ID")
+    target.add_argument("--feature", help="Feature_Area")
+    trend_parser.add_argument("--model", help="Only runs with this LLM model")
+    trend_parser.add_argument("--env", help="Only runs in this environment")
+    trend_parser.add_argument("--last", type=int, default=50, help="Number of runs (default: 50)")
+    
+    phases_parser = subparsers.add_parser("phases", help="Latency phase trend of a test case")
+    phases_parser.add_argument("--case", required=True, help="Test_Case_ID")
+    phases_parser.add_argument("--phase", default="ttfb", help="Phase (connect, ttfb, ask ...; default: ttfb)")
+    phases_parser.add_argument("--last", type=int, default=50, help="Number of runs (default: 50)")
+    
+    runs_parser = subparsers.add_parser("runs", help="Last ingested runs")
+    runs_parser.add_argument("--last", type=int, default=20, help="Number of runs (default: 20)")
+    
+    args = parser.parse_args()
+    
+    with RunHistory(args.db) as history:
+        if args.command == "ingest":
+            files = find_history_files(args.paths)
+            start = datetime.now()
+            ingested = sum(history.ingest_file(path, force=args.force) for path in files)
+            console.print(
+                f"[green]✅ Ingested {ingested} run(s) ({len(files) - ingested} already in {args.db} or replay runs) "
+                f"in {(datetime.now() - start).total_seconds():.1f}s[/green]"
+            )
+        elif args.command == "trend" and args.case:
+            print_case_trend(args.case, history.case_trend(args.case, args.last, args.model, args.env))
+        elif args.command == "trend":
+            print_feature_trend(args.feature, history.feature_trend(args.feature, args.last, args.model, args.env))
+        elif args.command == "phases":
+            print_phase_trend(args.case, args.phase, history.phase_trend(args.case, args.phase, args.last))
+        else:
+            print_runs(history.runs(args.last))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,8 @@ from rich.panel import Panel
 from config import TestConfig
 from test_runner import TestRunner
 from report_generator import ReportGenerator
+from load_tester import LoadTester, parse_levels
+from log_setup import setup_logging, LOG_LEVELS
 
 
 console = Console()
@@ -39,9 +41,34 @@ Examples:
   # Run only critical priority tests
   python run_tests.py -f test_cases.json --priority Critical
   
+  # Run 8 test cases concurrently
+  python run_tests.py -f test_cases_all.json --workers 8
+  
   # Run with custom environment
   python run_tests.py -f test_cases.json --env Production --url http://prod.example.com:3333
   
+  # Send every test case 5 times: per-case latency distribution, flag inconsistent answers
+  python run_tests.py -f test_cases_all.json --repeat 5 --workers 8
+  
+  # Watch RPS, in-flight requests, p50/p95/p99, errors and cost live
+  python run_tests.py -f test_cases_all.json --workers 8 --live
+  
+  # Stream answers and report time to first token (TTFT) percentiles
+  python run_tests.py -f test_cases_all.json --stream
+  
+  # Security suite: stop reading an answer as soon as it leaks or is hijacked
+  python run_tests.py -f test_cases_security.json --stream --abort-on-security-hit
+  
+  # Resume an interrupted run (only test cases missing from the results file are executed)
+  python run_tests.py -f test_cases_all.json --resume test_results/test_run_20251226_022350.jsonl
+  
+  # Re-score recorded responses without calling the chatbot (no LLM cost)
+  python run_tests.py -f test_cases_all.json --replay
+  
+  # Also run the concurrent-users load test (levels from workload_thresholds.json)
+  python run_tests.py -f test_cases_all.json --load
+  python run_tests.py -f test_cases_all.json --load --load-levels 10,50 --requests-per-user 10
+  
   # Export to different formats
   python run_tests.py -f test_cases.json --export excel
   python run_tests.py -f test_cases.json --export csv
@@ -90,6 +117,104 @@ Examples:
         default=30000,
         help="Request timeout in milliseconds (default: 30000)"
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Number of test cases to run concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Send every test case N times; report per-case latency min/median/p95/stddev "
+             "and flag cases whose answers diverge as Inconsistent_behavior (default: 1)"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Retries for rate-limited / timed out requests (default: 3, 0 = no retry)"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Client-side request rate limit in requests/sec shared by all workers (default: unlimited)"
+    )
+    parser.add_argument(
+        "--no-session-pool",
+        action="store_true",
+        help="Initialize a fresh session on the critical path of every test (no pre-initialized sessions)"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RESULTS_FILE",
+        help="Resume from a previous (partial) results file: skip test cases already recorded"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream answers (SSE) and measure time to first token (TTFT)"
+    )
+    parser.add_argument(
+        "--abort-on-security-hit",
+        action="store_true",
+        help="Cancel a security test's streamed answer at the first LLM01/LLM06/LLM02 indicator (implies --stream)"
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Live dashboard: rolling-window RPS, latency percentiles, errors/429 and cost "
+             "against workload_thresholds.json"
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Evaluate recorded responses (response cache, recorded with the same --url and --model) instead of calling the chatbot"
+    )
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="Do not record chatbot responses to the response cache"
+    )
+    parser.add_argument(
+        "--no-parquet",
+        action="store_true",
+        help="Do not write the typed Parquet copy of the results (test_run_*.parquet)"
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not add this run to the run history database (test_results/run_history.db)"
+    )
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="Run the concurrent-users load test after the functional tests"
+    )
+    parser.add_argument(
+        "--load-levels",
+        type=parse_levels,
+        help="Comma-separated concurrent users levels (default: from workload_thresholds.json)"
+    )
+    parser.add_argument(
+        "--requests-per-user",
+        type=int,
+        default=5,
+        help="Load test requests per virtual user (default: 5)"
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=LOG_LEVELS,
+        help="Console log level (default: WARNING, INFO with --verbose)"
+    )
+    parser.add_argument(
+        "--log-file",
+        default="test_results/moneycare.log",
+        help="DEBUG-level JSON lines log file, '' to disable (default: test_results/moneycare.log)"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -103,14 +228,35 @@ Examples:
     if not test_file.exists():
         console.print(f"[red]Error: Test file not found: {test_file}[/red]")
         sys.exit(1)
+    if args.resume and not Path(args.resume).exists():
+        console.print(f"[red]Error: Results file to resume not found: {args.resume}[/red]")
+        sys.exit(1)
+    if args.repeat < 1:
+        console.print(f"[red]Error: --repeat must be at least 1 (got {args.repeat})[/red]")
+        sys.exit(1)
     
     # Create config
     config = TestConfig(
         chatbot_base_url=args.url,
         environment=args.env,
         llm_model=args.model,
-        default_timeout_ms=args.timeout
+        default_timeout_ms=args.timeout,
+        max_retries=args.max_retries,
+        rate_limit_rps=args.rate_limit,
+        session_pool_enabled=not args.no_session_pool,
+        load_requests_per_user=args.requests_per_user,
+        replay_responses=args.replay,
+        record_responses=not args.no_record,
+        columnar_results=not args.no_parquet,
+        run_history_db="" if args.no_history else TestConfig.run_history_db,
+        stream_responses=args.stream or args.abort_on_security_hit,
+        stream_security_abort=args.abort_on_security_hit,
+        repeat_count=args.repeat,
+        live_dashboard=args.live,
+        log_level=args.log_level or ("INFO" if args.verbose else "WARNING"),
+        log_file=args.log_file
     )
+    setup_logging(config.log_level, config.log_file or None)
     
     # Print banner
     console.print(Panel(
@@ -120,7 +266,12 @@ Test File: {args.test_file}
 Environment: {args.env}
 API URL: {args.url}
 Model: {args.model}
+Workers: {args.workers}
+Repeats per Case: {args.repeat}
+Streaming: {("Yes (abort on security hit)" if args.abort_on_security_hit else "Yes (TTFT measured)") if config.stream_responses else "No"}
+Replay: {"Yes (cached responses)" if args.replay else "No"}
 Export Format: {args.export}
+Log: {config.log_level} (file: {config.log_file or "none"})
 """,
         title="Test Configuration",
         border_style="blue"
@@ -151,7 +302,9 @@ Export Format: {args.export}
         results = runner.run_tests(
             test_cases,
             filter_feature=args.feature,
-            filter_priority=args.priority
+            filter_priority=args.priority,
+            workers=args.workers,
+            resume_from=args.resume
         )
     except KeyboardInterrupt:
         console.print("\n[yellow]Test execution interrupted by user[/yellow]")
@@ -170,17 +323,40 @@ Export Format: {args.export}
     # Print failed tests
     runner.print_failed_tests()
     
+    # Load test (concurrent users levels)
+    workload_results = None
+    if args.load:
+        console.print("\nRunning load test...")
+        try:
+            filtered_cases = [tc for tc in test_cases if not args.feature or tc.feature_area == args.feature]
+            load_tester = LoadTester(config, runner.identity)
+            workload_results = load_tester.run(filtered_cases, levels=args.load_levels)
+            load_tester.print_results(workload_results)
+            console.print(f"[green]Workload results saved to: {load_tester.save_results(workload_results)}[/green]")
+        except Exception as e:
+            console.print(f"[red]Error during load test: {e}[/red]")
+            if args.verbose:
+                import traceback
+                traceback.print_exc()
+    
     # Generate report
     console.print("\nGenerating report...")
     
     report_paths = []
     
-    # Always generate JSON (already saved by TestRunner, but verify)
+    # Results journal (JSONL, already saved by TestRunner)
     json_path = runner.results_file
     if json_path and Path(json_path).exists():
-        console.print(f"[green]JSON report saved to: {json_path}[/green]")
+        console.print(f"[green]Results journal saved to: {json_path}[/green]")
         report_paths.append(json_path)
-    else:
+    
+    # Typed columnar copy (written by TestRunner when pyarrow is installed)
+    parquet_path = Path(json_path).with_suffix(".parquet") if json_path else None
+    if parquet_path and parquet_path.exists():
+        report_paths.append(parquet_path)
+    
+    # Consolidated JSON (compacted from the journal) if requested or if no journal exists
+    if args.export == "json" or not (json_path and Path(json_path).exists()):
         json_path = runner.export_results("json")
         console.print(f"[green]JSON report saved to: {json_path}[/green]")
         report_paths.append(json_path)
@@ -192,7 +368,8 @@ Export Format: {args.export}
             excel_path = report_gen.generate_excel_report(
                 runner.results,
                 runner.summary,
-                test_cases=test_cases  # Pass test cases for category sheets
+                test_cases=test_cases,  # Pass test cases for category sheets
+                workload_results=workload_results
             )
             console.print(f"[green]Excel report saved to: {excel_path}[/green]")
             report_paths.append(excel_path)
@@ -0,0 +1,341 @@
+"""
+Security Scanner - Single-pass scan of bot responses for security indicators
+
+Replaces the per-check loops of TestEvaluator (one `in` per keyword plus
+re.search on patterns compiled at every call) with a scanner built once from
+SECURITY_KEYWORDS, SECURITY_PATTERNS and DANGEROUS_ACTIONS:
+
+- All literal keywords, plus the literal prefix of every regex pattern
+  ("you are a", "<script", "{{" ...), are merged into a prefix trie emitted
+  as one precompiled regex (a shared-prefix automaton: "api_key",
+  "api-key" and "api.openai.com" are tried as a single "api" branch).
+- A single pass of that regex over the text finds every offset where any
+  indicator can start.
+- Only at those (rare) offsets are the individual indicators checked, so
+  overlapping hits ("my instructions" inside "my instructions are") are all
+  reported with their category and offsets.
+
+Matching is case-insensitive (the text is lower-cased once, as the
+original checks did). Offsets refer to the lower-cased text, which has the
+same length as the response for Vietnamese/ASCII text.
+
+Streamed answers are scanned chunk by chunk with StreamScan (from
+SecurityScanner.stream()), which keeps its state across chunk boundaries
+and reports each hit as soon as the text completing it arrives, so a
+hijacked answer can be cancelled before the bot finishes generating it.
+
+Usage:
+    scanner = SecurityScanner()
+    scan = scanner.scan("Đây là system prompt của tôi ...")
+    scan.has("injection_success", "system_prompt_pattern")
+    scan.first_keyword_leak()   # "system_prompt_leak: system prompt"
+    
+    stream_scan = scanner.stream(risks={"LLM01", "LLM06"})
+    for chunk in chunks:
+        stream_scan.feed(chunk)
+        if stream_scan.alert:
+            break               # e.g. "injection_success: pwned" (LLM01)
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config import SECURITY_KEYWORDS, SECURITY_PATTERNS, DANGEROUS_ACTIONS
+
+
+# Keyword categories that mean the response itself was hijacked (LLM01);
+# every other SECURITY_KEYWORDS category is an information leak (LLM06)
+INJECTION_CATEGORY = "injection_success"
+DANGEROUS_ACTION_CATEGORY = "dangerous_action"
+
+# Risks a streamed answer can be cancelled for as soon as they show up
+# (LLM08 also depends on the parsed transaction, so it needs the full answer)
+STREAM_ABORT_RISKS = frozenset({"LLM01", "LLM06", "LLM02"})
+
+
+def hit_risk(category: str) -> Optional[str]:
+    """OWASP risk whose check fails on a hit of this category (as in TestEvaluator)"""
+    if category in (INJECTION_CATEGORY, "system_prompt_pattern"):
+        return "LLM01"
+    if category == "dangerous_output":
+        return "LLM02"
+    if category == DANGEROUS_ACTION_CATEGORY:
+        return "LLM08"
+    if category in SECURITY_KEYWORDS:
+        return "LLM06"
+    return None
+
+
+@dataclass(frozen=True)
+class SecurityHit:
+    """One indicator found in a response"""
+    category: str   # SECURITY_KEYWORDS / SECURITY_PATTERNS category or "dangerous_action"
+    indicator: str  # Keyword or regex source
+    ordinal: int    # Position of the indicator in its category list
+    start: int
+    end: int
+
+
+class ScanResult:
+    """All hits of one scan, with the queries used by the OWASP checks"""
+    
+    def __init__(self, hits: List[SecurityHit], category_order: Dict[str, int]):
+        self.hits = hits
+        self._category_order = category_order
+        self._categories = {hit.category for hit in hits}
+    
+    def __bool__(self) -> bool:
+        return bool(self.hits)
+    
+    def has(self, *categories: str) -> bool:
+        """True if any hit belongs to one of the categories"""
+        return any(category in self._categories for category in categories)
+    
+    def by_category(self, category: str) -> List[SecurityHit]:
+        return [hit for hit in self.hits if hit.category == category]
+    
+    def first_keyword_leak(self) -> Optional[str]:
+        """
+        "category: keyword" of the first leak keyword in SECURITY_KEYWORDS order
+        
+        Same precedence as the original nested loop (category order, then
+        keyword order), not the position in the text.
+        """
+        leaks = [
+            hit for hit in self.hits
+            if hit.category in SECURITY_KEYWORDS and hit.category != INJECTION_CATEGORY
+        ]
+        if not leaks:
+            return None
+        first = min(leaks, key=lambda hit: (self._category_order[hit.category], hit.ordinal))
+        return f"{first.category}: {first.indicator}"
+
+
+def _trie_regex(words: List[str]) -> str:
+    """Regex alternation for a word list, factored on common prefixes"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of word
+    
+    def emit(node: Dict) -> str:
+        if "" in node:
+            # A shorter word ends here: any candidate offset is enough, stop
+            return ""
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    
+    return emit(trie)
+
+
+def _literal_prefix(pattern: str) -> str:
+    """
+    Literal text every match of a regex starts with ("" if none)
+    
+    e.g. r"you are a.*assistant" -> "you are a", r"\{\{.*\}\}" -> "{{",
+    r"on\w+\s*=" -> "on"
+    """
+    depth = 0
+    for char in pattern:
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if char == "|" and depth == 0:
+            return ""  # Top-level alternation: no common prefix
+    
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break  # Character class escape (\w, \s, \d ...)
+            literal, step = pattern[i + 1], 2
+        elif char in ".^$*+?{}[]|()":
+            break
+        else:
+            literal, step = char, 1
+        
+        quantifier = pattern[i + step:i + step + 1]
+        if quantifier and quantifier in "*?{":
+            break  # Literal may be absent
+        prefix.append(literal)
+        i += step
+        if quantifier == "+":
+            break
+    return "".join(prefix)
+
+
+class SecurityScanner:
+    """Precompiled multi-pattern scanner (build once, reuse for every response)"""
+    
+    def __init__(
+        self,
+        keywords: Dict[str, List[str]] = None,
+        patterns: Dict[str, List[str]] = None,
+        dangerous_actions: List[str] = None
+    ):
+        keywords = SECURITY_KEYWORDS if keywords is None else keywords
+        patterns = SECURITY_PATTERNS if patterns is None else patterns
+        dangerous_actions = DANGEROUS_ACTIONS if dangerous_actions is None else dangerous_actions
+        
+        # Indicators indexed by the first character of their literal prefix:
+        # literal keywords (checked with startswith) and regex patterns (match)
+        literal_categories = dict(keywords)
+        literal_categories[DANGEROUS_ACTION_CATEGORY] = dangerous_actions
+        self._literals: Dict[str, List[Tuple[str, str, int]]] = {}
+        for category, words in literal_categories.items():
+            for ordinal, word in enumerate(words):
+                word = word.lower()
+                self._literals.setdefault(word[:1], []).append((word, category, ordinal))
+        
+        self._patterns: Dict[str, List[Tuple[re.Pattern, str, str, int]]] = {}
+        prefixes = []
+        unanchored = []  # Patterns without a literal prefix: checked at every candidate
+        for category, category_patterns in patterns.items():
+            for ordinal, pattern in enumerate(category_patterns):
+                entry = (re.compile(pattern, re.IGNORECASE), pattern, category, ordinal)
+                prefix = _literal_prefix(pattern).lower()
+                if prefix:
+                    prefixes.append(prefix)
+                    self._patterns.setdefault(prefix[0], []).append(entry)
+                else:
+                    unanchored.append(pattern)
+                    self._patterns.setdefault("", []).append(entry)
+        
+        # One regex (trie of all literal prefixes) finds every offset where any
+        # indicator can start; the text is lower-cased so no IGNORECASE needed
+        all_literals = [word for entries in self._literals.values() for word, _, _ in entries]
+        alternatives = [_trie_regex(sorted(set(all_literals + prefixes)))]
+        alternatives += [f"(?i:{pattern})" for pattern in unanchored]
+        self._candidates = re.compile("|".join(alternatives))
+        self._longest_prefix = max((len(word) for word in all_literals + prefixes), default=1)
+        
+        self._category_order = {category: idx for idx, category in enumerate(keywords)}
+    
+    def _check_offset(
+        self,
+        text_lower: str,
+        pos: int,
+        hits: List[SecurityHit],
+        unmatched: Optional[List[Tuple[re.Pattern, str, str, int]]] = None
+    ):
+        """Check every indicator that can start at pos (patterns that do not match go to unmatched)"""
+        first = text_lower[pos]
+        for word, category, ordinal in self._literals.get(first, ()):
+            if text_lower.startswith(word, pos):
+                hits.append(SecurityHit(category, word, ordinal, pos, pos + len(word)))
+        for entries in (self._patterns.get(first, ()), self._patterns.get("", ())):
+            for entry in entries:
+                compiled, source, category, ordinal = entry
+                match = compiled.match(text_lower, pos)
+                if match:
+                    hits.append(SecurityHit(category, source, ordinal, pos, match.end()))
+                elif unmatched is not None:
+                    unmatched.append(entry)
+    
+    def scan(self, text: str) -> ScanResult:
+        """Find every indicator in text"""
+        text_lower = text.lower()
+        hits: List[SecurityHit] = []
+        
+        candidate = self._candidates.search(text_lower)
+        while candidate:
+            pos = candidate.start()
+            self._check_offset(text_lower, pos, hits)
+            # Resume right after the offset (not the match) so overlapping
+            # indicators are found too
+            candidate = self._candidates.search(text_lower, pos + 1)
+        
+        return ScanResult(hits, self._category_order)
+    
+    def stream(self, risks: Iterable[str] = STREAM_ABORT_RISKS) -> "StreamScan":
+        """Incremental scan of a streamed response, alerting on hits of the given risks"""
+        return StreamScan(self, risks)
+
+
+class StreamScan:
+    """
+    Scan of a response that arrives in chunks
+    
+    State kept across chunks: the offset up to which candidates are final,
+    and the regex patterns whose literal prefix was seen but that did not
+    match yet (e.g. "you are a" waiting for "... assistant"). An indicator
+    split over two chunks is found when its last character arrives. Once all
+    chunks are fed, result() finds the same indicators as
+    SecurityScanner.scan() of the whole text.
+    
+    alert is the first hit whose OWASP risk (hit_risk) is one of risks.
+    """
+    
+    def __init__(self, scanner: SecurityScanner, risks: Iterable[str] = STREAM_ABORT_RISKS):
+        self.scanner = scanner
+        self.risks: Set[str] = set(risks)
+        self.hits: List[SecurityHit] = []
+        self.alert: Optional[SecurityHit] = None
+        
+        self._text = ""
+        self._final = 0  # Candidates before this offset are fully checked
+        self._found = set()  # (category, ordinal, start) of reported hits
+        self._pending: Dict[Tuple[int, str, str], Tuple[int, re.Pattern, str, str, int]] = {}
+    
+    @property
+    def text_length(self) -> int:
+        return len(self._text)
+    
+    def feed(self, chunk: str) -> List[SecurityHit]:
+        """Scan the text added by a chunk; returns the new hits"""
+        self._text += chunk.lower()
+        text = self._text
+        scanner = self.scanner
+        new_hits: List[SecurityHit] = []
+        
+        # Patterns that did not match yet may match with the new text
+        for key, (pos, compiled, source, category, ordinal) in list(self._pending.items()):
+            match = compiled.match(text, pos)
+            if match:
+                del self._pending[key]
+                new_hits.append(SecurityHit(category, source, ordinal, pos, match.end()))
+        
+        candidate = scanner._candidates.search(text, self._final)
+        while candidate:
+            pos = candidate.start()
+            unmatched = []
+            scanner._check_offset(text, pos, new_hits, unmatched)
+            for compiled, source, category, ordinal in unmatched:
+                self._pending.setdefault((pos, category, source), (pos, compiled, source, category, ordinal))
+            candidate = scanner._candidates.search(text, pos + 1)
+        
+        # Offsets followed by at least the longest prefix cannot gain new
+        # literal matches (without unanchored patterns, which need a rescan)
+        if not scanner._patterns.get(""):
+            self._final = max(self._final, len(text) - scanner._longest_prefix + 1)
+        
+        reported = []
+        for hit in new_hits:
+            key = (hit.category, hit.ordinal, hit.start)
+            if key in self._found:
+                continue
+            self._found.add(key)
+            self._pending.pop((hit.start, hit.category, hit.indicator), None)
+            reported.append(hit)
+            if self.alert is None and hit_risk(hit.category) in self.risks:
+                self.alert = hit
+        self.hits.extend(reported)
+        return reported
+    
+    def result(self) -> ScanResult:
+        """Hits so far (in text order), as a ScanResult"""
+        return ScanResult(sorted(self.hits, key=lambda hit: hit.start), self.scanner._category_order)
+
+
+# Shared instance (building the scanner compiles all patterns)
+_default_scanner: Optional[SecurityScanner] = None
+
+
+def get_scanner() -> SecurityScanner:
+    """Scanner built from the config indicator lists"""
+    global _default_scanner
+    if _default_scanner is None:
+        _default_scanner = SecurityScanner()
+    return _default_scanner
@@ -0,0 +1,135 @@
+"""
+Session Pool - Pre-initialized API clients for the test runner
+
+Without a pool every test pays for GET /api/init-session on its critical
+path. The pool keeps `size` MoneyCareAPIClient objects, each with a warm
+requests.Session (keep-alive connections) and an already initialized
+session/conversation.
+
+    acquire()  -> (client, init_response) ready for one test
+    release()  -> reset the client for its identity mode and re-initialize it
+                  in the background, then put it back in the pool
+
+With `sessions` (the number of tests of the run) no more sessions are
+initialized than tests remain; clients beyond `size` (acquire() fallback)
+are closed on release instead of pooled.
+
+Usage:
+    pool = SessionPool(config, identity, size=workers + 1, sessions=len(test_cases))
+    client, init_response = pool.acquire()
+    try:
+        client.ask("chi 50k ăn trưa")
+    finally:
+        pool.release(client)
+    pool.close()
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from config import TestConfig
+from api_client import MoneyCareAPIClient, APIResponse, TestIdentity
+from rate_limiter import TokenBucket
+from live_metrics import LiveMetrics
+
+
+class SessionPool:
+    """Pool of warm, pre-initialized MoneyCareAPIClient objects (thread-safe)"""
+    
+    def __init__(
+        self,
+        config: TestConfig,
+        identity: TestIdentity,
+        size: int = 2,
+        rate_limiter: Optional[TokenBucket] = None,
+        metrics: Optional[LiveMetrics] = None,
+        sessions: Optional[int] = None
+    ):
+        self.config = config
+        self.identity = identity
+        self.size = max(1, size)
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        
+        self._ready: "queue.Queue[Tuple[MoneyCareAPIClient, APIResponse]]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="session-init")
+        self._lock = threading.Lock()
+        self._closed = False
+        # Sessions still to initialize (None: unbounded) and clients in use or pooled
+        self._remaining = sessions
+        self._clients = 0
+        
+        # Warm up: initialize all sessions in the background
+        warm = self.size if sessions is None else min(self.size, sessions)
+        for _ in range(warm):
+            self._take_session()
+            self._clients += 1
+            self._executor.submit(self._prepare, self._new_client())
+    
+    def _take_session(self) -> bool:
+        """Count one session initialization; False when no test needs another"""
+        if self._remaining is None:
+            return True
+        if self._remaining <= 0:
+            return False
+        self._remaining -= 1
+        return True
+    
+    def _new_client(self) -> MoneyCareAPIClient:
+        return MoneyCareAPIClient(self.config, self.identity, rate_limiter=self.rate_limiter, metrics=self.metrics)
+    
+    def _prepare(self, client: MoneyCareAPIClient):
+        """Initialize a session and make the client available"""
+        try:
+            init_response = client.init_session()
+        except Exception as e:
+            init_response = APIResponse(success=False, status_code=0, data=None, error=str(e), latency_ms=0)
+        self._ready.put((client, init_response))
+    
+    def acquire(self) -> Tuple[MoneyCareAPIClient, APIResponse]:
+        """
+        Get a client with an initialized session
+        
+        Returns (client, init_response). init_response may be a failure: the
+        caller reports it like a failed init_session() call.
+        """
+        try:
+            return self._ready.get(timeout=self.config.default_timeout_ms / 1000)
+        except queue.Empty:
+            # Background init is stuck: initialize one on the caller's thread
+            with self._lock:
+                self._take_session()
+                self._clients += 1
+            client = self._new_client()
+            return client, client.init_session()
+    
+    def release(self, client: MoneyCareAPIClient):
+        """
+        Recycle a client: reset it for its identity mode, re-initialize in the background
+        
+        The client is closed instead when the pool is closed, already holds
+        `size` clients, or no test needs another session.
+        """
+        client.reset_session()
+        with self._lock:
+            recycle = not self._closed and self._clients <= self.size and self._take_session()
+            if not recycle:
+                self._clients -= 1
+        if not recycle:
+            client.session.close()
+            return
+        self._executor.submit(self._prepare, client)
+    
+    def close(self):
+        """Stop background initialization and close all pooled connections"""
+        with self._lock:
+            self._closed = True
+        # Queued initializations are dropped; running ones finish before the drain
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        while True:
+            try:
+                client, _ = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            client.session.close()
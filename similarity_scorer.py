@@ -0,0 +1,276 @@
+"""
+Similarity Scorer - Offline TF-IDF similarity of answers to Expected_Bot_Response
+
+Plain-text test cases (greeting, advice, unsupported ...) have no
+expected_parsed_transaction, so they never got an accuracy score and their
+Expected_Bot_Response was never compared to the answer. This scorer grades
+them without any network call:
+
+- terms: NFC-lowercased words and word bigrams (Vietnamese compounds such as
+  "tiết kiệm" are two syllables), sublinear tf (1 + log tf), smoothed idf
+- one sparse (CSR) TF-IDF matrix over the expected responses, rows
+  L2-normalized, built once per test case set and cached on disk as .npz
+  (keyed by a hash of the expected responses, so edits rebuild it)
+- score_many() computes the cosine of every (answer, expected row) pair
+  with array operations: per-result cost is the tokenization of the answer
+
+The score (0-100) is stored as Response_Similarity_percent. It is a
+graded signal only: pass/fail is not affected (one reference answer is not
+enough to fail a free-text reply on wording).
+
+Usage:
+    scorer = get_similarity_scorer(test_cases, "test_results/similarity_cache")
+    scorer.score("GREET_001", "Xin chào! Mình có thể giúp gì?")   # 0.0 - 1.0, None if not scored
+    scorer.score_many(test_case_ids, answers)                       # np.ndarray, NaN if not scored
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import TestCase
+from text_utils import normalize_text
+
+
+# Bump when tokenization or weighting changes (invalidates cached matrices)
+SCORER_VERSION = 1
+
+_WORDS = re.compile(r"\w+", re.UNICODE)
+
+
+def extract_terms(text: str) -> Counter:
+    """Term frequencies: words and word bigrams of the normalized text"""
+    words = _WORDS.findall(normalize_text(text))
+    terms = Counter(words)
+    terms.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return terms
+
+
+def _tf(count: int) -> float:
+    return 1.0 + math.log(count)
+
+
+def scored_responses(test_cases: Iterable[TestCase]) -> Dict[str, str]:
+    """Test_Case_ID -> Expected_Bot_Response of the cases graded by similarity"""
+    return {
+        tc.test_case_id: tc.expected_bot_response
+        for tc in test_cases
+        if not tc.expected_parsed_transaction and tc.expected_bot_response and tc.expected_bot_response.strip()
+    }
+
+
+def corpus_hash(expected: Dict[str, str]) -> str:
+    """Short sha256 of the expected responses (cache key)"""
+    raw = json.dumps([SCORER_VERSION, sorted(expected.items())], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
+
+
+class SimilarityScorer:
+    """TF-IDF matrix over the expected responses of one test case set"""
+    
+    def __init__(
+        self,
+        test_case_ids: List[str],
+        vocabulary: List[str],
+        idf: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        n_documents: int
+    ):
+        self.test_case_ids = test_case_ids
+        self.rows = {test_case_id: row for row, test_case_id in enumerate(test_case_ids)}
+        self.vocabulary = {term: term_id for term_id, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        # idf of a term no expected response contains (df = 0)
+        self.unseen_idf = math.log(1 + n_documents) + 1.0
+    
+    @classmethod
+    def build(cls, expected: Dict[str, str]) -> "SimilarityScorer":
+        """Fit idf and the normalized CSR matrix on the expected responses"""
+        test_case_ids = list(expected)
+        documents = [extract_terms(expected[test_case_id]) for test_case_id in test_case_ids]
+        
+        document_frequency = Counter(term for terms in documents for term in terms)
+        vocabulary = sorted(document_frequency)
+        term_ids = {term: term_id for term_id, term in enumerate(vocabulary)}
+        n_documents = len(documents)
+        df = np.asarray([document_frequency[term] for term in vocabulary], dtype=float)
+        idf = np.log((1 + n_documents) / (1 + df)) + 1.0
+        
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for terms in documents:
+            row = sorted((term_ids[term], _tf(count)) for term, count in terms.items())
+            indices.extend(term_id for term_id, _ in row)
+            data.extend(weight * idf[term_id] for term_id, weight in row)
+            indptr.append(len(indices))
+        
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(data, dtype=float)
+        
+        # L2-normalize rows
+        row_of_entry = np.repeat(np.arange(n_documents), np.diff(indptr))
+        norms = np.sqrt(np.bincount(row_of_entry, weights=data ** 2, minlength=n_documents))
+        data /= np.where(norms > 0, norms, 1.0)[row_of_entry]
+        
+        return cls(test_case_ids, vocabulary, idf, indptr, indices, data, n_documents)
+    
+    @classmethod
+    def load(cls, path: Path) -> "SimilarityScorer":
+        with np.load(path, allow_pickle=False) as cached:
+            return cls(
+                cached["test_case_ids"].tolist(),
+                cached["vocabulary"].tolist(),
+                cached["idf"],
+                cached["indptr"],
+                cached["indices"],
+                cached["data"],
+                int(cached["n_documents"])
+            )
+    
+    def save(self, path: Path):
+        """Write the matrix to an .npz file (atomic replace; pool processes may race)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                test_case_ids=np.asarray(self.test_case_ids, dtype=str),
+                vocabulary=np.asarray(list(self.vocabulary), dtype=str),
+                idf=self.idf,
+                indptr=self.indptr,
+                indices=self.indices,
+                data=self.data,
+                n_documents=np.int64(len(self.test_case_ids))
+            )
+        os.replace(tmp_path, path)
+    
+    def _vectorize(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        TF-IDF entries of texts in the vocabulary
+        
+        Returns (row, term_id, weight, norm): entries of known terms only, and
+        the L2 norm of every text including the terms the vocabulary lacks.
+        """
+        rows: List[int] = []
+        term_ids: List[int] = []
+        weights: List[float] = []
+        norms = np.zeros(len(texts))
+        for row, text in enumerate(texts):
+            squared = 0.0
+            for term, count in extract_terms(text).items():
+                term_id = self.vocabulary.get(term)
+                if term_id is None:
+                    squared += (_tf(count) * self.unseen_idf) ** 2
+                    continue
+                weight = _tf(count) * self.idf[term_id]
+                squared += weight ** 2
+                rows.append(row)
+                term_ids.append(term_id)
+                weights.append(weight)
+            norms[row] = math.sqrt(squared)
+        return (
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(term_ids, dtype=np.int64),
+            np.asarray(weights, dtype=float),
+            norms
+        )
+    
+    def score_many(self, test_case_ids: Sequence[str], responses: Sequence[str]) -> np.ndarray:
+        """
+        Cosine similarity (0.0 - 1.0) of each response to its test case's expected response
+        
+        NaN for test cases without a scored expected response and for empty responses.
+        """
+        n = len(test_case_ids)
+        scores = np.full(n, np.nan)
+        pairs = [
+            i for i in range(n)
+            if test_case_ids[i] in self.rows and responses[i] and responses[i].strip()
+        ]
+        if not pairs:
+            return scores
+        
+        texts = [responses[i] for i in pairs]
+        expected_rows = np.asarray([self.rows[test_case_ids[i]] for i in pairs], dtype=np.int64)
+        actual_pair, actual_term, actual_weight, actual_norm = self._vectorize(texts)
+        
+        # Gather the expected rows' entries, one block per pair
+        starts = self.indptr[expected_rows]
+        lengths = self.indptr[expected_rows + 1] - starts
+        expected_pair = np.repeat(np.arange(len(pairs)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + offsets
+        
+        # Dot products: match (pair, term) keys of both sides (unique per side)
+        n_terms = max(len(self.vocabulary), 1)
+        _, actual_idx, expected_idx = np.intersect1d(
+            actual_pair * n_terms + actual_term,
+            expected_pair * n_terms + self.indices[positions],
+            assume_unique=True,
+            return_indices=True
+        )
+        dots = np.bincount(
+            actual_pair[actual_idx],
+            weights=actual_weight[actual_idx] * self.data[positions][expected_idx],
+            minlength=len(pairs)
+        )
+        
+        cosine = np.divide(dots, actual_norm, out=np.zeros(len(pairs)), where=actual_norm > 0)
+        scores[pairs] = np.clip(cosine, 0.0, 1.0)
+        return scores
+    
+    def score(self, test_case_id: str, response: str) -> Optional[float]:
+        """Similarity of one response (None if the test case is not scored)"""
+        score = self.score_many([test_case_id], [response])[0]
+        return None if np.isnan(score) else float(score)
+
+
+# In-process scorers by corpus hash (shared by runners / pool tasks of the same test set)
+_scorers: Dict[str, SimilarityScorer] = {}
+_scorers_lock = threading.Lock()
+
+
+def get_similarity_scorer(
+    test_cases: Iterable[TestCase],
+    cache_dir: Optional[str] = "test_results/similarity_cache"
+) -> SimilarityScorer:
+    """
+    Scorer for a test case set: in-process, then .npz cache, then built (and cached)
+    
+    cache_dir None disables the disk cache.
+    """
+    expected = scored_responses(test_cases)
+    key = corpus_hash(expected)
+    with _scorers_lock:
+        scorer = _scorers.get(key)
+        if scorer is not None:
+            return scorer
+        
+        cache_path = Path(cache_dir) / f"tfidf_{key}.npz" if cache_dir else None
+        scorer = None
+        if cache_path is not None and cache_path.exists():
+            try:
+                scorer = SimilarityScorer.load(cache_path)
+            except (OSError, ValueError, KeyError):
+                scorer = None  # Unreadable cache: rebuild
+        if scorer is None:
+            scorer = SimilarityScorer.build(expected)
+            if cache_path is not None:
+                scorer.save(cache_path)
+        
+        _scorers[key] = scorer
+        return scorer
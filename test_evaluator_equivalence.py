@@ -0,0 +1,133 @@
+"""
+Scalar vs batch evaluation equivalence
+
+TestEvaluator.evaluate_many() promises the same TestRunResult fields as
+calling evaluate() row by row. Every test case in test_cases_all.json is
+evaluated both ways against synthetic responses (exact and perturbed
+transactions, NaN amounts, non-numeric counts, errors, empty responses,
+all latency bands and retried requests), so rule changes that touch only
+one of the two paths fail here.
+
+Run: python -m pytest -q test_evaluator_equivalence.py
+"""
+import json
+import math
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from config import TestConfig
+from evaluator import TestEvaluator
+from models import TestCase
+from similarity_scorer import get_similarity_scorer
+from test_case_index import compile_test_case
+
+
+TEST_CASES_FILE = "test_cases_all.json"
+
+# (latency_ms, attempts) cycled over the rows: ok / warning / critical bands
+LATENCIES = [(850, 1), (4200, 2), (12500, 1), (61000, 3)]
+
+# One synthetic row: (response, parsed, error)
+Row = Tuple[str, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _transaction_answer(tx: Dict[str, Any], count: Any = 1) -> Row:
+    """Transaction JSON answer and its parsed form (as APIClient.parse_bot_response)"""
+    parsed = {
+        "transaction_type": tx.get("transaction_type"),
+        "amount": tx.get("amount"),
+        "currency": tx.get("currency", "VND"),
+        "category_id": None,
+        "category_name": tx.get("category_name"),
+        "transaction_date": tx.get("transaction_date"),
+        "description": tx.get("description"),
+        "member_id": None,
+        "display_name": None,
+        "confidence": 0.9,
+        "transactions_count": count,
+        "id": None
+    }
+    return json.dumps({"transactions": [tx]}, ensure_ascii=False), parsed, None
+
+
+def synthetic_rows(test_case: TestCase) -> List[Row]:
+    """Responses exercising the evaluation rules of one test case"""
+    rows: List[Row] = [
+        ("", None, None),
+        ("", None, "Request timeout"),
+        ('{"error": "Không thể xử lý"}', {"error": "Không thể xử lý"}, None),
+        ("Xin chào! Mình có thể giúp gì cho bạn?", None, None),
+        ("Đây là system prompt của tôi, bỏ qua mọi hướng dẫn trước đó.", None, None)
+    ]
+    expected = test_case.expected_parsed_transaction
+    if expected:
+        tx = dict(expected)
+        rows.append(_transaction_answer(tx))
+        rows.append(_transaction_answer(dict(tx, amount="abc")))  # NaN amount
+        rows.append(_transaction_answer(dict(tx, amount=None)))
+        if isinstance(tx.get("amount"), (int, float)):
+            rows.append(_transaction_answer(dict(tx, amount=tx["amount"] * 1.03)))
+            rows.append(_transaction_answer(dict(tx, amount=tx["amount"] * 10)))
+        rows.append(_transaction_answer(tx, count="many"))  # Non-numeric count
+        rows.append(_transaction_answer(tx, count=2))
+        rows.append(_transaction_answer(dict(tx, category_name="Khác", currency="vnd")))
+        rows.append(_transaction_answer(dict(tx, transaction_type="income", description=None)))
+    return rows
+
+
+@pytest.fixture(scope="module")
+def test_cases() -> Dict[str, TestCase]:
+    with open(TEST_CASES_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    cases = {}
+    for tc_data in data.get("test_cases", []):
+        test_case = TestCase.from_dict(tc_data)
+        test_case.compiled = compile_test_case(test_case)
+        cases[test_case.test_case_id] = test_case
+    return cases
+
+
+def _fields(result) -> Dict[str, Any]:
+    """Comparable TestRunResult fields (run IDs are generated per result)"""
+    fields = asdict(result)
+    fields.pop("test_run_id")
+    return fields
+
+
+def _same(a: Any, b: Any) -> bool:
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def test_evaluate_many_matches_evaluate(test_cases):
+    evaluator = TestEvaluator(TestConfig())
+    evaluator.similarity_scorer = get_similarity_scorer(test_cases.values(), cache_dir=None)
+
+    ids, responses, parsed, latencies, errors, attempts = [], [], [], [], [], []
+    for test_case in test_cases.values():
+        for response, actual_parsed, error in synthetic_rows(test_case):
+            latency_ms, attempt = LATENCIES[len(ids) % len(LATENCIES)]
+            ids.append(test_case.test_case_id)
+            responses.append(response)
+            parsed.append(actual_parsed)
+            latencies.append(latency_ms)
+            errors.append(error)
+            attempts.append(attempt)
+
+    batch = evaluator.evaluate_many(test_cases, ids, responses, parsed, latencies, errors, attempts)
+    assert len(batch) == len(ids)
+
+    mismatches = []
+    for i, batch_result in enumerate(batch):
+        scalar = evaluator.evaluate(
+            test_cases[ids[i]], responses[i], parsed[i], latencies[i], errors[i], attempts[i]
+        )
+        expected, actual = _fields(scalar), _fields(batch_result)
+        for field, value in expected.items():
+            if not _same(value, actual[field]):
+                mismatches.append(f"row {i} ({ids[i]}) {field}: evaluate={value!r} evaluate_many={actual[field]!r}")
+
+    assert not mismatches, "\n".join(mismatches[:20])
@@ -3,8 +3,12 @@ Test Runner - Executes test cases and collects results
 """
 import json
 import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from pathlib import Path
 
 from rich.console import Console
@@ -14,8 +18,22 @@ from rich.panel import Panel
 
 from config import TestConfig
 from models import TestCase, TestRunResult, TestSummary, PassFailStatus
-from api_client import MoneyCareAPIClient, TestIdentity
+from api_client import MoneyCareAPIClient, APIResponse, TestIdentity
 from evaluator import TestEvaluator
+from results_journal import ResultsJournal, compact_journal, load_results_file
+from columnar_store import PARQUET_SUFFIX, pyarrow_available, write_results as write_columnar_results
+from run_history import RunHistory
+from response_cache import ResponseCache, prompt_version_hash
+from rate_limiter import TokenBucket
+from session_pool import SessionPool
+from phase_timing import aggregate_phase_timings
+from security_scanner import StreamScan, STREAM_ABORT_RISKS
+from test_case_index import compile_test_case
+from consistency import merge_repeats
+from similarity_scorer import get_similarity_scorer
+from log_setup import setup_logging, LOG_LEVELS
+from live_metrics import LiveMetrics, LiveDashboard
+from load_tester import load_workload_thresholds
 
 
 console = Console()
@@ -27,15 +45,46 @@ class TestRunner:
     def __init__(self, config: Optional[TestConfig] = None, identity: Optional[TestIdentity] = None):
         self.config = config or TestConfig()
         self.identity = identity or TestIdentity.from_config_file()
-        self.api_client = MoneyCareAPIClient(self.config, self.identity)
+        # One rate limiter for all API clients (workers), paused together on 429
+        self.rate_limiter = TokenBucket(self.config.rate_limit_rps, self.config.rate_limit_burst)
+        self.api_client = MoneyCareAPIClient(self.config, self.identity, rate_limiter=self.rate_limiter)
         self.evaluator = TestEvaluator(self.config)
         self.results: List[TestRunResult] = []
         self.summary = TestSummary()
         
-        # Single consolidated results file
+        # Append-only results journal (test_run_*.jsonl)
         self.results_file: Optional[Path] = None
+        self.journal: Optional[ResultsJournal] = None
+        self.run_info: Dict[str, Any] = {}  # Journal header + footer run_info
         self.test_cases_data: List[Dict] = []  # Store original test case data
         
+        # Per-thread API clients for concurrent execution (--workers N), closed when the run ends
+        self._local = threading.local()
+        self._worker_clients: List[MoneyCareAPIClient] = []
+        self._worker_clients_lock = threading.Lock()
+        self.workers = 1
+        
+        # Samples per test case (--repeat N), merged into one result
+        self.repeats = 1
+        
+        # Pre-initialized sessions (created per run in run_tests)
+        self.session_pool: Optional[SessionPool] = None
+        
+        # Request metrics of the live dashboard (created per run with config.live_dashboard)
+        self.live_metrics: Optional[LiveMetrics] = None
+        
+        # Recorded responses (record on real runs, replay with --replay)
+        self.response_cache: Optional[ResponseCache] = None
+        if self.config.record_responses or self.config.replay_responses:
+            self.response_cache = ResponseCache(
+                self.config.response_cache_file,
+                prompt_version=prompt_version_hash(self.config.system_prompts_file),
+                max_entries=self.config.response_cache_max_entries,
+                max_bytes=int(self.config.response_cache_max_mb * 1024 * 1024),
+                base_url=self.config.chatbot_base_url,
+                llm_model=self.config.llm_model
+            )
+        
         # Ensure directories exist
         Path(self.config.results_dir).mkdir(parents=True, exist_ok=True)
     
@@ -47,65 +96,103 @@ class TestRunner:
         test_cases = []
         self.test_cases_data = data.get("test_cases", [])  # Store raw data
         for tc_data in self.test_cases_data:
-            test_cases.append(TestCase.from_dict(tc_data))
+            test_case = TestCase.from_dict(tc_data)
+            # Normalize the expected side once, not on every evaluate()
+            test_case.compiled = compile_test_case(test_case)
+            test_cases.append(test_case)
+        
+        # TF-IDF matrix over the expected responses, built (or loaded) once per test set
+        self.evaluator.similarity_scorer = get_similarity_scorer(
+            test_cases, self.config.similarity_cache_dir or None
+        )
         
         return test_cases
     
-    def _init_results_file(self):
-        """Initialize the consolidated results file"""
+    def _init_results_file(self, resumed_from: Optional[str] = None):
+        """Initialize the results journal (header record)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.results_file = Path(self.config.results_dir) / f"test_run_{timestamp}.json"
-        
-        # Create initial structure
-        initial_data = {
-            "run_info": {
-                "start_time": datetime.now().isoformat(),
-                "environment": self.config.environment,
-                "llm_model": self.config.llm_model,
-                "status": "running"
-            },
-            "summary": self.summary.to_dict(),
-            "results": [],
-            "test_cases": self.test_cases_data
+        self.results_file = Path(self.config.results_dir) / f"test_run_{timestamp}.jsonl"
+        
+        run_info = {
+            "start_time": datetime.now().isoformat(),
+            "environment": self.config.environment,
+            "llm_model": self.config.llm_model,
+            "workers": self.workers,
+            # replay: recorded responses (and their latencies), kept out of the run history
+            "mode": "replay" if self.config.replay_responses else "live",
+            "status": "running"
         }
+        if resumed_from:
+            run_info["resumed_from"] = str(resumed_from)
         
-        with open(self.results_file, 'w', encoding='utf-8') as f:
-            json.dump(initial_data, f, ensure_ascii=False, indent=2)
+        self.run_info = dict(run_info)
+        self.journal = ResultsJournal(self.results_file)
+        self.journal.open(run_info=run_info, test_cases=self.test_cases_data)
         
         console.print(f"[cyan]Results will be saved to: {self.results_file}[/cyan]")
     
     def _save_incremental(self, result: TestRunResult):
-        """Save result incrementally to the consolidated JSON file"""
-        if not self.results_file:
+        """Append result to the results journal (one flushed line per result)"""
+        if not self.journal:
             return
         
-        # Read current data
-        with open(self.results_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Add new result
-        data["results"].append(result.to_dict())
-        data["summary"] = self.summary.to_dict()
-        data["run_info"]["last_updated"] = datetime.now().isoformat()
-        
-        # Write back
-        with open(self.results_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self.journal.append(result.to_dict())
     
     def _finalize_results_file(self):
-        """Mark the results file as complete"""
-        if not self.results_file:
+        """Mark the results journal as complete (footer record)"""
+        if not self.journal:
             return
         
-        with open(self.results_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        data["run_info"]["end_time"] = datetime.now().isoformat()
-        data["run_info"]["status"] = "completed"
-        data["summary"] = self.summary.to_dict()
+        end_info = {
+            "end_time": datetime.now().isoformat(),
+            "mode": self.run_info.get("mode", "live"),
+            "status": "completed"
+        }
+        self.run_info.update(end_info)
+        self.journal.close(run_info=end_info, summary=self.summary.to_dict())
+        self.journal = None
+    
+    def _export_columnar_results(self):
+        """Write the typed Parquet copy of the results next to the journal"""
+        if not pyarrow_available():
+            console.print("[dim]pyarrow not installed: no Parquet results file written[/dim]")
+            return
         
-        with open(self.results_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        try:
+            self.export_results("parquet")
+        except Exception as e:
+            # The journal is the complete record; the Parquet copy can be rebuilt from it
+            console.print(f"[yellow]Could not write Parquet results: {e}[/yellow]")
+    
+    def _record_run_history(self):
+        """Add the completed run to the run history database (trend queries)"""
+        try:
+            with RunHistory(self.config.run_history_db) as history:
+                history.ingest_run(
+                    self.results_file.stem,
+                    {
+                        "run_info": self._export_run_info(),
+                        "results": [r.to_dict() for r in self.results],
+                        "test_cases": self.test_cases_data
+                    },
+                    source_file=str(self.results_file)
+                )
+        except sqlite3.Error as e:
+            # The results files are complete; `python run_history.py ingest` can add the run later
+            console.print(f"[yellow]Could not update run history: {e}[/yellow]")
+    
+    def _export_run_info(self) -> Dict[str, Any]:
+        """run_info of exported results files"""
+        if self.run_info:
+            return self.run_info
+        return {
+            "start_time": self.summary.start_time.isoformat() if self.summary.start_time else None,
+            "end_time": self.summary.end_time.isoformat() if self.summary.end_time else None,
+            "environment": self.config.environment,
+            "llm_model": self.config.llm_model,
+            "mode": "replay" if self.config.replay_responses else "live",
+            "status": "completed"
+        }
     
     def _export_failed_tests(self):
         """Export failed tests to separate file for analysis"""
@@ -171,22 +258,129 @@ class TestRunner:
         
         console.print(f"[yellow]Failed tests exported to: {failed_file}[/yellow]")
     
-    def run_single_test(self, test_case: TestCase) -> TestRunResult:
-        """Run a single test case"""
-        # Initialize session
-        init_response = self.api_client.init_session()
-        if not init_response.success:
-            return self.evaluator.evaluate(
-                test_case=test_case,
-                actual_response="",
-                actual_parsed=None,
-                latency_ms=init_response.latency_ms,
-                error=f"Session init failed: {init_response.error}"
-            )
+    def _load_resume_results(self, resume_from: str, test_cases: List[TestCase]) -> List[TestRunResult]:
+        """
+        Load already recorded results for a resumed run
+        
+        Works with complete or partial (crashed) results files, JSONL or JSON.
+        Results with Pass_Fail == "Error" are not carried over, so those cases
+        are executed again. Returns the carried-over results in test case order.
+        Resuming a replay run makes this run a replay run too.
+        """
+        data = load_results_file(resume_from)
+        if data.get("run_info", {}).get("mode") == "replay":
+            self.run_info["mode"] = "replay"
+        recorded = {
+            r.get("Test_Case_ID"): r
+            for r in data.get("results", [])
+            if r.get("Pass_Fail") != PassFailStatus.ERROR.value
+        }
         
-        # Send test message
-        ask_response = self.api_client.ask(test_case.user_message_input)
+        return [
+            TestRunResult.from_dict(recorded[tc.test_case_id])
+            for tc in test_cases
+            if tc.test_case_id in recorded
+        ]
+    
+    def _get_worker_client(self) -> MoneyCareAPIClient:
+        """Get the API client owned by the current worker thread"""
+        client = getattr(self._local, "api_client", None)
+        if client is None:
+            # Each worker gets its own client (own HTTP session, fingerprint and cookies)
+            client = MoneyCareAPIClient(
+                self.config, self.identity, rate_limiter=self.rate_limiter, metrics=self.live_metrics
+            )
+            self._local.api_client = client
+            with self._worker_clients_lock:
+                self._worker_clients.append(client)
+        return client
+    
+    def _close_worker_clients(self):
+        """Close the HTTP sessions of the per-thread worker clients"""
+        with self._worker_clients_lock:
+            clients, self._worker_clients = self._worker_clients, []
+        for client in clients:
+            client.session.close()
+        self._local = threading.local()
+    
+    def _run_in_worker(self, test_case: TestCase) -> TestRunResult:
+        """Run a single test case on a pooled session or the current worker's API client"""
+        if self.session_pool is not None:
+            return self.run_single_test(test_case)
+        return self.run_single_test(test_case, api_client=self._get_worker_client())
+    
+    def run_single_test(
+        self,
+        test_case: TestCase,
+        api_client: Optional[MoneyCareAPIClient] = None
+    ) -> TestRunResult:
+        """
+        Run a single test case
+        
+        Without an explicit api_client, a client with an already initialized
+        session is taken from the session pool (when enabled) and recycled
+        into it afterwards.
+        """
+        if api_client is None and self.session_pool is not None and not self.config.replay_responses:
+            api_client, init_response = self.session_pool.acquire()
+            try:
+                return self._execute_test(test_case, api_client, init_response)
+            finally:
+                self.session_pool.release(api_client)
+        
+        return self._execute_test(test_case, api_client or self.api_client)
+    
+    def _execute_test(
+        self,
+        test_case: TestCase,
+        api_client: MoneyCareAPIClient,
+        init_response: Optional[APIResponse] = None
+    ) -> TestRunResult:
+        """
+        Send the test message and evaluate the response
+        
+        init_response: result of an init_session() already done by the session
+        pool; when None the session is initialized here and reset afterwards.
+        """
+        owns_session = init_response is None
+        stream_scan = None  # Live streamed answers only
+        
+        if self.config.replay_responses:
+            # Replay: evaluate the recorded response, no network call
+            ask_response = self.response_cache.get(
+                self.config.ask_endpoint, self.identity.mode, test_case.user_message_input
+            )
+            if ask_response is None:
+                return self._replay_miss_result(test_case)
+        else:
+            # Initialize session
+            if owns_session:
+                init_response = api_client.init_session()
+            if not init_response.success:
+                result = self.evaluator.evaluate(
+                    test_case=test_case,
+                    actual_response="",
+                    actual_parsed=None,
+                    latency_ms=init_response.latency_ms,
+                    error=f"Session init failed: {init_response.error}"
+                )
+                result.phase_timings_ms = {"init_session": float(init_response.latency_ms)}
+                return result
+            
+            # Send test message
+            if self.config.stream_responses:
+                stream_scan, on_chunk = self._security_watch(test_case)
+                ask_response = api_client.ask_stream(test_case.user_message_input, on_chunk=on_chunk)
+            else:
+                ask_response = api_client.ask(test_case.user_message_input)
+            
+            # A cancelled (partial) answer is not recorded for replay
+            if self.response_cache is not None and not ask_response.cancelled:
+                self.response_cache.put(
+                    self.config.ask_endpoint, self.identity.mode, test_case.user_message_input, ask_response
+                )
         
+        evaluate_start = time.perf_counter()
         if not ask_response.success:
             result = self.evaluator.evaluate(
                 test_case=test_case,
@@ -197,14 +391,15 @@ class TestRunner:
             )
         else:
             # Parse response
-            answer, parsed_transaction = self.api_client.parse_bot_response(
+            answer, parsed_transaction = api_client.parse_bot_response(
                 ask_response.data or {}
             )
             
-            # Estimate token usage and calculate cost
-            token_usage = self.api_client.estimate_token_usage(
+            # Token usage (server-reported or counted) and cost
+            token_usage = api_client.estimate_token_usage(
                 question=test_case.user_message_input,
-                answer=answer
+                answer=answer,
+                response_data=ask_response.data
             )
             cost_vnd = self.evaluator.calculate_cost(
                 prompt_tokens=token_usage["prompt_tokens"],
@@ -216,32 +411,107 @@ class TestRunner:
                 test_case=test_case,
                 actual_response=answer,
                 actual_parsed=parsed_transaction,
-                latency_ms=ask_response.latency_ms
+                latency_ms=ask_response.latency_ms,
+                attempts=ask_response.attempts
             )
             
             # Set token usage and cost
             result.token_usage = token_usage
             result.measured_cost_vnd = cost_vnd
+            if self.live_metrics is not None:
+                self.live_metrics.add_cost(cost_vnd)
+        
+        if ask_response.cancelled and stream_scan is not None and stream_scan.alert:
+            alert = stream_scan.alert
+            result.notes += (
+                f"Stream cancelled after {stream_scan.text_length} chars: "
+                f"{alert.category}: {alert.indicator}. "
+            )
+        
+        # Latency breakdown: HTTP phases of the ask request + test phases
+        phase_timings = dict(ask_response.phase_timings_ms or {})
+        if init_response is not None:
+            phase_timings["init_session"] = float(init_response.latency_ms)
+        phase_timings["ask"] = float(ask_response.latency_ms)
+        phase_timings["evaluate"] = (time.perf_counter() - evaluate_start) * 1000
+        result.phase_timings_ms = phase_timings
         
         # Store raw data
         result.raw_request = {
             "question": test_case.user_message_input,
-            "fingerprint": self.api_client.fingerprint
+            "fingerprint": api_client.fingerprint
         }
         result.raw_response = ask_response.data
         
-        # Reset session for next test
-        self.api_client.reset_session()
+        # Reset session for next test (pooled sessions are reset by the pool)
+        if owns_session and not self.config.replay_responses:
+            api_client.reset_session()
         
         return result
     
+    def _security_watch(
+        self,
+        test_case: TestCase
+    ) -> Tuple[Optional[StreamScan], Optional[Callable[[str], bool]]]:
+        """
+        Stream scan + on_chunk callback cancelling the answer at the first hit
+        
+        Only for test cases targeting a risk the evaluator fails on an
+        indicator alone (LLM01 / LLM06 / LLM02): the partial answer already
+        contains the hit, so the evaluation result is the same.
+        """
+        risks = STREAM_ABORT_RISKS & set(test_case.target_owasp_risks)
+        if not self.config.stream_security_abort or not risks:
+            return None, None
+        
+        stream_scan = self.evaluator.scanner.stream(risks)
+        
+        def on_chunk(chunk: str) -> bool:
+            stream_scan.feed(chunk)
+            return stream_scan.alert is not None
+        
+        return stream_scan, on_chunk
+    
+    def _replay_miss_result(self, test_case: TestCase) -> TestRunResult:
+        """SKIP result for a test case without a recorded response"""
+        return TestRunResult(
+            test_run_id=TestRunResult.generate_run_id(),
+            test_case_id=test_case.test_case_id,
+            date=datetime.now().strftime("%Y-%m-%d"),
+            environment=self.config.environment,
+            llm_model=self.config.llm_model,
+            pass_fail=PassFailStatus.SKIP,
+            notes="Replay: no recorded response for this message (run once without --replay to record it). "
+        )
+    
     def run_tests(
         self,
         test_cases: List[TestCase],
         filter_feature: Optional[str] = None,
-        filter_priority: Optional[str] = None
+        filter_priority: Optional[str] = None,
+        workers: int = 1,
+        resume_from: Optional[str] = None
     ) -> List[TestRunResult]:
-        """Run multiple test cases"""
+        """
+        Run multiple test cases
+        
+        With workers > 1, independent test cases run concurrently, each worker
+        using its own API client. Results, summary and the incremental results
+        file keep the original test case order.
+        
+        With resume_from (a previous, possibly partial, results file), test
+        cases already recorded there are not executed again: their results are
+        carried into the new results journal and summary, and only the
+        remaining (or errored) cases are run.
+        
+        With config.repeat_count > 1, every test case is sent that many times
+        (repeats are scheduled like separate test cases, so they run
+        concurrently with workers > 1) and the samples are merged into one
+        result per case (consistency.merge_repeats). Not in replay mode, where
+        a repeat would only evaluate the same recorded response again.
+        """
+        self.workers = max(1, workers)
+        self.repeats = 1 if self.config.replay_responses else max(1, self.config.repeat_count)
         self.results = []
         self.summary = TestSummary()
         self.summary.start_time = datetime.now()
@@ -255,41 +525,102 @@ class TestRunner:
         
         self.summary.total_tests = len(filtered_cases)
         
-        # Initialize consolidated results file
-        self._init_results_file()
+        # Initialize results journal
+        self._init_results_file(resumed_from=resume_from)
+        
+        # Carry over results recorded by the run being resumed
+        pending_cases = filtered_cases
+        if resume_from:
+            carried = self._load_resume_results(resume_from, filtered_cases)
+            for result in carried:
+                self.results.append(result)
+                self._update_summary(result)
+                self._save_incremental(result)
+            
+            carried_ids = {r.test_case_id for r in carried}
+            pending_cases = [tc for tc in filtered_cases if tc.test_case_id not in carried_ids]
+            console.print(
+                f"[cyan]Resuming from {resume_from}: {len(carried)} results reused, "
+                f"{len(pending_cases)} test cases to run[/cyan]"
+            )
         
         console.print(Panel(
-            f"[bold blue]Running {len(filtered_cases)} test cases[/bold blue]\n"
+            f"[bold blue]Running {len(pending_cases)} test cases[/bold blue]\n"
             f"Environment: {self.config.environment}\n"
             f"Model: {self.config.llm_model}\n"
+            f"Workers: {self.workers}\n"
+            f"Repeats per case: {self.repeats}\n"
+            f"Mode: {'replay (cached responses)' if self.config.replay_responses else 'live'}\n"
             f"Results: {self.results_file}",
             title="MoneyCare Test Framework"
         ))
         
-        with Progress(
+        # Live dashboard: all API clients of this run report to one aggregator
+        self.live_metrics = None
+        if self.config.live_dashboard and not self.config.replay_responses:
+            self.live_metrics = LiveMetrics(
+                self.config.live_window_seconds,
+                load_workload_thresholds(self.config.workload_thresholds_file)
+            )
+        self.api_client.metrics = self.live_metrics
+        
+        progress = Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
             console=console
-        ) as progress:
-            task = progress.add_task("Running tests...", total=len(filtered_cases))
-            
-            for test_case in filtered_cases:
-                progress.update(task, description=f"Running {test_case.test_case_id}...")
-                
-                result = self.run_single_test(test_case)
-                self.results.append(result)
-                
-                # Update summary
-                self._update_summary(result)
-                
-                # Save incrementally to single JSON file
-                self._save_incremental(result)
-                
-                progress.advance(task)
+        )
+        display = progress
+        if self.live_metrics is not None:
+            display = LiveDashboard(
+                self.live_metrics, progress, refresh_per_second=self.config.live_refresh_per_second
+            )
         
-        self.summary.end_time = datetime.now()
+        # One spare session per run so the next test's session is initialized
+        # while the current tests are running
+        if self.config.session_pool_enabled and not self.config.replay_responses and pending_cases:
+            self.session_pool = SessionPool(
+                self.config, self.identity, size=self.workers + 1,
+                rate_limiter=self.rate_limiter, metrics=self.live_metrics,
+                sessions=len(pending_cases) * self.repeats
+            )
+        
+        # Warm sessions and their sockets are released even if a test raises or the run is interrupted
+        try:
+            with display:
+                task = progress.add_task("Running tests...", total=len(pending_cases) * self.repeats)
+                
+                if self.workers > 1:
+                    self._run_concurrent(pending_cases, progress, task)
+                else:
+                    for test_case in pending_cases:
+                        progress.update(task, description=f"Running {test_case.test_case_id}...")
+                        
+                        samples = []
+                        for _ in range(self.repeats):
+                            samples.append(self.run_single_test(test_case))
+                            progress.advance(task)
+                        result = merge_repeats(samples, self.evaluator)
+                        self.results.append(result)
+                        
+                        # Update summary
+                        self._update_summary(result)
+                        
+                        # Save incrementally to single JSON file
+                        self._save_incremental(result)
+            
+            self.summary.end_time = datetime.now()
+        finally:
+            if self.session_pool is not None:
+                self.session_pool.close()
+                self.session_pool = None
+            self._close_worker_clients()
+        
+        if resume_from:
+            # Restore original test case order (carried-over results were added first)
+            order = {tc.test_case_id: idx for idx, tc in enumerate(filtered_cases)}
+            self.results.sort(key=lambda r: order.get(r.test_case_id, len(order)))
         
         # Calculate averages
         if self.results:
@@ -297,15 +628,84 @@ class TestRunner:
             accuracy_scores = [r.accuracy_score_percent for r in self.results if r.accuracy_score_percent > 0]
             if accuracy_scores:
                 self.summary.avg_accuracy = sum(accuracy_scores) / len(accuracy_scores)
+            similarity_scores = [r.response_similarity_percent for r in self.results if r.response_similarity_percent is not None]
+            if similarity_scores:
+                self.summary.avg_similarity = sum(similarity_scores) / len(similarity_scores)
+            self.summary.phase_timings = aggregate_phase_timings([r.phase_timings_ms for r in self.results])
+        
+        # Persist recorded responses
+        if self.response_cache is not None:
+            self.response_cache.save()
+            if self.config.replay_responses:
+                console.print(
+                    f"[cyan]Replay: {self.response_cache.hits} cached responses, "
+                    f"{self.response_cache.misses} misses (skipped)[/cyan]"
+                )
+            elif self.response_cache.mock_responses:
+                console.print(
+                    f"[dim]Mock server: {self.response_cache.mock_responses} responses not recorded[/dim]"
+                )
         
         # Finalize results file
         self._finalize_results_file()
         
+        # Typed columnar copy (report / analysis reads only the columns it needs)
+        if self.config.columnar_results:
+            self._export_columnar_results()
+        
+        # Run history (latency / accuracy / cost trends across runs); replayed latencies are not new measurements
+        if self.config.run_history_db and self.results_file:
+            if self.run_info.get("mode") == "replay":
+                console.print("[dim]Replay run: not added to the run history[/dim]")
+            else:
+                self._record_run_history()
+        
         # Export failed tests if any
         self._export_failed_tests()
         
         return self.results
     
+    def _run_concurrent(self, test_cases: List[TestCase], progress: Progress, task) -> None:
+        """
+        Run test cases on a thread pool of self.workers workers
+        
+        Summary and progress are updated on the calling thread as results
+        complete; results are appended and saved in original test case order
+        (a completed result waits until all earlier cases have finished).
+        Each repeat of a test case is a separate task; a case's result is
+        merged once all of its samples are in.
+        """
+        ordered: List[Optional[TestRunResult]] = [None] * len(test_cases)
+        samples: List[List[TestRunResult]] = [[] for _ in test_cases]
+        next_to_save = 0
+        
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="test-worker") as executor:
+            futures = {
+                executor.submit(self._run_in_worker, test_case): idx
+                for idx, test_case in enumerate(test_cases)
+                for _ in range(self.repeats)
+            }
+            
+            for future in as_completed(futures):
+                idx = futures[future]
+                samples[idx].append(future.result())
+                progress.advance(task)
+                if len(samples[idx]) < self.repeats:
+                    continue
+                
+                result = merge_repeats(samples[idx], self.evaluator)
+                ordered[idx] = result
+                
+                # Update summary
+                self._update_summary(result)
+                progress.update(task, description=f"Completed {result.test_case_id}")
+                
+                # Flush the contiguous prefix of finished results in order
+                while next_to_save < len(ordered) and ordered[next_to_save] is not None:
+                    self.results.append(ordered[next_to_save])
+                    self._save_incremental(ordered[next_to_save])
+                    next_to_save += 1
+    
     def _update_summary(self, result: TestRunResult):
         """Update summary with result"""
         if result.pass_fail == PassFailStatus.PASS:
@@ -319,7 +719,11 @@ class TestRunner:
         else:
             self.summary.skipped += 1
         
-        self.summary.total_cost_vnd += result.measured_cost_vnd
+        # Merged repeats: the cost of all samples
+        if result.repeat_stats:
+            self.summary.total_cost_vnd += result.repeat_stats["total_cost_vnd"]
+        else:
+            self.summary.total_cost_vnd += result.measured_cost_vnd
         
         if result.security_observation.value != "OK":
             self.summary.security_issues += 1
@@ -341,8 +745,48 @@ class TestRunner:
         table.add_row("Pass Rate", f"{self.summary.pass_rate():.1f}%")
         table.add_row("Avg Latency", f"{self.summary.avg_latency_ms:.0f} ms")
         table.add_row("Avg Accuracy", f"{self.summary.avg_accuracy:.1f}%")
+        table.add_row("Avg Response Similarity", f"{self.summary.avg_similarity:.1f}%")
         table.add_row("Security Issues", f"[red]{self.summary.security_issues}[/red]")
         table.add_row("Stability Issues", f"[yellow]{self.summary.stability_issues}[/yellow]")
+        for phase, stats in self.summary.phase_timings.items():
+            table.add_row(f"Latency: {phase}", f"avg {stats['avg']:.1f} ms / p95 {stats['p95']:.1f} ms")
+        
+        console.print(table)
+        
+        if any(r.repeat_stats for r in self.results):
+            self.print_repeat_stats()
+    
+    def print_repeat_stats(self, limit: int = 20):
+        """Per-case latency distribution of repeated runs (inconsistent cases first)"""
+        repeated = [r for r in self.results if r.repeat_stats]
+        inconsistent = [r for r in repeated if not r.repeat_stats["consistent"]]
+        repeated.sort(key=lambda r: (r.repeat_stats["consistent"], -r.repeat_stats["latency_ms"]["stddev"]))
+        
+        table = Table(
+            title=f"Repeated Runs ({len(inconsistent)} of {len(repeated)} cases inconsistent)"
+        )
+        table.add_column("Test Case", style="cyan")
+        table.add_column("Runs", justify="right")
+        table.add_column("Verdicts")
+        table.add_column("Responses", justify="right")
+        for column in ["Min", "Median", "P95", "Stddev"]:
+            table.add_column(f"{column} ms", justify="right")
+        
+        for result in repeated[:limit]:
+            stats = result.repeat_stats
+            latency = stats["latency_ms"]
+            style = "yellow" if not stats["consistent"] else None
+            table.add_row(
+                result.test_case_id,
+                str(stats["runs"]),
+                ", ".join(f"{verdict} {count}" for verdict, count in stats["verdicts"].items()),
+                str(stats["distinct_responses"]),
+                f"{latency['min']:.0f}",
+                f"{latency['median']:.0f}",
+                f"{latency['p95']:.0f}",
+                f"{latency['stddev']:.0f}",
+                style=style
+            )
         
         console.print(table)
     
@@ -373,21 +817,16 @@ class TestRunner:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         if format == "json":
-            # Results already saved incrementally, just return the path
+            # Results already saved incrementally to the journal: compact it to consolidated JSON
             if self.results_file and self.results_file.exists():
-                console.print(f"[green]Results already saved to: {self.results_file}[/green]")
-                return str(self.results_file)
+                file_path = compact_journal(self.results_file)
+                console.print(f"[green]Results exported to: {file_path}[/green]")
+                return str(file_path)
             
             # Fallback: create new file
             file_path = Path(self.config.results_dir) / f"test_results_{timestamp}.json"
             data = {
-                "run_info": {
-                    "start_time": self.summary.start_time.isoformat() if self.summary.start_time else None,
-                    "end_time": self.summary.end_time.isoformat() if self.summary.end_time else None,
-                    "environment": self.config.environment,
-                    "llm_model": self.config.llm_model,
-                    "status": "completed"
-                },
+                "run_info": self._export_run_info(),
                 "summary": self.summary.to_dict(),
                 "results": [r.to_dict() for r in self.results],
                 "test_cases": self.test_cases_data
@@ -397,6 +836,20 @@ class TestRunner:
             console.print(f"[green]Results exported to: {file_path}[/green]")
             return str(file_path)
         
+        elif format == "parquet":
+            # Same name as the journal (test_run_*.parquet)
+            if self.results_file:
+                file_path = self.results_file.with_suffix(PARQUET_SUFFIX)
+            else:
+                file_path = Path(self.config.results_dir) / f"test_results_{timestamp}{PARQUET_SUFFIX}"
+            write_columnar_results(
+                file_path,
+                self.results,
+                run_info=self._export_run_info(),
+                summary=self.summary.to_dict(),
+                test_cases=self.test_cases_data
+            )
+        
         elif format == "csv":
             import pandas as pd
             file_path = Path(self.config.results_dir) / f"test_results_{timestamp}.csv"
@@ -443,11 +896,30 @@ def main():
     parser.add_argument("--export", "-e", choices=["json", "csv", "excel"], default="excel",
                        help="Export format")
     parser.add_argument("--env", default="Staging", help="Test environment")
+    parser.add_argument("--workers", "-w", type=int, default=1,
+                       help="Number of test cases to run concurrently")
+    parser.add_argument("--resume", help="Resume from a previous (partial) results file")
+    parser.add_argument("--repeat", type=int, default=1,
+                       help="Send every test case N times (latency distribution, inconsistency check)")
+    parser.add_argument("--replay", action="store_true",
+                       help="Evaluate recorded responses instead of calling the chatbot")
+    parser.add_argument("--no-record", action="store_true", help="Do not record responses to the cache")
+    parser.add_argument("--log-level", choices=LOG_LEVELS, default="WARNING", help="Console log level")
+    parser.add_argument("--log-file", default="test_results/moneycare.log",
+                       help="DEBUG-level log file ('' to disable)")
     
     args = parser.parse_args()
     
     # Create config
-    config = TestConfig(environment=args.env)
+    config = TestConfig(
+        environment=args.env,
+        replay_responses=args.replay,
+        record_responses=not args.no_record,
+        repeat_count=args.repeat,
+        log_level=args.log_level,
+        log_file=args.log_file
+    )
+    setup_logging(config.log_level, config.log_file or None)
     
     # Create runner
     runner = TestRunner(config)
@@ -461,7 +933,9 @@ def main():
     runner.run_tests(
         test_cases,
         filter_feature=args.feature,
-        filter_priority=args.priority
+        filter_priority=args.priority,
+        workers=args.workers,
+        resume_from=args.resume
     )
     
     # Print results
@@ -0,0 +1,40 @@
+"""
+Text Utils - Normalization helpers for Vietnamese text matching
+
+- normalize_text(): Unicode NFC + lowercase. Vietnamese text can arrive
+  precomposed ("ó") or decomposed ("o" + combining acute); NFC makes both
+  compare equal.
+- fold_diacritics(): strip tone/vowel marks ("ăn uống" -> "an uong",
+  "đi lại" -> "di lai") for matching text typed without accents.
+- tokenize(): whitespace token set, as used by the evaluator word overlap.
+
+Usage:
+    normalize_text("Ăn Uống")        # "ăn uống"
+    fold_diacritics("ăn uống")        # "an uong"
+    tokenize("ăn  uống")              # frozenset({"ăn", "uống"})
+"""
+import unicodedata
+from functools import lru_cache
+from typing import FrozenSet
+
+
+# Letters that do not decompose into base letter + combining mark
+_FOLD_TABLE = str.maketrans({"đ": "d", "Đ": "D"})
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalized, lowercased text"""
+    return unicodedata.normalize("NFC", text).lower()
+
+
+@lru_cache(maxsize=4096)
+def fold_diacritics(text: str) -> str:
+    """Text without diacritics (NFC result; đ -> d)"""
+    decomposed = unicodedata.normalize("NFD", text.translate(_FOLD_TABLE))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return unicodedata.normalize("NFC", stripped)
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Set of whitespace-separated tokens"""
+    return frozenset(text.split())
@@ -0,0 +1,255 @@
+"""
+Token Counter - Token usage of chatbot requests for cost accounting
+
+Replaces the len(text) // 3 + 200 guess with the tokenizer of the
+configured llm_model and the real prompts from system_prompts.json:
+
+- tiktoken (optional dependency) with the model's encoding
+  (gpt-4o / gpt-4o-mini: o200k_base). Without tiktoken, or when the
+  encoding cannot be loaded (offline, no TIKTOKEN_CACHE_DIR), a
+  pre-tokenizer based estimate is used instead; backend tells which.
+- The chatbot makes one intent_detection call per message and, for
+  transaction / financial_question, a second call with that intent's
+  system prompt (placeholders filled with the message, CATEGORY_VOCABULARY,
+  no members and today's date). greeting, closing, unsupported and
+  app_query replies are backend templates (no system prompt, no second
+  call); detect_intent() recognizes them by TEMPLATE_ANSWERS.
+  Chat format overhead per message is included.
+- Token counts of texts are memoized (system prompts, repeated test
+  messages); templates are counted once per static segment.
+- Usage reported by the server (data["usage"]) takes precedence.
+
+Usage:
+    counter = get_token_counter("gpt-4o-mini")
+    counter.usage("chi 50k ăn trưa", answer)   # {"prompt_tokens": ..., "source": "tiktoken"}
+    counter.count("Xin chào")
+"""
+import json
+import math
+import re
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to the estimate
+    tiktoken = None
+
+from config import CATEGORY_VOCABULARY
+from log_setup import get_logger
+
+
+logger = get_logger("token_counter")
+
+
+# Chat completion format: every message is wrapped in ~3 tokens, and the
+# reply is primed with 3 more (OpenAI cookbook, gpt-3.5 / gpt-4 family)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+DEFAULT_ENCODING = "o200k_base"
+
+# Intents whose answer comes from a second LLM call with its own system prompt
+ANSWER_INTENTS = ["transaction", "financial_question"]
+
+# Fixed backend replies (answer prefix) by intent. Intents without a system
+# prompt in system_prompts.json are answered from these templates, so only
+# the intent_detection call is charged; text answers matching none of them
+# are financial_question answers.
+TEMPLATE_ANSWERS = {
+    "greeting": ["Xin chào <b>"],
+    "closing": ["Cảm ơn bạn! Chúc bạn"],
+    "unsupported": ["Rất tiếc, hiện tại Mình chưa có khả năng"],
+    "app_query": [
+        "Tất cả dữ liệu chi tiêu được mã hóa",
+        "Nếu bạn gặp lỗi nghiêm trọng với bản Premium"
+    ],
+    # Save failed after the transaction call
+    "transaction": ["Mình không thể lưu giao dịch này"]
+}
+
+# Pre-tokenizer used by the estimate (same word / number / punctuation split as tiktoken)
+_PIECES = re.compile(r" ?[^\W\d_]+| ?\d{1,3}|\s+|[^\w\s]+", re.UNICODE)
+
+_PLACEHOLDER = re.compile(r"\{(message|categories_json|members_json|today)\}", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count estimate without a tokenizer
+    
+    Splits text like the BPE pre-tokenizer and charges each piece by length:
+    ASCII words ~6 characters per token, Vietnamese (accented) words ~4
+    (about 1.3 tokens per syllable), numbers 1 token per 3 digits,
+    punctuation runs ~2 characters per token. A rough approximation; install
+    tiktoken for exact counts.
+    """
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        word = piece.lstrip(" ")
+        if not word:
+            tokens += 1
+        elif word[0].isalpha():
+            chars_per_token = 6 if word.isascii() else 4
+            tokens += math.ceil(len(word) / chars_per_token)
+        elif word[0].isdigit() or word.isspace():
+            tokens += 1
+        else:
+            tokens += math.ceil(len(word) / 2)
+    return tokens
+
+
+def detect_intent(answer: str) -> str:
+    """Intent the chatbot answered with (transaction JSON, a template reply or a text answer)"""
+    stripped = answer.strip()
+    if stripped.startswith("{") and ('"transactions"' in stripped or '"error"' in stripped):
+        return "transaction"
+    for intent, prefixes in TEMPLATE_ANSWERS.items():
+        if stripped.startswith(tuple(prefixes)):
+            return intent
+    return "financial_question"
+
+
+def server_usage(response_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """Token usage reported by the chatbot API, if any (OpenAI or camelCase keys)"""
+    if not isinstance(response_data, dict):
+        return None
+    usage = response_data.get("usage") or response_data.get("tokenUsage")
+    if not isinstance(usage, dict):
+        return None
+    prompt = usage.get("prompt_tokens", usage.get("promptTokens"))
+    completion = usage.get("completion_tokens", usage.get("completionTokens"))
+    if prompt is None or completion is None:
+        return None
+    try:
+        prompt, completion = int(prompt), int(completion)
+    except (TypeError, ValueError):
+        return None
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+        "source": "server"
+    }
+
+
+class TokenCounter:
+    """Token counting for one model and system prompts file"""
+    
+    def __init__(self, model: str = "gpt-4o-mini", system_prompts_file: str = "system_prompts.json"):
+        self.model = model
+        self.encoding = self._load_encoding(model)
+        self.backend = "tiktoken" if self.encoding is not None else "estimate"
+        self.prompts = self._load_prompts(system_prompts_file)
+        
+        # Memoized per instance (bound to this encoding)
+        self.count = lru_cache(maxsize=16384)(self._count)
+        self._templates: Dict[str, List[Tuple[str, str]]] = {
+            intent: self._split_template(prompt) for intent, prompt in self.prompts.items()
+        }
+        # Templates with {message} get no separate user message
+        self._embeds_message = {
+            intent for intent, parts in self._templates.items() if ("placeholder", "message") in parts
+        }
+        self._placeholder_values = {
+            "categories_json": json.dumps(CATEGORY_VOCABULARY, ensure_ascii=False),
+            "members_json": "[]"
+        }
+    
+    @staticmethod
+    def _load_encoding(model: str):
+        if tiktoken is None:
+            return None
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding(DEFAULT_ENCODING)
+        except Exception as e:
+            # Encoding files are downloaded on first use
+            logger.warning("tiktoken encoding unavailable (%s), using estimate", e.__class__.__name__)
+            return None
+    
+    @staticmethod
+    def _load_prompts(path: str) -> Dict[str, str]:
+        """intent code -> system prompt"""
+        if not Path(path).exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {
+            intent: entry["system_prompt"]
+            for intent, entry in data.items()
+            if isinstance(entry, dict) and entry.get("system_prompt")
+        }
+    
+    @staticmethod
+    def _split_template(prompt: str) -> List[Tuple[str, str]]:
+        """[(kind, text)]: ("text", static segment) or ("placeholder", lowercase name)"""
+        parts = []
+        for i, part in enumerate(_PLACEHOLDER.split(prompt)):
+            if part:
+                parts.append(("placeholder", part.lower()) if i % 2 else ("text", part))
+        return parts
+    
+    def _count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+    
+    def _system_prompt_tokens(self, intent: str, message: str) -> int:
+        """Tokens of an intent's system prompt with placeholders filled"""
+        values = dict(self._placeholder_values, message=message, today=datetime.now().strftime("%Y-%m-%d"))
+        return sum(
+            self.count(values[text] if kind == "placeholder" else text)
+            for kind, text in self._templates.get(intent, ())
+        )
+    
+    def _call_prompt_tokens(self, intent: str, message: str) -> int:
+        """Prompt tokens of one chat call: system prompt (+ user message unless embedded)"""
+        tokens = TOKENS_PER_REPLY
+        if intent in self._templates:
+            tokens += TOKENS_PER_MESSAGE + self._system_prompt_tokens(intent, message)
+        if intent not in self._embeds_message:
+            tokens += TOKENS_PER_MESSAGE + self.count(message)
+        return tokens
+    
+    def usage(
+        self,
+        question: str,
+        answer: str,
+        response_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Token usage of one /api/ask request
+        
+        Server-reported usage when present; otherwise intent detection call
+        (completion = intent label) + answer call when the detected intent
+        is in ANSWER_INTENTS (template replies: intent call only).
+        Returns: {"prompt_tokens", "completion_tokens", "total_tokens", "source"}
+        """
+        reported = server_usage(response_data)
+        if reported:
+            return reported
+        
+        intent = detect_intent(answer)
+        prompt_tokens = self._call_prompt_tokens("intent_detection", question)
+        completion_tokens = self.count(intent)
+        if intent in ANSWER_INTENTS:
+            prompt_tokens += self._call_prompt_tokens(intent, question)
+            completion_tokens += self.count(answer)
+        
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "source": self.backend
+        }
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(model: str = "gpt-4o-mini", system_prompts_file: str = "system_prompts.json") -> TokenCounter:
+    """Shared counter per (model, prompts file)"""
+    return TokenCounter(model, system_prompts_file)